@@ -0,0 +1,317 @@
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEVERITY_INDEX = {"낮음": 0, "중간": 1, "높음": 2}
+STATUSES = ("정상", "주의", "격리")
+EDGE_ARRAYS = ("edge_source", "edge_target", "edge_messages", "edge_severity")
+NODE_ARRAYS = ("agent_ids", "risk", "status")
+# Threat spread probability by edge severity (-1, the last entry, is a session without packets)
+SPREAD_PROBABILITY = np.array([0.2, 0.5, 0.8, 0.1])
+
+
+class AdjacencyIndex:
+    """Directed agent graph in CSR form for reachability, path and blast-radius queries.
+
+    Edges live in flat arrays (one row per source/target pair) and two CSR
+    views -- outgoing and incoming -- hold edge rows grouped by node. Edges
+    added after the last compaction sit in a small delta list that queries
+    scan alongside the CSR; once it outgrows ``compact_ratio`` of the indexed
+    edges the CSR is rebuilt on the next query. Message counts and severities
+    are read from the edge arrays, so updates to known edges are visible at
+    once.
+
+    An edge ``u -> v`` spreads a compromise with probability
+    ``SPREAD_PROBABILITY[severity] * (0.5 + 0.5 * risk[v])``; the riskiest path
+    maximizes the product of those probabilities and the blast radius sums
+    each reachable agent's best-path probability.
+    """
+
+    def __init__(self, capacity: int = 1024, compact_min: int = 10_000, compact_ratio: float = 0.05):
+        self.compact_min = compact_min
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+
+        self.names: List[str] = []
+        self.by_name: Dict[str, int] = {}
+        self.by_id: Dict[int, int] = {}
+        self.count = 0
+        self.agent_ids = np.zeros(capacity, dtype=np.int64)
+        self.risk = np.zeros(capacity)
+        self.status = np.zeros(capacity, dtype=np.int8)
+
+        self.edges: Dict[int, int] = {}
+        self.edge_count = 0
+        self.edge_source = np.zeros(capacity, dtype=np.int64)
+        self.edge_target = np.zeros(capacity, dtype=np.int64)
+        self.edge_messages = np.zeros(capacity, dtype=np.int64)
+        self.edge_severity = np.full(capacity, -1, dtype=np.int8)
+
+        self.indexed_edges = 0
+        self.out_ptr = np.zeros(1, dtype=np.int64)
+        self.out_rows = np.zeros(0, dtype=np.int64)
+        self.in_ptr = np.zeros(1, dtype=np.int64)
+        self.in_rows = np.zeros(0, dtype=np.int64)
+        self.compactions = 0
+
+    def _grow(self, names: Sequence[str], needed: int, fill: Optional[Dict[str, int]] = None):
+        current = len(getattr(self, names[0]))
+        if needed <= current:
+            return
+        size = max(needed, current * 2)
+        for name in names:
+            array = getattr(self, name)
+            grown = np.full(size, (fill or {}).get(name, 0), dtype=array.dtype)
+            grown[:current] = array
+            setattr(self, name, grown)
+
+    def register(self, agents: Iterable[Tuple[int, str, float, str]]):
+        """Add ``(agent_id, name, risk_score, status)`` rows as nodes."""
+        with self._lock:
+            for agent_id, name, risk, status in agents:
+                if name in self.by_name:
+                    continue
+                self._grow(NODE_ARRAYS, self.count + 1)
+                position = self.count
+                self.names.append(name)
+                self.by_name[name] = self.by_id[agent_id] = position
+                self.agent_ids[position] = agent_id
+                self.risk[position] = risk
+                self.status[position] = STATUSES.index(status) if status in STATUSES else 0
+                self.count += 1
+            pad = self.count + 1 - len(self.out_ptr)
+            if pad > 0:
+                self.out_ptr = np.concatenate([self.out_ptr, np.full(pad, self.out_ptr[-1])])
+                self.in_ptr = np.concatenate([self.in_ptr, np.full(pad, self.in_ptr[-1])])
+
+    def update_nodes(self, agent_ids: Sequence[int], risks: Sequence[float], statuses: Sequence[str]):
+        with self._lock:
+            for agent_id, risk, status in zip(agent_ids, risks, statuses):
+                position = self.by_id.get(agent_id)
+                if position is not None:
+                    self.risk[position] = risk
+                    self.status[position] = STATUSES.index(status) if status in STATUSES else 0
+
+    def add_edges(self, pairs: Iterable[Tuple[str, str, int, Optional[int]]]):
+        """Merge ``(source, target, messages, max_severity)`` into the graph; unknown agents are skipped."""
+        with self._lock:
+            by_name, edges = self.by_name, self.edges
+            for source, target, messages, severity in pairs:
+                source_pos, target_pos = by_name.get(source), by_name.get(target)
+                if source_pos is None or target_pos is None or source_pos == target_pos:
+                    continue
+                code = (source_pos << 32) | target_pos
+                row = edges.get(code)
+                if row is None:
+                    self._grow(EDGE_ARRAYS, self.edge_count + 1, {"edge_severity": -1})
+                    row = edges[code] = self.edge_count
+                    self.edge_source[row] = source_pos
+                    self.edge_target[row] = target_pos
+                    self.edge_count += 1
+                self.edge_messages[row] += messages
+                if severity is not None and severity > self.edge_severity[row]:
+                    self.edge_severity[row] = severity
+
+    def apply_packets(self, packets: Iterable[Dict]):
+        self.add_edges(
+            (packet["source_agent"], packet["target_agent"], 1, SEVERITY_INDEX.get(packet["severity"]))
+            for packet in packets
+        )
+
+    def _compact(self):
+        n, m = self.count, self.edge_count
+        for source, prefix in ((self.edge_source, "out"), (self.edge_target, "in")):
+            rows = np.argsort(source[:m], kind="stable")
+            pointer = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(source[:m], minlength=n), out=pointer[1:])
+            setattr(self, f"{prefix}_rows", rows)
+            setattr(self, f"{prefix}_ptr", pointer)
+        self.indexed_edges = m
+        self.compactions += 1
+
+    def _ensure_compact(self):
+        pending = self.edge_count - self.indexed_edges
+        if pending > max(self.compact_min, self.compact_ratio * self.indexed_edges):
+            self._compact()
+
+    def _edges_from(self, frontier: np.ndarray, outgoing: bool = True) -> np.ndarray:
+        """Edge rows leaving (or entering) any node of ``frontier``: CSR slices plus the unindexed delta."""
+        pointer, rows = (self.out_ptr, self.out_rows) if outgoing else (self.in_ptr, self.in_rows)
+        starts, ends = pointer[frontier], pointer[frontier + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        found = rows[offsets]
+        if self.edge_count > self.indexed_edges:
+            delta = np.arange(self.indexed_edges, self.edge_count)
+            ends_of = self.edge_source if outgoing else self.edge_target
+            found = np.concatenate([found, delta[np.isin(ends_of[delta], frontier)]])
+        return found
+
+    def _spread_log(self, rows: np.ndarray) -> np.ndarray:
+        probability = SPREAD_PROBABILITY[self.edge_severity[rows]] * (0.5 + 0.5 * self.risk[self.edge_target[rows]])
+        return np.log(np.clip(probability, 1e-9, 1.0))
+
+    def lookup(self, key: str) -> Optional[int]:
+        """Resolve an agent id or name to its node position."""
+        if key.isdigit():
+            return self.by_id.get(int(key))
+        return self.by_name.get(key)
+
+    def reachable(self, start: int, max_hops: int, outgoing: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """Breadth-first levels from ``start``: return ``(positions, hops)`` of every node within ``max_hops``."""
+        with self._lock:
+            self._ensure_compact()
+            hops = np.full(self.count, -1, dtype=np.int64)
+            hops[start] = 0
+            frontier = np.array([start], dtype=np.int64)
+            far = self.edge_target if outgoing else self.edge_source
+            for hop in range(1, max_hops + 1):
+                rows = self._edges_from(frontier, outgoing)
+                candidates = np.unique(far[rows])
+                frontier = candidates[hops[candidates] < 0]
+                if not len(frontier):
+                    break
+                hops[frontier] = hop
+            reached = np.flatnonzero(hops > 0)
+            return reached, hops[reached]
+
+    def shortest_path(self, start: int, goal: int, max_hops: int) -> Optional[List[Tuple[int, Optional[int]]]]:
+        """Fewest-hop path as ``[(node, edge_row_into_node), ...]`` or ``None``.
+
+        Bidirectional breadth-first search: the smaller frontier is expanded
+        each round (outgoing edges from ``start``, incoming edges towards
+        ``goal``) until the two searches meet.
+        """
+        with self._lock:
+            self._ensure_compact()
+            distance = [np.full(self.count, -1, dtype=np.int64) for _ in range(2)]
+            parent_edge = [np.full(self.count, -1, dtype=np.int64) for _ in range(2)]
+            frontier = [np.array([start], dtype=np.int64), np.array([goal], dtype=np.int64)]
+            distance[0][start] = distance[1][goal] = 0
+            meet = start if start == goal else None
+            depth = [0, 0]
+            while meet is None and sum(depth) < max_hops and len(frontier[0]) and len(frontier[1]):
+                side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+                rows = self._edges_from(frontier[side], outgoing=side == 0)
+                reached = (self.edge_target if side == 0 else self.edge_source)[rows]
+                fresh = distance[side][reached] < 0
+                reached, first = np.unique(reached[fresh], return_index=True)
+                depth[side] += 1
+                distance[side][reached] = depth[side]
+                parent_edge[side][reached] = rows[fresh][first]
+                frontier[side] = reached
+                met = reached[distance[1 - side][reached] >= 0]
+                if len(met):
+                    meet = int(met[np.argmin(distance[1 - side][met])])
+            if meet is None:
+                return None
+            path: List[Tuple[int, Optional[int]]] = []
+            node = meet
+            while node != start:
+                row = int(parent_edge[0][node])
+                path.append((node, row))
+                node = int(self.edge_source[row])
+            path.append((start, None))
+            path.reverse()
+            node = meet
+            while node != goal:
+                row = int(parent_edge[1][node])
+                node = int(self.edge_target[row])
+                path.append((node, row))
+            return path
+
+    def _propagate(self, start: int, max_hops: int) -> Tuple[np.ndarray, List[Dict[int, Tuple[int, int]]]]:
+        """Best log spread probability from ``start`` using at most ``max_hops`` edges.
+
+        Each layer relaxes only the edges leaving nodes that improved in the
+        previous layer and records ``node -> (parent, edge_row)`` for the nodes
+        it improved, which is enough to rebuild a hop-bounded best path.
+        """
+        best = np.full(self.count, -np.inf)
+        best[start] = 0.0
+        frontier = np.array([start], dtype=np.int64)
+        layers: List[Dict[int, Tuple[int, int]]] = []
+        for _ in range(max_hops):
+            if not len(frontier):
+                break
+            rows = self._edges_from(frontier)
+            if not len(rows):
+                break
+            previous = best.copy()
+            score = previous[self.edge_source[rows]] + self._spread_log(rows)
+            targets = self.edge_target[rows]
+            order = np.lexsort((-score, targets))
+            targets, first = np.unique(targets[order], return_index=True)
+            winners = order[first]
+            improved = score[winners] > best[targets] + 1e-12
+            targets, winners = targets[improved], winners[improved]
+            best[targets] = score[winners]
+            layers.append(
+                dict(zip(targets.tolist(), zip(self.edge_source[rows[winners]].tolist(), rows[winners].tolist())))
+            )
+            frontier = targets
+        return best, layers
+
+    def riskiest_path(self, start: int, goal: int, max_hops: int) -> Optional[Tuple[List[Tuple[int, Optional[int]]], float]]:
+        with self._lock:
+            self._ensure_compact()
+            best, layers = self._propagate(start, max_hops)
+            if goal == start or not np.isfinite(best[goal]):
+                return None
+            path: List[Tuple[int, Optional[int]]] = []
+            node, layer = goal, len(layers) - 1
+            while node != start:
+                while node not in layers[layer]:
+                    layer -= 1
+                parent, row = layers[layer][node]
+                path.append((node, row))
+                node, layer = parent, layer - 1
+            path.append((start, None))
+            path.reverse()
+            return path, math.exp(best[goal])
+
+    def blast_radius(self, start: int, max_hops: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(positions, probabilities, hops)`` of every agent ``start`` can reach within ``max_hops``."""
+        with self._lock:
+            self._ensure_compact()
+            best, layers = self._propagate(start, max_hops)
+            reached = np.flatnonzero(np.isfinite(best))
+            reached = reached[reached != start]
+            hops = np.zeros(len(reached), dtype=np.int64)
+            for layer, improved in reversed(list(enumerate(layers, start=1))):
+                mask = np.isin(reached, np.fromiter(improved, dtype=np.int64, count=len(improved)))
+                hops[mask & (hops == 0)] = layer
+            return reached, np.exp(best[reached]), hops
+
+    def describe_node(self, position: int) -> Dict:
+        return {
+            "id": int(self.agent_ids[position]),
+            "name": self.names[position],
+            "risk_score": round(float(self.risk[position]), 4),
+            "status": STATUSES[self.status[position]],
+        }
+
+    def describe_edge(self, row: int) -> Dict:
+        severity = int(self.edge_severity[row])
+        return {
+            "from": int(self.agent_ids[self.edge_source[row]]),
+            "to": int(self.agent_ids[self.edge_target[row]]),
+            "messages": int(self.edge_messages[row]),
+            "severity": ("낮음", "중간", "높음")[severity] if severity >= 0 else None,
+            "spread_probability": round(float(np.exp(self._spread_log(np.array([row]))[0])), 4),
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "agents": self.count,
+                "edges": self.edge_count,
+                "indexed_edges": self.indexed_edges,
+                "pending_edges": self.edge_count - self.indexed_edges,
+                "compactions": self.compactions,
+                "memory_bytes": sum(getattr(self, name).nbytes for name in EDGE_ARRAYS + NODE_ARRAYS)
+                + sum(array.nbytes for array in (self.out_ptr, self.out_rows, self.in_ptr, self.in_rows)),
+            }
@@ -0,0 +1,208 @@
+import heapq
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+EPOCH = datetime(1970, 1, 1)
+HOUR_MS = 3600 * 1000
+HIGH_SEVERITY = "높음"
+TREND_HOURS = 12
+TREND_RETENTION_HOURS = 24 * 7
+PERSISTENT_MIN_REPEATS = 2
+PERSISTENT_LIMIT = 5
+
+
+class OverviewAggregates:
+    """In-memory counters behind ``/api/overview``.
+
+    ``load`` computes everything from SQLite once, adding the hourly rollups of
+    expired partitions to the totals and trend; afterwards the write paths
+    call ``apply_packets`` / ``apply_alerts`` so a snapshot never has to scan
+    the packets table. ``verify`` recomputes from scratch and reports drift.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.agent_count = 0
+        self.communication_count = 0
+        self.status_counts: Counter = Counter()
+        self.agent_ids: Dict[str, int] = {}
+        self.total_packets = 0
+        self.severity_counts: Counter = Counter()
+        self.layer_counts: Counter = Counter()
+        self.hourly: Counter = Counter()
+        self.repeat_offenders: Dict[str, Dict] = {}
+        self.last_ts: Optional[int] = None
+        self.last_update: Optional[str] = None
+        self.alert_count = 0
+        self.alert_severity_counts: Counter = Counter()
+
+    def load(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._load_agents(conn)
+            self.total_packets = conn.execute("SELECT COUNT(*) FROM packets").fetchone()[0]
+            self.severity_counts = Counter(
+                {row[0]: row[1] for row in conn.execute("SELECT severity, COUNT(*) FROM packets GROUP BY severity")}
+            )
+            self.layer_counts = Counter(
+                {
+                    row[0]: row[1]
+                    for row in conn.execute("SELECT protocol_layer, COUNT(*) FROM packets GROUP BY protocol_layer")
+                }
+            )
+            rollups = conn.execute(
+                "SELECT hour, severity, protocol_layer, SUM(count) FROM packet_rollups GROUP BY 1, 2, 3"
+            ).fetchall()
+            newest = conn.execute("SELECT ts, timestamp FROM packets ORDER BY ts DESC LIMIT 1").fetchone()
+            self.last_ts, self.last_update = (newest[0], newest[1]) if newest else (None, None)
+            cutoff = (self.last_ts or 0) - TREND_RETENTION_HOURS * HOUR_MS
+            self.hourly = Counter(
+                {
+                    row[0]: row[1]
+                    for row in conn.execute(
+                        "SELECT ts / ? AS bucket, COUNT(*) FROM packets WHERE ts >= ? GROUP BY bucket",
+                        (HOUR_MS, cutoff),
+                    )
+                }
+            )
+            for hour, severity, layer, count in rollups:
+                self.total_packets += count
+                self.severity_counts[severity] += count
+                self.layer_counts[layer] += count
+                if hour * HOUR_MS >= cutoff:
+                    self.hourly[hour] += count
+            self.repeat_offenders = {
+                row[0]: {"count": row[1], "last_ts": row[2], "last_timestamp": row[3], "last_threat": row[4]}
+                for row in conn.execute(
+                    """
+                    SELECT source_agent, COUNT(*), MAX(ts), timestamp, threat_type
+                    FROM packets
+                    WHERE severity = ?
+                    GROUP BY source_agent
+                    """,
+                    (HIGH_SEVERITY,),
+                )
+            }
+            self.alert_count = conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+            self.alert_severity_counts = Counter(
+                {row[0]: row[1] for row in conn.execute("SELECT severity, COUNT(*) FROM alerts GROUP BY severity")}
+            )
+            for severity, count in conn.execute("SELECT severity, SUM(count) FROM alert_rollups GROUP BY severity"):
+                self.alert_count += count
+                self.alert_severity_counts[severity] += count
+
+    def load_agents(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._load_agents(conn)
+
+    def _load_agents(self, conn: sqlite3.Connection):
+        self.agent_count = conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0]
+        self.communication_count = conn.execute("SELECT COUNT(*) FROM communications").fetchone()[0]
+        self.status_counts = Counter(
+            {row[0]: row[1] for row in conn.execute("SELECT status, COUNT(*) FROM agents GROUP BY status")}
+        )
+        self.agent_ids = {row[1]: row[0] for row in conn.execute("SELECT id, name FROM agents")}
+
+    def apply_packets(self, packets: Iterable[Dict]):
+        with self._lock:
+            for packet in packets:
+                ts = packet["ts"]
+                self.total_packets += 1
+                self.severity_counts[packet["severity"]] += 1
+                self.layer_counts[packet["protocol_layer"]] += 1
+                self.hourly[ts // HOUR_MS] += 1
+                if self.last_ts is None or ts >= self.last_ts:
+                    self.last_ts = ts
+                    self.last_update = packet["timestamp"]
+                if packet["severity"] == HIGH_SEVERITY:
+                    offender = self.repeat_offenders.setdefault(
+                        packet["source_agent"],
+                        {"count": 0, "last_ts": ts, "last_timestamp": packet["timestamp"], "last_threat": None},
+                    )
+                    offender["count"] += 1
+                    if ts >= offender["last_ts"] or offender["last_threat"] is None:
+                        offender["last_ts"] = ts
+                        offender["last_timestamp"] = packet["timestamp"]
+                        offender["last_threat"] = packet["threat_type"]
+            self._prune_hourly()
+
+    def apply_rollups(self, packets: Iterable[Dict]):
+        """Count packets that went straight to the hourly rollups (past retention) like ``load`` does."""
+        with self._lock:
+            for packet in packets:
+                self.total_packets += 1
+                self.severity_counts[packet["severity"]] += 1
+                self.layer_counts[packet["protocol_layer"]] += 1
+                hour = packet["ts"] // HOUR_MS
+                if self.last_ts is not None and hour * HOUR_MS >= self.last_ts - TREND_RETENTION_HOURS * HOUR_MS:
+                    self.hourly[hour] += 1
+
+    def apply_alerts(self, alerts: Iterable[Dict]):
+        with self._lock:
+            for alert in alerts:
+                self.alert_count += 1
+                self.alert_severity_counts[alert["severity"]] += 1
+
+    def _prune_hourly(self):
+        if self.last_ts is None or len(self.hourly) <= TREND_RETENTION_HOURS + 1:
+            return
+        oldest = self.last_ts // HOUR_MS - TREND_RETENTION_HOURS
+        for bucket in [bucket for bucket in self.hourly if bucket < oldest]:
+            del self.hourly[bucket]
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict:
+        now_hour = (now or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+        buckets = [now_hour - timedelta(hours=offset) for offset in range(TREND_HOURS - 1, -1, -1)]
+        with self._lock:
+            offenders = heapq.nlargest(
+                PERSISTENT_LIMIT,
+                (item for item in self.repeat_offenders.items() if item[1]["count"] >= PERSISTENT_MIN_REPEATS),
+                key=lambda item: (item[1]["count"], item[1]["last_ts"], item[0]),
+            )
+            threat_trend = [
+                {
+                    "window": bucket.strftime("%Y-%m-%d %H:00"),
+                    "window_label": bucket.strftime("%m/%d %H시"),
+                    "count": self.hourly.get((bucket - EPOCH) // timedelta(hours=1), 0),
+                }
+                for bucket in buckets
+            ]
+            return {
+                "agent_count": self.agent_count,
+                "communication_count": self.communication_count,
+                "total_packets": self.total_packets,
+                "severity_counts": dict(self.severity_counts),
+                "status_counts": dict(self.status_counts),
+                "layer_counts": dict(sorted(self.layer_counts.items())),
+                "high_threats": self.severity_counts.get(HIGH_SEVERITY, 0),
+                "last_update": self.last_update,
+                "persistent_agents": [
+                    {
+                        "agent_name": name,
+                        "agent_id": self.agent_ids.get(name),
+                        "repeat_count": stats["count"],
+                        "last_detected": stats["last_timestamp"],
+                        "last_threat": stats["last_threat"] or "-",
+                    }
+                    for name, stats in offenders
+                ],
+                "threat_trend": threat_trend,
+                "alert_count": self.alert_count,
+                "alert_severity_counts": dict(self.alert_severity_counts),
+            }
+
+    def verify(self, conn: sqlite3.Connection, now: Optional[datetime] = None) -> Dict:
+        """Recompute from SQLite and list every field that differs from the live counters."""
+        now = now or datetime.utcnow()
+        fresh = OverviewAggregates()
+        fresh.load(conn)
+        expected = fresh.snapshot(now)
+        actual = self.snapshot(now)
+        differences = {
+            key: {"expected": expected[key], "actual": actual.get(key)}
+            for key in expected
+            if expected[key] != actual.get(key)
+        }
+        return {"consistent": not differences, "differences": differences}
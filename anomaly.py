@@ -0,0 +1,322 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEVERITY_INDEX = {"낮음": 0, "중간": 1, "높음": 2}
+LAYER_COUNT = 7
+STATUSES = ("정상", "주의", "격리")
+STATUS_THRESHOLDS = np.array([0.5, 0.8])
+REPORT_DELTA = 0.005
+PRIOR_WEIGHT = 20.0
+AGENT_ARRAYS = (
+    "agent_ids",
+    "risk",
+    "status",
+    "reported_risk",
+    "reported_status",
+    "intervals",
+    "rate_mean",
+    "rate_var",
+    "alert_mean",
+    "alert_var",
+    "high_share",
+    "layer_mix",
+    "pending_messages",
+    "pending_alerts",
+    "pending_severity",
+    "pending_layers",
+    "pending_new_peers",
+)
+PENDING_ARRAYS = ("pending_messages", "pending_alerts", "pending_severity", "pending_layers", "pending_new_peers")
+EDGE_ARRAYS = ("edge_source", "edge_target", "edge_messages", "edge_high", "edge_severity")
+
+
+def layer_index(layer: Optional[str]) -> int:
+    try:
+        return min(max(int(str(layer).rsplit(" ", 1)[-1]), 1), LAYER_COUNT) - 1
+    except ValueError:
+        return LAYER_COUNT - 1
+
+
+class AnomalyScorer:
+    """Rolling per-agent behaviour baselines and a vectorized risk score.
+
+    Every agent owns one row in a set of flat NumPy arrays (index assigned on
+    ``register``); edges between agents get rows in a second set of arrays.
+    ``apply_packets`` / ``apply_alerts`` only accumulate counts for the current
+    interval. ``score`` then compares the interval against exponentially
+    weighted baselines for all agents at once -- message and alert rate
+    z-scores, excess share of high severity, layer-mix divergence and the share
+    of traffic going to never-seen peers -- and updates the baselines with the
+    interval. Shares are shrunk toward the baseline by ``PRIOR_WEIGHT`` pseudo
+    messages so a quiet agent's few packets do not read as a shift in mix.
+    ``risk_score`` jumps up with the interval's score and decays by
+    ``smoothing`` per interval; ``status`` follows from it.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        smoothing: float = 0.7,
+        warmup_intervals: int = 5,
+        capacity: int = 1024,
+    ):
+        self.alpha = alpha
+        self.smoothing = smoothing
+        self.warmup_intervals = warmup_intervals
+        self._lock = threading.Lock()
+
+        self.index: Dict[str, int] = {}
+        self.count = 0
+        self.agent_ids = np.zeros(capacity, dtype=np.int64)
+        self.risk = np.zeros(capacity)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.reported_risk = np.zeros(capacity)
+        self.reported_status = np.zeros(capacity, dtype=np.int8)
+        self.intervals = np.zeros(capacity, dtype=np.int32)
+        self.rate_mean = np.zeros(capacity)
+        self.rate_var = np.zeros(capacity)
+        self.alert_mean = np.zeros(capacity)
+        self.alert_var = np.zeros(capacity)
+        self.high_share = np.zeros(capacity)
+        self.layer_mix = np.zeros((capacity, LAYER_COUNT))
+        self.pending_messages = np.zeros(capacity)
+        self.pending_alerts = np.zeros(capacity)
+        self.pending_severity = np.zeros((capacity, len(SEVERITY_INDEX)))
+        self.pending_layers = np.zeros((capacity, LAYER_COUNT))
+        self.pending_new_peers = np.zeros(capacity)
+
+        self.edges: Dict[int, int] = {}
+        self.edge_count = 0
+        self.edge_source = np.zeros(capacity, dtype=np.int32)
+        self.edge_target = np.zeros(capacity, dtype=np.int32)
+        self.edge_messages = np.zeros(capacity, dtype=np.int64)
+        self.edge_high = np.zeros(capacity, dtype=np.int64)
+        self.edge_severity = np.full(capacity, -1, dtype=np.int8)
+
+        self.last_interval_start = time.monotonic()
+        self.scored_intervals = 0
+        self.last_score_ms = 0.0
+
+    def _grow(self, names: Sequence[str], needed: int):
+        current = len(getattr(self, names[0]))
+        if needed <= current:
+            return
+        size = max(needed, current * 2)
+        for name in names:
+            array = getattr(self, name)
+            grown = np.zeros((size,) + array.shape[1:], dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    def register(self, agents: Iterable[Tuple[int, str, float, str]]):
+        """Add ``(agent_id, name, risk_score, status)`` rows; the stored values seed the live score."""
+        with self._lock:
+            for agent_id, name, risk, status in agents:
+                if name in self.index:
+                    continue
+                self._grow(AGENT_ARRAYS, self.count + 1)
+                position = self.count
+                self.index[name] = position
+                self.agent_ids[position] = agent_id
+                self.risk[position] = self.reported_risk[position] = risk
+                code = STATUSES.index(status) if status in STATUSES else 0
+                self.status[position] = self.reported_status[position] = code
+                self.count += 1
+
+    def _positions(self, records: Sequence[Dict], field: str) -> np.ndarray:
+        index = self.index
+        return np.fromiter((index.get(record[field], -1) for record in records), np.int64, len(records))
+
+    def _track_edges(self, sources: np.ndarray, targets: np.ndarray, severities: np.ndarray):
+        known = (sources >= 0) & (targets >= 0)
+        codes = (sources[known] << 32) | targets[known]
+        rows = np.empty(len(codes), dtype=np.int64)
+        edges = self.edges
+        for offset, code in enumerate(codes.tolist()):
+            row = edges.get(code)
+            if row is None:
+                row = self._add_edge(code, 0)
+                self.pending_new_peers[code >> 32] += 1
+                self.pending_new_peers[code & 0xFFFFFFFF] += 1
+            rows[offset] = row
+        np.add.at(self.edge_messages, rows, 1)
+        severities = severities[known]
+        np.add.at(self.edge_high, rows, (severities == SEVERITY_INDEX["높음"]).astype(np.int64))
+        np.maximum.at(self.edge_severity, rows, severities.astype(np.int8))
+
+    def _add_edge(self, code: int, messages: int, severity: int = -1) -> int:
+        if self.edge_count >= len(self.edge_source):
+            size = len(self.edge_source)
+            self._grow(EDGE_ARRAYS, self.edge_count + 1)
+            self.edge_severity[size:] = -1
+        row = self.edges[code] = self.edge_count
+        self.edge_source[row] = code >> 32
+        self.edge_target[row] = code & 0xFFFFFFFF
+        self.edge_messages[row] = messages
+        self.edge_severity[row] = severity
+        self.edge_count += 1
+        return row
+
+    def _accumulate(self, records: Sequence[Dict], alerts: bool):
+        if not records:
+            return
+        with self._lock:
+            sources = self._positions(records, "source_agent")
+            targets = self._positions(records, "target_agent")
+            severities = np.fromiter(
+                (SEVERITY_INDEX.get(record["severity"], 0) for record in records), np.int64, len(records)
+            )
+            layers = np.fromiter(
+                (layer_index(record.get("protocol_layer")) for record in records), np.int64, len(records)
+            )
+            for side in (sources, targets):
+                mask = side >= 0
+                agents = side[mask]
+                if alerts:
+                    np.add.at(self.pending_alerts, agents, 1)
+                else:
+                    np.add.at(self.pending_messages, agents, 1)
+                np.add.at(self.pending_severity, (agents, severities[mask]), 1)
+                np.add.at(self.pending_layers, (agents, layers[mask]), 1)
+            if not alerts:
+                self._track_edges(sources, targets, severities)
+
+    def apply_packets(self, packets: Sequence[Dict]):
+        self._accumulate(packets, alerts=False)
+
+    def apply_alerts(self, alerts: Sequence[Dict]):
+        self._accumulate(alerts, alerts=True)
+
+    def seed_edges(self, pairs: Iterable[Tuple[str, str, int, Optional[int]]]):
+        """Mark existing ``(source, target, messages, max_severity)`` pairs as known peers without counting them as new.
+
+        ``max_severity`` is an index into ``SEVERITY_INDEX`` order or ``None``.
+        """
+        with self._lock:
+            for source, target, messages, severity in pairs:
+                if source not in self.index or target not in self.index:
+                    continue
+                code = (self.index[source] << 32) | self.index[target]
+                row = self.edges.get(code)
+                if row is None:
+                    row = self._add_edge(code, 0)
+                self.edge_messages[row] += messages
+                if severity is not None:
+                    self.edge_severity[row] = max(int(self.edge_severity[row]), severity)
+
+    def edge_snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(source_ids, target_ids, messages, max_severity)`` for every edge, in agent ids."""
+        with self._lock:
+            n = self.edge_count
+            return (
+                self.agent_ids[self.edge_source[:n]],
+                self.agent_ids[self.edge_target[:n]],
+                self.edge_messages[:n].copy(),
+                self.edge_severity[:n].copy(),
+            )
+
+    @staticmethod
+    def _zscore(value: np.ndarray, mean: np.ndarray, var: np.ndarray, seconds: float) -> np.ndarray:
+        std = np.sqrt(np.maximum(var, mean / seconds) + 1e-9)
+        return np.clip((value - mean) / std, 0, 10)
+
+    def _ewma(self, mean: np.ndarray, var: np.ndarray, value: np.ndarray):
+        alpha = self.alpha
+        delta = value - mean
+        mean += alpha * delta
+        var *= 1 - alpha
+        var += alpha * (1 - alpha) * delta * delta
+
+    def score(self, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Close the current interval and return ``(agent_ids, risk_scores, statuses)`` of agents that changed.
+
+        An agent is reported when its risk moved by at least ``REPORT_DELTA``
+        or its status changed since it was last reported.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            started = time.perf_counter()
+            n = self.count
+            seconds = max(now - self.last_interval_start, 1e-3)
+            self.last_interval_start = now
+
+            messages = self.pending_messages[:n]
+            alerts = self.pending_alerts[:n]
+            activity = messages + alerts
+            active = activity > 0
+            denominator = np.maximum(activity, 1)
+            shrunk = activity + PRIOR_WEIGHT
+
+            rate = messages / seconds
+            alert_rate = alerts / seconds
+            high_count = self.pending_severity[:n, SEVERITY_INDEX["높음"]]
+            high = high_count / denominator
+            high_shrunk = (high_count + PRIOR_WEIGHT * self.high_share[:n]) / shrunk
+            mix = self.pending_layers[:n] / denominator[:, None]
+            mix_shrunk = (self.pending_layers[:n] + PRIOR_WEIGHT * self.layer_mix[:n]) / shrunk[:, None]
+            divergence = 0.5 * np.abs(mix_shrunk - self.layer_mix[:n]).sum(axis=1)
+            new_peers = np.minimum(self.pending_new_peers[:n] / shrunk, 1.0)
+
+            signal = (
+                0.35 * self._zscore(rate, self.rate_mean[:n], self.rate_var[:n], seconds)
+                + 0.35 * self._zscore(alert_rate, self.alert_mean[:n], self.alert_var[:n], seconds)
+                + 1.5 * np.clip(high_shrunk - self.high_share[:n], 0, 1)
+                + 1.0 * divergence
+                + 1.5 * new_peers
+            )
+            instant = 1 - np.exp(-signal)
+            warm = self.intervals[:n] >= self.warmup_intervals
+            risk = self.risk[:n]
+            risk[warm] = np.maximum(instant[warm], self.smoothing * risk[warm] + (1 - self.smoothing) * instant[warm])
+
+            self._ewma(self.rate_mean[:n], self.rate_var[:n], rate)
+            self._ewma(self.alert_mean[:n], self.alert_var[:n], alert_rate)
+            step = np.where(active, self.alpha, 0.0)
+            self.high_share[:n] += step * (high - self.high_share[:n])
+            self.layer_mix[:n] += step[:, None] * (mix - self.layer_mix[:n])
+            self.intervals[:n] += 1
+
+            for name in PENDING_ARRAYS:
+                getattr(self, name)[:n] = 0
+
+            status = self.status[:n]
+            status[warm] = np.searchsorted(STATUS_THRESHOLDS, risk[warm], side="right")
+            changed = np.flatnonzero(
+                (np.abs(risk - self.reported_risk[:n]) >= REPORT_DELTA) | (status != self.reported_status[:n])
+            )
+            self.reported_risk[changed] = risk[changed]
+            self.reported_status[changed] = status[changed]
+
+            self.scored_intervals += 1
+            self.last_score_ms = (time.perf_counter() - started) * 1000
+            return (
+                self.agent_ids[changed],
+                np.round(risk[changed], 4),
+                [STATUSES[code] for code in status[changed].tolist()],
+            )
+
+    def stats(self, top: int = 5) -> Dict:
+        with self._lock:
+            n = self.count
+            order = np.argsort(-self.risk[:n])[:top]
+            wanted = set(order.tolist())
+            names = {position: name for name, position in self.index.items() if position in wanted}
+            return {
+                "agents": n,
+                "edges": self.edge_count,
+                "scored_intervals": self.scored_intervals,
+                "last_score_ms": round(self.last_score_ms, 3),
+                "memory_bytes": sum(getattr(self, name).nbytes for name in AGENT_ARRAYS + EDGE_ARRAYS),
+                "top_agents": [
+                    {
+                        "agent_id": int(self.agent_ids[position]),
+                        "name": names[position],
+                        "risk_score": round(float(self.risk[position]), 4),
+                        "status": STATUSES[self.status[position]],
+                    }
+                    for position in order.tolist()
+                ],
+            }
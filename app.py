@@ -1,39 +1,240 @@
+import atexit
+import base64
+import itertools
 import json
 import os
-import queue
 import random
+import re
 import sqlite3
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 from flask import (
     Flask,
     Response,
     abort,
+    g,
     jsonify,
     redirect,
     render_template,
     request,
+    stream_with_context,
     url_for,
 )
 
-DATABASE_PATH = os.path.join(os.path.dirname(__file__), "a2a_demo.db")
+from adjacency import AdjacencyIndex
+from aggregates import OverviewAggregates
+from anomaly import AnomalyScorer
+from broadcaster import FILTER_FIELDS, EventBroadcaster, Filters, encode_frames
+from bus import LocalBus, SocketBus, file_lock
+from cache import ResponseCache
+from columnar import GROUP_KEYS, ID_COLUMNS, TIME_BUCKETS, ColumnStore, bucket_label
+from compression import ResponseCompressor, StaticAssets
+import detection
+from db import ConnectionPool
+from directory import AgentDirectory
+from graph import CLUSTER_FIELDS, AgentGraph
+from metrics import ProfiledConnection, RequestMetrics, SqlProfiler, render_samples
+from partitions import DAY_MS, PartitionStore, day_label, day_of
+from replay import WindowedReplayRule
+from writer import Backpressure, BatchWriter
+
+DATABASE_PATH = os.environ.get(
+    "A2A_DATABASE_PATH", os.path.join(os.path.dirname(__file__), "a2a_demo.db")
+)
+DB_POOL_SIZE = int(os.environ.get("A2A_DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT_MS = 5000
+PARTITION_DIRECTORY = os.environ.get(
+    "A2A_PARTITION_DIR", os.path.splitext(DATABASE_PATH)[0] + "-partitions"
+)
+RETENTION_DAYS = int(os.environ.get("A2A_RETENTION_DAYS", "7"))
+RETENTION_INTERVAL_SECONDS = 3600
+EVENT_BUS = os.environ.get("A2A_EVENT_BUS", "local")
+EVENT_BUS_SOCKET = os.environ.get("A2A_EVENT_BUS_SOCKET", os.path.splitext(DATABASE_PATH)[0] + ".bus.sock")
+LEADER_LOCK_PATH = os.path.splitext(DATABASE_PATH)[0] + ".leader.lock"
+STARTUP_LOCK_PATH = os.path.splitext(DATABASE_PATH)[0] + ".startup.lock"
+FOLLOWER_POLL_SECONDS = 1
+COLUMNAR_DIRECTORY = os.environ.get(
+    "A2A_COLUMNAR_DIR", os.path.splitext(DATABASE_PATH)[0] + "-columnar"
+)
+METRICS_ENABLED = os.environ.get("A2A_METRICS", "1") != "0"
+SLOW_QUERY_MS = float(os.environ.get("A2A_SLOW_QUERY_MS", "100"))
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_LEVEL = 5
+ANALYTICS_MAX_KEYS = 4
+ANALYTICS_RESULT_LIMIT = 5000
+RECENT_PACKET_LIMIT = 20
+RECENT_ALERT_LIMIT = 10
+DASHBOARD_SECTIONS = ("overview", "recent_packets", "recent_alerts")
+PACKET_PAGE_SIZE = 100
+PACKET_PAGE_MAX = 1000
+NDJSON_BATCH_SIZE = 500
+FTS_SELECTIVE_MATCHES = 2000
+INGEST_BATCH_SIZE = 5000
+INGEST_MAX_TRANSACTION_ROWS = 50000
+INGEST_QUEUE_BATCHES = 32
+INGEST_SUBMIT_TIMEOUT = 2.0
+INGEST_MAX_ERRORS = 50
+NDJSON_READ_SIZE = 64 * 1024
+ALERT_FLUSH_ROWS = 200
+ALERT_FLUSH_MS = 50
+ALERT_QUEUE_SIZE = 1000
+ALERT_SUBMIT_TIMEOUT = 1.0
+DETECTION_REPLAY_WINDOW_SECONDS = 300
+REPLAY_EXPECTED_TASKS = int(os.environ.get("A2A_REPLAY_EXPECTED_TASKS", 1_000_000))
+REPLAY_ERROR_RATE = float(os.environ.get("A2A_REPLAY_ERROR_RATE", 0.001))
+REPLAY_CONFIRM_SIZE = 100_000
+ANOMALY_INTERVAL_SECONDS = 30
+GRAPH_TOPICS = ("agents", "packets")
+GRAPH_MAX_STALENESS_SECONDS = float(os.environ.get("A2A_GRAPH_MAX_STALENESS_SECONDS", "10"))
+GRAPH_DETAIL_LIMIT = 300
+GRAPH_FULL_MAX_AGENTS = 2000
+GRAPH_MAX_EDGES = 2000
+GRAPH_TOP_K = 50
+GRAPH_EGO_MAX_DEPTH = 3
+GRAPH_COMMUNICATION_LIMIT = 50
+PATH_DEFAULT_HOPS = 3
+PATH_MAX_HOPS = 6
+PATH_RESULT_LIMIT = 500
+TRUSTED_AGENT_DOMAINS = [
+    domain.strip()
+    for domain in os.environ.get("A2A_TRUSTED_DOMAINS", ",".join(detection.TRUSTED_AGENT_DOMAINS)).split(",")
+    if domain.strip()
+]
+
+SEVERITIES = ("낮음", "중간", "높음")
+REQUIRED_PACKET_FIELDS = (
+    "source_agent",
+    "target_agent",
+    "protocol_layer",
+    "threat_type",
+    "severity",
+    "description",
+)
 
 app = Flask(__name__)
 
-event_queue: "queue.Queue[dict]" = queue.Queue(maxsize=100)
+SSE_BUFFER_SIZE = 100
+SSE_REPLAY_SIZE = 1000
+SSE_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MS = 5000
+SSE_MAX_FRAMES_PER_SECOND = float(os.environ.get("A2A_SSE_MAX_FPS", "4"))
+
+broadcaster = EventBroadcaster(buffer_size=SSE_BUFFER_SIZE, replay_size=SSE_REPLAY_SIZE)
 event_thread_started = False
+fts_enabled = False
+overview = OverviewAggregates()
+scorer = AnomalyScorer()
+path_index = AdjacencyIndex()
+agent_graph: Optional[AgentGraph] = None
+agent_graph_versions: Optional[Tuple[int, ...]] = None
+agent_graph_built_at = 0.0
+agent_graph_lock = threading.Lock()
+response_cache = ResponseCache()
+partition_store = PartitionStore(
+    PARTITION_DIRECTORY, os.path.splitext(os.path.basename(DATABASE_PATH))[0], RETENTION_DAYS
+)
+column_store = ColumnStore(COLUMNAR_DIRECTORY)
+event_bus = SocketBus(EVENT_BUS_SOCKET, LEADER_LOCK_PATH) if EVENT_BUS == "unix" else LocalBus()
+static_assets = StaticAssets(app.static_folder)
+response_compressor = ResponseCompressor(COMPRESSION_MIN_BYTES, COMPRESSION_LEVEL)
+request_metrics = RequestMetrics()
+sql_profiler = SqlProfiler(slow_ms=SLOW_QUERY_MS)
+packet_writer: Optional[BatchWriter] = None
+alert_writer: Optional[BatchWriter] = None
+detection_engine = detection.DetectionEngine(
+    [
+        WindowedReplayRule(
+            DETECTION_REPLAY_WINDOW_SECONDS,
+            capacity=REPLAY_EXPECTED_TASKS,
+            error_rate=REPLAY_ERROR_RATE,
+            confirm_size=REPLAY_CONFIRM_SIZE,
+        ),
+        detection.SchemaRule(),
+        detection.UnknownDomainCardRule(TRUSTED_AGENT_DOMAINS),
+    ]
+)
+DETECTED_THREATS = {rule.threat_type for rule in detection_engine.rules}
 
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_PATH)
+    if METRICS_ENABLED:
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, factory=ProfiledConnection)
+        conn.profiler = sql_profiler
+    else:
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -16000")
+    conn.execute("PRAGMA mmap_size = 134217728")
     return conn
 
 
+def create_db_pool() -> ConnectionPool:
+    pool = ConnectionPool(get_db_connection, size=DB_POOL_SIZE, prepare=partition_store.sync)
+    with pool.write() as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+    return pool
+
+
+def load_agent_names() -> List[Tuple[int, str]]:
+    with db_pool.read() as conn:
+        return [(row["id"], row["name"]) for row in conn.execute("SELECT id, name FROM agents ORDER BY id")]
+
+
+agent_directory = AgentDirectory(load_agent_names)
+
+
+def get_db() -> sqlite3.Connection:
+    if "db" not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+
+@app.teardown_appcontext
+def release_db(exception=None):
+    conn = g.pop("db", None)
+    if conn is not None:
+        db_pool.release(conn)
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ms(value: Union[str, datetime]) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        raise TypeError(f"expected ISO 8601 text or datetime, got {type(value).__name__}")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(milliseconds=1)
+
+
 def init_db():
-    conn = get_db_connection()
+    global fts_enabled
+    with db_pool.write() as conn:
+        create_schema(conn)
+        run_migrations(conn)
+        fts_enabled = fts5_available(conn)
+        partition_store.fts_columns = FTS_COLUMNS if fts_enabled else None
+        partition_store.open(conn)
+
+        if conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0] == 0:
+            seed_database(conn)
+
+        ensure_profiles(conn)
+        ensure_alert_seed(conn)
+        backfill_agent_ids(conn)
+        partition_store.adopt(conn)
+    agent_directory.invalidate()
+
+
+def create_schema(conn: sqlite3.Connection):
     cur = conn.cursor()
 
     cur.execute(
@@ -111,14 +312,190 @@ def init_db():
 
     conn.commit()
 
-    cur.execute("SELECT COUNT(*) FROM agents")
-    if cur.fetchone()[0] == 0:
-        seed_database(conn)
 
-    ensure_profiles(conn)
-    ensure_alert_seed(conn)
+def migrate_sortable_timestamps(conn: sqlite3.Connection):
+    for table in ("packets", "alerts"):
+        columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if "ts" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN ts INTEGER NOT NULL DEFAULT 0")
+        rows = conn.execute(f"SELECT id, timestamp FROM {table} WHERE ts = 0").fetchall()
+        conn.executemany(
+            f"UPDATE {table} SET ts = ? WHERE id = ?",
+            [(to_epoch_ms(row["timestamp"]), row["id"]) for row in rows],
+        )
 
-    conn.close()
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_packets_ts ON packets (ts)",
+        "CREATE INDEX IF NOT EXISTS idx_packets_severity_ts ON packets (severity, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_packets_source_ts ON packets (source_agent, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_packets_target_ts ON packets (target_agent, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_packets_layer ON packets (protocol_layer)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts (ts)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_severity_ts ON alerts (severity, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_source_ts ON alerts (source_agent, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_target_ts ON alerts (target_agent, ts)",
+    ):
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+
+
+FTS_COLUMNS = {
+    "packets": ("threat_type", "source_agent", "target_agent", "description", "resolution"),
+    "alerts": ("threat_type", "source_agent", "target_agent", "description"),
+}
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+
+def migrate_full_text_search(conn: sqlite3.Connection):
+    if not fts5_available(conn):
+        return
+
+    for table, columns in FTS_COLUMNS.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                {column_list},
+                content='{table}',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+            """
+        )
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+def backfill_agent_ids(conn: sqlite3.Connection):
+    for table in ("packets", "alerts"):
+        conn.execute(
+            f"""
+            UPDATE main.{table}
+            SET source_agent_id = (SELECT MIN(id) FROM agents WHERE name = {table}.source_agent),
+                target_agent_id = (SELECT MIN(id) FROM agents WHERE name = {table}.target_agent)
+            WHERE source_agent_id IS NULL OR target_agent_id IS NULL
+            """
+        )
+
+
+def migrate_agent_ids(conn: sqlite3.Connection):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_agents_name ON agents (name)")
+    for table in ("packets", "alerts"):
+        columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column in ("source_agent_id", "target_agent_id"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER REFERENCES agents (id)")
+    backfill_agent_ids(conn)
+
+    for statement in (
+        "DROP INDEX IF EXISTS idx_packets_source_ts",
+        "DROP INDEX IF EXISTS idx_packets_target_ts",
+        "DROP INDEX IF EXISTS idx_alerts_source_ts",
+        "DROP INDEX IF EXISTS idx_alerts_target_ts",
+        "CREATE INDEX IF NOT EXISTS idx_packets_source_id_ts ON packets (source_agent_id, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_packets_target_id_ts ON packets (target_agent_id, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_source_id_ts ON alerts (source_agent_id, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_alerts_target_id_ts ON alerts (target_agent_id, ts)",
+    ):
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+
+
+def migrate_partitions(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS partitions (
+            day INTEGER PRIMARY KEY,
+            created_at INTEGER NOT NULL
+        )
+        """
+    )
+    for table in ("packet_rollups", "alert_rollups"):
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                hour INTEGER NOT NULL,
+                severity TEXT NOT NULL,
+                protocol_layer TEXT NOT NULL,
+                threat_type TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (hour, severity, protocol_layer, threat_type)
+            ) WITHOUT ROWID
+            """
+        )
+    for table in FTS_COLUMNS:
+        for trigger in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+        conn.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+def migrate_row_ids(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS row_ids (
+            kind TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        )
+        """
+    )
+
+
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    migrate_sortable_timestamps,
+    migrate_full_text_search,
+    migrate_agent_ids,
+    migrate_partitions,
+    migrate_row_ids,
+]
+
+
+def run_migrations(conn: sqlite3.Connection):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
 
 
 def seed_database(conn: sqlite3.Connection):
@@ -301,13 +678,14 @@ def seed_database(conn: sqlite3.Connection):
     for packet in packets:
         conn.execute(
             """
-            INSERT INTO packets (
-                timestamp, source_agent, target_agent, protocol_layer,
+            INSERT INTO main.packets (
+                timestamp, ts, source_agent, target_agent, protocol_layer,
                 threat_type, severity, description, resolution
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 packet[0].isoformat(),
+                to_epoch_ms(packet[0]),
                 packet[1],
                 packet[2],
                 packet[3],
@@ -342,11 +720,11 @@ def seed_database(conn: sqlite3.Connection):
     for alert in alert_seed:
         conn.execute(
             """
-            INSERT INTO alerts (
-                timestamp, source_agent, target_agent, threat_type, severity, protocol_layer, description
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO main.alerts (
+                timestamp, ts, source_agent, target_agent, threat_type, severity, protocol_layer, description
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            alert,
+            (alert[0].isoformat(), to_epoch_ms(alert[0])) + alert[1:],
         )
 
     conn.commit()
@@ -449,11 +827,11 @@ def ensure_alert_seed(conn: sqlite3.Connection):
     for alert in seed:
         cur.execute(
             """
-            INSERT INTO alerts (
-                timestamp, source_agent, target_agent, threat_type, severity, protocol_layer, description
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO main.alerts (
+                timestamp, ts, source_agent, target_agent, threat_type, severity, protocol_layer, description
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (alert[0].isoformat(),) + alert[1:],
+            (alert[0].isoformat(), to_epoch_ms(alert[0])) + alert[1:],
         )
     conn.commit()
 
@@ -470,12 +848,11 @@ def format_agent(row: sqlite3.Row) -> Dict:
 
 
 def get_agent_profile(agent_id: int) -> Optional[Dict]:
-    conn = get_db_connection()
+    conn = get_db()
     row = conn.execute(
         "SELECT agents.*, agent_profiles.* FROM agents JOIN agent_profiles ON agents.id = agent_profiles.agent_id WHERE agents.id = ?",
         (agent_id,),
     ).fetchone()
-    conn.close()
     if not row:
         return None
     return {
@@ -494,9 +871,7 @@ def get_agent_profile(agent_id: int) -> Optional[Dict]:
     }
 
 
-def format_packet(row: sqlite3.Row, agent_map: Dict[str, Dict[str, int]]) -> Dict:
-    source_info = agent_map.get(row["source_agent"], {})
-    target_info = agent_map.get(row["target_agent"], {})
+def format_packet(row: sqlite3.Row) -> Dict:
     return {
         "id": row["id"],
         "timestamp": row["timestamp"],
@@ -507,8 +882,8 @@ def format_packet(row: sqlite3.Row, agent_map: Dict[str, Dict[str, int]]) -> Dic
         "severity": row["severity"],
         "description": row["description"],
         "resolution": row["resolution"],
-        "source_agent_id": source_info.get("id"),
-        "target_agent_id": target_info.get("id"),
+        "source_agent_id": row["source_agent_id"],
+        "target_agent_id": row["target_agent_id"],
     }
 
 
@@ -516,15 +891,50 @@ def format_alert(row: sqlite3.Row) -> Dict:
     return {
         "id": row["id"],
         "timestamp": row["timestamp"],
+        "ts": row["ts"],
         "source_agent": row["source_agent"],
         "target_agent": row["target_agent"],
         "threat_type": row["threat_type"],
         "severity": row["severity"],
         "protocol_layer": row["protocol_layer"],
         "description": row["description"],
+        "source_agent_id": row["source_agent_id"],
+        "target_agent_id": row["target_agent_id"],
     }
 
 
+def asset_url(filename: str) -> str:
+    fingerprinted = static_assets.url_path(filename)
+    if fingerprinted is None:
+        return url_for("static", filename=filename)
+    return url_for("asset", filename=fingerprinted)
+
+
+app.add_template_global(asset_url)
+
+
+@app.before_request
+def start_request_timer():
+    if METRICS_ENABLED:
+        g.request_started = time.perf_counter()
+        request_metrics.started()
+
+
+@app.after_request
+def observe_request(response: Response) -> Response:
+    # Registered before compress_response, so it runs after it and the compression time is included.
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        request_metrics.observe(route, request.method, response.status_code, time.perf_counter() - started)
+    return response
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    return response_compressor.apply(response, request.accept_encodings)
+
+
 @app.context_processor
 def inject_branding():
     now = datetime.utcnow()
@@ -539,36 +949,224 @@ def inject_branding():
     }
 
 
-def save_alert(event: Dict) -> Dict:
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO alerts (timestamp, source_agent, target_agent, threat_type, severity, protocol_layer, description)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            event["timestamp"],
-            event["source_agent"],
-            event["target_agent"],
-            event["threat_type"],
-            event["severity"],
-            event.get("protocol_layer", "Layer ?"),
-            event["description"],
-        ),
+def route_rows(conn: sqlite3.Connection, kind: str, rows: List[Dict]) -> Tuple[Dict[int, List[Dict]], List[Dict]]:
+    """Group rows by partition day, creating missing partitions; rows past retention go to the rollups.
+
+    Timestamps too far in the future are clamped to now, and every row to be
+    stored gets its ``id`` from the global counter in arrival order. Returns
+    the groups to insert and the rolled-up rows.
+    """
+    now_ms = int(time.time() * 1000)
+    routed = []
+    for row in rows:
+        if partition_store.clamp_ts(row["ts"], now_ms) is not None:
+            row["ts"] = now_ms
+            row["timestamp"] = (EPOCH + timedelta(milliseconds=now_ms)).isoformat()
+        routed.append((partition_store.route(row["ts"], now_ms), row))
+    days = {day for day, _ in routed if day is not None}
+    if partition_store.ensure(conn, days):
+        event_bus.publish("partitions", {"dropped": []})
+    groups: Dict[int, List[Dict]] = {}
+    expired = []
+    ids = partition_store.allocate_ids(conn, kind, sum(day is not None for day, _ in routed))
+    for day, row in routed:
+        if day is None:
+            expired.append(row)
+        else:
+            row["id"] = next(ids)
+            groups.setdefault(day, []).append(row)
+    if expired:
+        partition_store.rollup_records(conn, kind, expired)
+    return groups, expired
+
+
+ALERT_INSERT_SQL = """
+    INSERT INTO {table} (
+        id, timestamp, ts, source_agent, target_agent, source_agent_id, target_agent_id,
+        threat_type, severity, protocol_layer, description
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def write_alerts(alerts: List[Dict]):
+    for alert in alerts:
+        alert["ts"] = to_epoch_ms(alert["timestamp"])
+        alert["source_agent_id"] = agent_directory.id_for(alert["source_agent"])
+        alert["target_agent_id"] = agent_directory.id_for(alert["target_agent"])
+    with db_pool.write() as conn:
+        groups, _ = route_rows(conn, "alerts", alerts)
+        for day, group in groups.items():
+            sql = ALERT_INSERT_SQL.format(table=partition_store.table(day, "alerts"))
+            for alert in group:
+                conn.execute(
+                    sql,
+                    (
+                        alert["id"],
+                        alert["timestamp"],
+                        alert["ts"],
+                        alert["source_agent"],
+                        alert["target_agent"],
+                        alert["source_agent_id"],
+                        alert["target_agent_id"],
+                        alert["threat_type"],
+                        alert["severity"],
+                        alert.get("protocol_layer", "Layer ?"),
+                        alert["description"],
+                    ),
+                )
+    apply_alerts(alerts)
+    event_bus.publish("alerts", alerts)
+
+
+def apply_alerts(alerts: List[Dict]):
+    """Fold stored alerts into this process's aggregates and SSE feed (local writes and peer events)."""
+    overview.apply_alerts(alerts)
+    scorer.apply_alerts(alerts)
+    response_cache.invalidate("alerts")
+    for alert in alerts:
+        if alert.get("id") is not None:
+            broadcaster.publish(alert)
+
+
+PACKET_INSERT_SQL = """
+    INSERT INTO {table} (
+        id, timestamp, ts, source_agent, target_agent, source_agent_id, target_agent_id,
+        protocol_layer, threat_type, severity, description, resolution
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def packet_params(packet: Dict) -> Tuple:
+    return (
+        packet["id"],
+        packet["timestamp"],
+        packet["ts"],
+        packet["source_agent"],
+        packet["target_agent"],
+        agent_directory.id_for(packet["source_agent"]),
+        agent_directory.id_for(packet["target_agent"]),
+        packet["protocol_layer"],
+        packet["threat_type"],
+        packet["severity"],
+        packet["description"],
+        packet["resolution"],
     )
-    event_id = cur.lastrowid
-    conn.commit()
-    conn.close()
-    event["id"] = event_id
-    return event
+
+
+def save_packet(packet: Dict) -> Dict:
+    packet.setdefault("ts", to_epoch_ms(packet["timestamp"]))
+    packet["id"] = None
+    with db_pool.write() as conn:
+        groups, expired = route_rows(conn, "packets", [packet])
+        for day in groups:
+            conn.execute(PACKET_INSERT_SQL.format(table=partition_store.table(day, "packets")), packet_params(packet))
+    stored = [] if expired else [packet]
+    apply_packets(stored, expired)
+    publish_packets(stored, expired)
+    return packet
+
+
+def write_packets(packets: List[Dict]):
+    with db_pool.write() as conn:
+        groups, expired = route_rows(conn, "packets", packets)
+        for day, group in groups.items():
+            conn.executemany(
+                PACKET_INSERT_SQL.format(table=partition_store.table(day, "packets")), map(packet_params, group)
+            )
+    stored = [packet for group in groups.values() for packet in group]
+    apply_packets(stored, expired)
+    publish_packets(stored, expired)
+
+
+PACKET_EVENT_FIELDS = ("ts", "timestamp", "source_agent", "target_agent", "protocol_layer", "threat_type", "severity")
+
+
+def apply_packets(stored: List[Dict], expired: List[Dict]):
+    """Fold written packets into this process's aggregates, scorer and path index."""
+    overview.apply_packets(stored)
+    overview.apply_rollups(expired)
+    scorer.apply_packets(stored + expired)
+    path_index.apply_packets(stored + expired)
+    response_cache.invalidate("packets")
+
+
+def publish_packets(stored: List[Dict], expired: List[Dict]):
+    """Send the fields the in-memory views need (not the full rows) to the other workers."""
+    event_bus.publish(
+        "packets",
+        {
+            "stored": [{field: packet[field] for field in PACKET_EVENT_FIELDS} for packet in stored],
+            "expired": [{field: packet[field] for field in PACKET_EVENT_FIELDS} for packet in expired],
+        },
+    )
+
+
+def validate_packet(record) -> Dict:
+    if not isinstance(record, dict):
+        raise ValueError("레코드는 JSON 객체여야 합니다")
+    missing = [
+        field
+        for field in REQUIRED_PACKET_FIELDS
+        if not isinstance(record.get(field), str) or not record[field].strip()
+    ]
+    if missing:
+        raise ValueError(f"필수 필드 누락: {', '.join(missing)}")
+    if record["severity"] not in SEVERITIES:
+        raise ValueError(f"알 수 없는 심각도: {record['severity']}")
+
+    timestamp = record.get("timestamp") or datetime.utcnow().isoformat()
+    if not isinstance(timestamp, str):
+        raise ValueError("timestamp는 문자열이어야 합니다")
+    try:
+        moment = detection.parse_timestamp(timestamp)
+    except (OverflowError, ValueError):
+        raise ValueError(f"잘못된 timestamp: {timestamp}")
+    resolution = record.get("resolution") or "-"
+    if not isinstance(resolution, str):
+        raise ValueError("resolution은 문자열이어야 합니다")
+
+    return {
+        "timestamp": moment.isoformat(),
+        "ts": to_epoch_ms(moment),
+        "source_agent": record["source_agent"],
+        "target_agent": record["target_agent"],
+        "protocol_layer": record["protocol_layer"],
+        "threat_type": record["threat_type"],
+        "severity": record["severity"],
+        "description": record["description"],
+        "resolution": resolution,
+    }
+
+
+def simulate_traffic(source: Dict, target: Dict, threat_type: str, recent_task_ids: List[str]) -> List[Dict]:
+    timestamp = datetime.utcnow().isoformat()
+    base = {"timestamp": timestamp, "source_agent": source["name"], "target_agent": target["name"]}
+    task_id = f"task-{random.getrandbits(48):012x}"
+    records = [{**base, "kind": "task", "task_id": task_id, "body": {"message": {"role": "user", "parts": []}}}]
+
+    if threat_type == "Task Replay" and recent_task_ids:
+        replayed = random.choice(recent_task_ids)
+        records.append({**base, "kind": "task", "task_id": replayed, "body": {"message": {"role": "user", "parts": []}}})
+    elif threat_type == "Message Schema Violation":
+        records.append({**base, "kind": "message", "task_id": task_id, "body": {"role": "agent", "parts": "text"}})
+    elif threat_type == "Agent Card Spoofing":
+        host = source["name"].lower().replace("-", ".") + ".a2a-update.example"
+        card = {"name": source["name"], "url": f"https://{host}/a2a", "version": "1.0", "skills": []}
+        records.append({**base, "kind": "agent_card", "body": card})
+
+    recent_task_ids.append(task_id)
+    del recent_task_ids[:-50]
+    return records
 
 
 def generate_event():
+    recent_task_ids: List[str] = []
     while True:
-        conn = get_db_connection()
-        agents = [format_agent(row) for row in conn.execute("SELECT * FROM agents").fetchall()]
-        conn.close()
+        if not event_bus.is_leader:
+            time.sleep(FOLLOWER_POLL_SECONDS)
+            continue
+        with db_pool.read() as conn:
+            agents = [format_agent(row) for row in conn.execute("SELECT * FROM agents").fetchall()]
 
         source, target = random.sample(agents, 2)
         threat_types = [
@@ -587,38 +1185,259 @@ def generate_event():
         layers = ["Layer 2", "Layer 3", "Layer 4", "Layer 6", "Layer 7"]
 
         threat_type = random.choice(threat_types)
-        severity = random.choices(severities, weights=[0.3, 0.4, 0.3])[0]
-        protocol_layer = random.choice(layers)
-        timestamp = datetime.utcnow().isoformat()
-        description = f"{source['name']} → {target['name']} 통신 중 '{threat_type}' 시그니처 감지"
-
-        event = {
-            "timestamp": timestamp,
-            "source_agent": source["name"],
-            "target_agent": target["name"],
-            "source_agent_id": source["id"],
-            "target_agent_id": target["id"],
-            "threat_type": threat_type,
-            "severity": severity,
-            "protocol_layer": protocol_layer,
-            "description": description,
-        }
+        events = detection_engine.process(simulate_traffic(source, target, threat_type, recent_task_ids))
+        if threat_type not in DETECTED_THREATS:
+            events.append(
+                {
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "source_agent": source["name"],
+                    "target_agent": target["name"],
+                    "threat_type": threat_type,
+                    "severity": random.choices(severities, weights=[0.3, 0.4, 0.3])[0],
+                    "protocol_layer": random.choice(layers),
+                    "description": f"{source['name']} → {target['name']} 통신 중 '{threat_type}' 시그니처 감지",
+                }
+            )
+
+        if events:
+            try:
+                alert_writer.submit(events, timeout=ALERT_SUBMIT_TIMEOUT)
+            except Backpressure:
+                pass
 
-        stored_event = save_alert(event.copy())
+        time.sleep(random.uniform(3, 6))
 
-        try:
-            event_queue.put(stored_event, timeout=1)
-        except queue.Full:
-            pass
 
-        time.sleep(random.uniform(3, 6))
+def parse_last_event_id(value: Optional[str]) -> Optional[str]:
+    """The client's ``Last-Event-ID`` (``<instance>-<seq>``, see ``broadcaster.Event``), if any."""
+    value = (value or "").strip()
+    return value[:64] or None
+
+
+def parse_stream_filters(args) -> Filters:
+    """``severity``/``threat_type``/``protocol_layer``/``agent`` query values (repeated or comma separated)."""
+    filters = {}
+    for name in FILTER_FIELDS:
+        values = {value.strip() for raw in args.getlist(name) for value in raw.split(",") if value.strip()}
+        if values:
+            filters[name] = frozenset(values)
+    return filters
+
+
+def frame_interval() -> float:
+    return 1 / SSE_MAX_FRAMES_PER_SECOND if SSE_MAX_FRAMES_PER_SECOND > 0 else 0.0
+
+
+def event_stream(subscriber, backlog: List, complete: bool = True, batch: bool = False):
+    """SSE body for one subscriber; events arriving within a frame interval go out together as one write.
+
+    While a frame is held back the buffer keeps being drained, so pacing does
+    not push a burst past ``SSE_BUFFER_SIZE``; only a client that stops
+    reading loses events.
+    """
+    interval = frame_interval()
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if not complete:
+            yield "event: resync\ndata: {}\n\n"
+        if backlog:
+            yield encode_frames(backlog, batch)
+        sent_at = 0.0
+        while True:
+            events = subscriber.wait(timeout=SSE_KEEPALIVE_SECONDS)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            deadline = sent_at + interval
+            while time.monotonic() < deadline:
+                events += subscriber.wait(timeout=deadline - time.monotonic())
+            yield encode_frames(events, batch)
+            sent_at = time.monotonic()
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+
+def load_overview():
+    with db_pool.read() as conn:
+        overview.load(conn)
+
+
+def prime_replay_log():
+    with db_pool.read() as conn:
+        rows = list(
+            partition_store.select(conn, "SELECT * FROM {schema}.alerts ORDER BY id DESC", limit=SSE_REPLAY_SIZE)
+        )
+    broadcaster.prime(format_alert(row) for row in reversed(rows))
+
+
+def start_writers():
+    global packet_writer, alert_writer
+    if packet_writer is not None:
+        return
+    packet_writer = BatchWriter(
+        "packet-writer",
+        write_packets,
+        max_batch=INGEST_MAX_TRANSACTION_ROWS,
+        max_queue=INGEST_QUEUE_BATCHES,
+    )
+    alert_writer = BatchWriter(
+        "alert-writer",
+        write_alerts,
+        max_batch=ALERT_FLUSH_ROWS,
+        max_queue=ALERT_QUEUE_SIZE,
+        max_delay=ALERT_FLUSH_MS / 1000,
+    )
+    packet_writer.start()
+    alert_writer.start()
+    atexit.register(stop_writers)
 
 
-def event_stream():
+def stop_writers():
+    for writer in (packet_writer, alert_writer):
+        if writer is not None:
+            writer.stop(timeout=10)
+
+
+def load_agent_baselines():
+    with db_pool.read() as conn:
+        agents = conn.execute("SELECT id, name, risk_score, status FROM agents ORDER BY id").fetchall()
+        sessions = conn.execute(
+            """
+            SELECT s.name, t.name, 0, NULL
+            FROM communications
+            JOIN agents AS s ON communications.source_agent_id = s.id
+            JOIN agents AS t ON communications.target_agent_id = t.id
+            """
+        ).fetchall()
+        packet_edges = conn.execute(
+            """
+            SELECT source_agent, target_agent, COUNT(*),
+                   MAX(CASE severity WHEN '높음' THEN 2 WHEN '중간' THEN 1 ELSE 0 END)
+            FROM packets
+            GROUP BY source_agent, target_agent
+            """
+        ).fetchall()
+    scorer.register(agents)
+    path_index.register(agents)
+    scorer.seed_edges(sessions)
+    scorer.seed_edges(packet_edges)
+    path_index.add_edges(sessions)
+    path_index.add_edges(packet_edges)
+
+
+def score_agents():
+    agent_ids, risk_scores, statuses = scorer.score()
+    if not len(agent_ids):
+        return
+    with db_pool.write() as conn:
+        conn.executemany(
+            "UPDATE agents SET risk_score = ?, status = ? WHERE id = ?",
+            zip(risk_scores.tolist(), statuses, agent_ids.tolist()),
+        )
+        overview.load_agents(conn)
+    path_index.update_nodes(agent_ids.tolist(), risk_scores.tolist(), statuses)
+    response_cache.invalidate("agents")
+    event_bus.publish(
+        "agents", {"ids": agent_ids.tolist(), "risk_scores": risk_scores.tolist(), "statuses": list(statuses)}
+    )
+
+
+def anomaly_loop():
     while True:
-        event = event_queue.get()
-        data = json.dumps(event, ensure_ascii=False)
-        yield f"data: {data}\n\n"
+        time.sleep(ANOMALY_INTERVAL_SECONDS)
+        if event_bus.is_leader:
+            score_agents()
+
+
+def apply_retention() -> List[str]:
+    """Fold expired day partitions into the hourly rollups and drop their files."""
+    dropped = []
+    for day in partition_store.expired():
+        schema = partition_store.schema(day)
+        with db_pool.read() as conn:
+            rollups = {kind: partition_store.rollup(conn, f"{schema}.{kind}") for kind in ("packets", "alerts")}
+        with db_pool.write() as conn:
+            partition_store.drop(conn, day, rollups)
+        dropped.append(schema)
+    partition_store.purge()
+    if dropped:
+        load_overview()
+        response_cache.invalidate("packets", "alerts")
+        event_bus.publish("partitions", {"dropped": dropped})
+    return dropped
+
+
+COLUMNAR_SOURCE_SQL = (
+    "SELECT id, ts, severity, protocol_layer, threat_type, source_agent_id, target_agent_id "
+    "FROM {table} WHERE id > ? ORDER BY id"
+)
+
+
+def export_columnar() -> List[str]:
+    """Export closed day partitions into the column store, re-exporting days that received late rows."""
+    exported = []
+    today = day_of(int(time.time() * 1000))
+    for day in partition_store.days():
+        if day >= today:
+            continue
+        for kind in ("packets", "alerts"):
+            table = partition_store.table(day, kind)
+            name = day_label(day)
+            with db_pool.read() as conn:
+                last_id = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+                current = column_store.exported_max_id(kind, name)
+                if last_id is None or (current is not None and current >= last_id):
+                    continue
+                rows = conn.execute(COLUMNAR_SOURCE_SQL.format(table=table), (0,))
+                column_store.export(kind, name, rows, day * DAY_MS)
+            exported.append(f"{kind}/{name}")
+    if exported:
+        event_bus.publish("columnar", {"exported": exported})
+    return exported
+
+
+def refresh_columnar_live(conn: sqlite3.Connection, kind: str):
+    """Bring the in-memory segments of days not yet exported up to date with the partitions."""
+    names = []
+    for day in partition_store.attached_days(conn):
+        name = day_label(day)
+        if column_store.exported_max_id(kind, name) is not None:
+            continue
+        names.append(name)
+        rows = conn.execute(
+            COLUMNAR_SOURCE_SQL.format(table=partition_store.table(day, kind)), (column_store.live_max_id(kind, name),)
+        )
+        column_store.append_live(kind, name, rows, day * DAY_MS)
+    column_store.retain_live(kind, names)
+
+
+def retention_loop():
+    while True:
+        time.sleep(RETENTION_INTERVAL_SECONDS)
+        if event_bus.is_leader:
+            export_columnar()
+            apply_retention()
+
+
+def handle_bus_event(topic: str, payload):
+    """Apply a write made by another worker process to this process's in-memory state."""
+    if topic == "alerts":
+        apply_alerts(payload)
+    elif topic == "packets":
+        apply_packets(payload["stored"], payload["expired"])
+    elif topic == "agents":
+        path_index.update_nodes(payload["ids"], payload["risk_scores"], payload["statuses"])
+        with db_pool.read() as conn:
+            overview.load_agents(conn)
+        response_cache.invalidate("agents")
+    elif topic == "partitions":
+        with db_pool.read() as conn:
+            partition_store.reload(conn)
+        if payload["dropped"]:
+            load_overview()
+            response_cache.invalidate("packets", "alerts")
+    elif topic == "columnar":
+        column_store.load()
 
 
 def background_event_thread():
@@ -627,9 +1446,19 @@ def background_event_thread():
         return
     thread = threading.Thread(target=generate_event, daemon=True)
     thread.start()
+    threading.Thread(target=anomaly_loop, name="anomaly-scorer", daemon=True).start()
+    threading.Thread(target=retention_loop, name="partition-retention", daemon=True).start()
     event_thread_started = True
 
 
+@app.route("/assets/<path:filename>")
+def asset(filename: str):
+    response = static_assets.response(filename, request.accept_encodings, request.if_none_match)
+    if response is None:
+        abort(404)
+    return response
+
+
 @app.route("/")
 def index():
     return redirect(url_for("dashboard"))
@@ -656,7 +1485,7 @@ def agent_detail(agent_id: int):
     if not profile:
         abort(404)
 
-    conn = get_db_connection()
+    conn = get_db()
     communications = conn.execute(
         """
         SELECT c.*, s.name AS source_name, t.name AS target_name
@@ -674,18 +1503,21 @@ def agent_detail(agent_id: int):
         (agent_id,),
     ).fetchall()
 
-    packets = conn.execute(
+    packets = partition_store.select(
+        conn,
         """
-        SELECT * FROM packets
-        WHERE source_agent = (SELECT name FROM agents WHERE id = ?)
-           OR target_agent = (SELECT name FROM agents WHERE id = ?)
-        ORDER BY datetime(timestamp) DESC
-        LIMIT 10
+        SELECT * FROM (
+            SELECT * FROM {schema}.packets WHERE source_agent_id = ? ORDER BY ts DESC LIMIT 10
+        )
+        UNION
+        SELECT * FROM (
+            SELECT * FROM {schema}.packets WHERE target_agent_id = ? ORDER BY ts DESC LIMIT 10
+        )
+        ORDER BY ts DESC
         """,
         (agent_id, agent_id),
-    ).fetchall()
-
-    conn.close()
+        limit=10,
+    )
 
     communication_data = [
         {
@@ -698,11 +1530,7 @@ def agent_detail(agent_id: int):
         for row in communications
     ]
 
-    agent_map = {profile["name"]: {"id": agent_id, "name": profile["name"]}}
-    for item in related_agents:
-        agent_map[item["name"]] = {"id": item["id"], "name": item["name"]}
-
-    packet_rows = [format_packet(row, agent_map) for row in packets]
+    packet_rows = [format_packet(row) for row in packets]
 
     return render_template(
         "agent_detail.html",
@@ -715,69 +1543,65 @@ def agent_detail(agent_id: int):
 
 @app.route("/alerts/<int:alert_id>")
 def alert_detail(alert_id: int):
-    conn = get_db_connection()
+    conn = get_db()
     row = conn.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,)).fetchone()
-    agent_rows = conn.execute("SELECT id, name FROM agents").fetchall()
-    conn.close()
     if not row:
         abort(404)
 
-    alert = format_alert(row)
-    name_to_id = {item["name"]: item["id"] for item in agent_rows}
-    return render_template("alert_detail.html", alert=alert, name_to_id=name_to_id)
+    return render_template("alert_detail.html", alert=format_alert(row))
 
 
 @app.route("/packets/<int:packet_id>")
 def packet_detail(packet_id: int):
-    conn = get_db_connection()
-    agent_rows = conn.execute("SELECT id, name FROM agents").fetchall()
-    agent_map = {row["name"]: {"id": row["id"], "name": row["name"]} for row in agent_rows}
+    conn = get_db()
     row = conn.execute("SELECT * FROM packets WHERE id = ?", (packet_id,)).fetchone()
-    conn.close()
     if not row:
         abort(404)
 
-    packet = format_packet(row, agent_map)
+    packet = format_packet(row)
     return render_template("packet_detail.html", packet=packet)
 
 
-@app.route("/api/agents")
-def api_agents():
-    conn = get_db_connection()
-    agents = [format_agent(row) for row in conn.execute("SELECT * FROM agents").fetchall()]
-
-    graph_nodes = [
-        {
-            "id": agent["id"],
-            "label": agent["name"],
-            "title": f"<b>{agent['name']}</b><br/>역할: {agent['role']}<br/>상태: {agent['status']}<br/>위험도: {agent['risk_score']:.2f}",
-            "group": agent["status"],
-        }
-        for agent in agents
-    ]
-
-    communications = conn.execute(
-        """
-        SELECT communications.*, s.name AS source_name, t.name AS target_name
-        FROM communications
-        JOIN agents AS s ON communications.source_agent_id = s.id
-        JOIN agents AS t ON communications.target_agent_id = t.id
-        ORDER BY datetime(communications.last_activity) DESC
-        """
-    ).fetchall()
-
-    graph_edges = []
-    for row in communications:
-        graph_edges.append(
-            {
-                "from": row["source_agent_id"],
-                "to": row["target_agent_id"],
-                "label": row["threat_summary"] or "최근 통신",
-                "title": row["threat_summary"] or "최근 통신",
-            }
-        )
-
-    comm_details = [
+def build_agent_graph() -> AgentGraph:
+    with db_pool.read() as conn:
+        agents = [
+            {**format_agent(row), "department": row["department"], "location": row["location"]}
+            for row in conn.execute(
+                """
+                SELECT agents.*, agent_profiles.department, agent_profiles.location
+                FROM agents
+                LEFT JOIN agent_profiles ON agent_profiles.agent_id = agents.id
+                """
+            )
+        ]
+        sessions = conn.execute(
+            """
+            SELECT source_agent_id, target_agent_id, COUNT(*) AS sessions,
+                   MAX(last_activity) AS last_activity, threat_summary
+            FROM communications
+            GROUP BY source_agent_id, target_agent_id
+            """
+        ).fetchall()
+        communications = conn.execute(
+            """
+            SELECT communications.*, s.name AS source_name, t.name AS target_name
+            FROM communications
+            JOIN agents AS s ON communications.source_agent_id = s.id
+            JOIN agents AS t ON communications.target_agent_id = t.id
+            ORDER BY datetime(communications.last_activity) DESC
+            LIMIT ?
+            """,
+            (GRAPH_COMMUNICATION_LIMIT,),
+        ).fetchall()
+
+    sources, targets, messages, severities = scorer.edge_snapshot()
+    session_count = len(sessions)
+    summaries = {
+        (row["source_agent_id"], row["target_agent_id"]): row["threat_summary"]
+        for row in sessions
+        if row["threat_summary"]
+    }
+    recent = [
         {
             "id": row["id"],
             "source": row["source_name"],
@@ -787,26 +1611,235 @@ def api_agents():
         }
         for row in communications
     ]
+    return AgentGraph(
+        agents,
+        sources=np.concatenate([[row["source_agent_id"] for row in sessions], sources]),
+        targets=np.concatenate([[row["target_agent_id"] for row in sessions], targets]),
+        sessions=np.concatenate([[row["sessions"] for row in sessions], np.zeros(len(messages))]),
+        packets=np.concatenate([np.zeros(session_count), messages]),
+        severity=np.concatenate([np.full(session_count, -1), severities]),
+        summaries=summaries,
+        communications=recent,
+    )
 
-    conn.close()
 
-    return jsonify(
-        {
-            "agents": agents,
-            "nodes": graph_nodes,
-            "edges": graph_edges,
-            "communications": comm_details,
-        }
+def agent_graph_fresh(versions: Tuple[int, ...]) -> bool:
+    if agent_graph_versions is None or agent_graph_versions[0] != versions[0]:
+        return False
+    return (
+        agent_graph_versions == versions
+        or time.monotonic() - agent_graph_built_at < GRAPH_MAX_STALENESS_SECONDS
     )
 
 
+def current_agent_graph() -> AgentGraph:
+    """The cached agent graph, rebuilt when agents change or packets changed more than the staleness bound ago.
+
+    Packet traffic bumps the ``packets`` version every few seconds (and on
+    every ingest batch), so rebuilding on each bump would mean every LOD view
+    reads the database; packet edges may instead trail by up to
+    ``GRAPH_MAX_STALENESS_SECONDS``.
+    """
+    global agent_graph, agent_graph_versions, agent_graph_built_at
+    versions = response_cache.versions(GRAPH_TOPICS)
+    if not agent_graph_fresh(versions):
+        with agent_graph_lock:
+            if not agent_graph_fresh(versions):
+                agent_graph = build_agent_graph()
+                agent_graph_versions = versions
+                agent_graph_built_at = time.monotonic()
+    return agent_graph
+
+
+def agent_graph_state() -> Tuple[int, ...]:
+    current_agent_graph()
+    return agent_graph_versions
+
+
+@app.route("/api/agents")
+@response_cache.cached(state=agent_graph_state)
+def api_agents():
+    graph = current_agent_graph()
+    view = request.args.get("view") or ("full" if len(graph.agents) <= GRAPH_DETAIL_LIMIT else "cluster")
+
+    if view == "full" and len(graph.agents) > GRAPH_FULL_MAX_AGENTS:
+        payload = {**graph.top_risk(GRAPH_FULL_MAX_AGENTS, GRAPH_MAX_EDGES), "truncated": True}
+    elif view == "full":
+        payload = graph.full(GRAPH_MAX_EDGES)
+    elif view == "cluster":
+        group = request.args.get("group", "department")
+        if group not in CLUSTER_FIELDS:
+            abort(400)
+        payload = graph.clusters(group, GRAPH_MAX_EDGES)
+    elif view == "top":
+        k = min(max(request.args.get("k", GRAPH_TOP_K, type=int), 1), GRAPH_DETAIL_LIMIT)
+        payload = graph.top_risk(k, GRAPH_MAX_EDGES)
+    elif view == "ego":
+        agent_id = request.args.get("agent_id", type=int)
+        if agent_id is None:
+            abort(400)
+        depth = min(max(request.args.get("depth", 1, type=int), 1), GRAPH_EGO_MAX_DEPTH)
+        payload = graph.ego(agent_id, depth, GRAPH_DETAIL_LIMIT, GRAPH_MAX_EDGES)
+        if payload is None:
+            abort(404)
+    else:
+        abort(400)
+
+    return jsonify({**payload, "view": view, "communications": graph.communications, "totals": graph.stats()})
+
+
+def fts_match_expression(text: str, column: Optional[str] = None) -> Optional[str]:
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    expression = " AND ".join(f'"{term}"*' for term in terms)
+    if column:
+        return f"{column} : ({expression})"
+    return f"({expression})"
+
+
+def text_search_clause(
+    conn: sqlite3.Connection, table: str, filters: Dict[str, Optional[str]]
+) -> Tuple[str, List[str]]:
+    """Build a WHERE fragment for free-text filters; a ``None`` key searches every indexed column.
+
+    Uses the FTS5 index with prefix matching when it exists and falls back to
+    ``LIKE`` scans otherwise. Selective matches are joined by primary key;
+    broad ones keep the ``ts`` index driving the scan (``+id`` hides the rowid
+    from the planner) so ``ORDER BY ts ... LIMIT`` can stop early. The
+    fragment names the per-partition FTS table through ``{schema}`` and is
+    meant for ``partition_store.select``.
+    """
+    clause = ""
+    params: List[str] = []
+    if fts_enabled:
+        expressions = [
+            expression
+            for column, value in filters.items()
+            if value and (expression := fts_match_expression(value, column))
+        ]
+        if expressions:
+            match = " AND ".join(expressions)
+            probe = 0
+            for day in partition_store.attached_days(conn):
+                probe += conn.execute(
+                    f"SELECT COUNT(*) FROM (SELECT rowid FROM {partition_store.schema(day)}.{table}_fts "
+                    f"WHERE {table}_fts MATCH ? LIMIT ?)",
+                    (match, FTS_SELECTIVE_MATCHES - probe),
+                ).fetchone()[0]
+                if probe >= FTS_SELECTIVE_MATCHES:
+                    break
+            key = "id" if probe < FTS_SELECTIVE_MATCHES else "+id"
+            clause = f" AND {key} IN (SELECT rowid FROM {{schema}}.{table}_fts WHERE {table}_fts MATCH ?)"
+            params.append(match)
+        return clause, params
+
+    for column, value in filters.items():
+        if not value:
+            continue
+        columns = [column] if column else list(FTS_COLUMNS[table])
+        clause += " AND (" + " OR ".join(f"{name} LIKE ?" for name in columns) + ")"
+        params.extend(f"%{value}%" for _ in columns)
+    return clause, params
+
+
 @app.route("/api/alerts/recent")
+@response_cache.cached("alerts")
 def api_recent_alerts():
-    conn = get_db_connection()
-    rows = conn.execute("SELECT * FROM alerts ORDER BY datetime(timestamp) DESC LIMIT 10").fetchall()
-    conn.close()
-    alerts = [format_alert(row) for row in rows]
-    return jsonify({"alerts": alerts})
+    return jsonify(recent_alerts_body(get_db(), {None: request.args.get("q")}, parse_since()))
+
+
+def encode_cursor(ts: int, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{ts}:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Tuple[int, int]:
+    padded = value + "=" * (-len(value) % 4)
+    ts, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+    return int(ts), int(row_id)
+
+
+def parse_limit(default: Optional[int], maximum: Optional[int] = None) -> Optional[int]:
+    limit = request.args.get("limit", type=int)
+    if limit is None:
+        return default
+    if maximum is not None:
+        limit = min(limit, maximum)
+    return max(1, limit)
+
+
+def parse_since() -> Tuple[str, List, Optional[int], Dict]:
+    """``since_id`` / ``since_ts`` (epoch ms) filters for delta polling.
+
+    Returns the SQL clause and params, the ``after_ts`` bound for
+    ``PartitionStore.select`` and the requested marks. Only ``since_ts``
+    prunes partitions: ids follow insertion order, and a late row can be
+    filed under any day still within retention.
+    """
+    since = {}
+    for name in ("since_id", "since_ts"):
+        value = request.args.get(name)
+        if value:
+            try:
+                since[name] = int(value)
+            except ValueError:
+                abort(400)
+    clause = ""
+    params: List = []
+    after_ts = None
+    if "since_id" in since:
+        clause += " AND id > ?"
+        params.append(since["since_id"])
+    if "since_ts" in since:
+        clause += " AND ts > ?"
+        params.append(since["since_ts"])
+        after_ts = since["since_ts"]
+    return clause, params, after_ts, since
+
+
+def newest_first(since: Dict) -> str:
+    # A since_id delta is a short rowid range; "+ts" keeps the planner from walking the whole ts index instead.
+    return " ORDER BY +ts DESC, id DESC" if "since_id" in since else " ORDER BY ts DESC, id DESC"
+
+
+def high_water(conn: sqlite3.Connection, kind: str, rows: List[sqlite3.Row], since: Dict) -> Dict:
+    """Largest id and ts seen so far; clients send them back as ``since_id`` / ``since_ts``.
+
+    An empty delta echoes the request's marks; for a ``since_id``-only request
+    the ts is the newest among rows up to that id, i.e. the previous mark.
+    """
+    ts = max((row["ts"] for row in rows), default=since.get("since_ts"))
+    if ts is None and not rows and "since_id" in since:
+        sql = f"SELECT ts FROM {{schema}}.{kind} WHERE id <= ? ORDER BY ts DESC"
+        ts = next((row[0] for row in partition_store.select(conn, sql, [since["since_id"]], limit=1)), None)
+    return {"id": max((row["id"] for row in rows), default=since.get("since_id")), "ts": ts}
+
+
+NO_SINCE: Tuple[str, List, Optional[int], Dict] = ("", [], None, {})
+
+
+def recent_rows(
+    conn: sqlite3.Connection,
+    kind: str,
+    limit: int,
+    filters: Dict[Optional[str], Optional[str]],
+    since_filter: Tuple[str, List, Optional[int], Dict] = NO_SINCE,
+) -> Tuple[List[sqlite3.Row], Dict]:
+    """Newest ``limit`` rows of ``kind``, or only those after the ``parse_since`` marks when given."""
+    query = f"SELECT * FROM {{schema}}.{kind} WHERE 1=1"
+    search_clause, params = text_search_clause(conn, kind, filters)
+    since_clause, since_params, after_ts, since = since_filter
+    query += search_clause + since_clause + newest_first(since)
+    rows = list(partition_store.select(conn, query, params + since_params, limit=limit + 1, after_ts=after_ts))
+    extra = {"high_water": high_water(conn, kind, rows[:limit], since)}
+    if since:
+        extra["truncated"] = len(rows) > limit
+    return rows[:limit], extra
+
+
+def recent_alerts_body(conn: sqlite3.Connection, filters: Dict, since_filter: Tuple = NO_SINCE) -> Dict:
+    rows, extra = recent_rows(conn, "alerts", RECENT_ALERT_LIMIT, filters, since_filter)
+    return {"alerts": [format_alert(row) for row in rows], **extra}
 
 
 @app.route("/api/packets")
@@ -816,179 +1849,608 @@ def api_packets():
     source = request.args.get("source")
     target = request.args.get("target")
     layer = request.args.get("layer")
+    cursor = request.args.get("cursor")
 
-    query = "SELECT * FROM packets WHERE 1=1"
-    params: List[str] = []
+    query = "SELECT * FROM {schema}.packets WHERE 1=1"
+    params: List = []
+    cursor_ts = None
 
-    if threat:
-        query += " AND threat_type LIKE ?"
-        params.append(f"%{threat}%")
+    conn = get_db()
+    search_clause, search_params = text_search_clause(
+        conn,
+        "packets",
+        {
+            None: request.args.get("q"),
+            "threat_type": threat,
+            "source_agent": source,
+            "target_agent": target,
+        },
+    )
+    query += search_clause
+    params.extend(search_params)
     if severity:
         query += " AND severity = ?"
         params.append(severity)
-    if source:
-        query += " AND source_agent LIKE ?"
-        params.append(f"%{source}%")
-    if target:
-        query += " AND target_agent LIKE ?"
-        params.append(f"%{target}%")
     if layer:
         query += " AND protocol_layer = ?"
         params.append(layer)
+    if cursor:
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            abort(400)
+        query += " AND (ts, id) < (?, ?)"
+        params.extend([cursor_ts, cursor_id])
+    since_clause, since_params, after_ts, since = parse_since()
+    query += since_clause
+    params.extend(since_params)
+
+    streaming = request.args.get("format") == "ndjson" or (
+        request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+        == "application/x-ndjson"
+    )
+    if streaming:
+        limit = parse_limit(None)
+    else:
+        limit = parse_limit(PACKET_PAGE_SIZE, PACKET_PAGE_MAX)
+
+    query += newest_first(since)
+    rows = partition_store.select(
+        conn, query, params, limit=limit + 1 if limit else None, before_ts=cursor_ts, after_ts=after_ts
+    )
 
-    query += " ORDER BY datetime(timestamp) DESC"
+    if streaming:
+        return Response(stream_with_context(stream_packets(rows, limit)), mimetype="application/x-ndjson")
 
-    conn = get_db_connection()
-    rows = conn.execute(query, params).fetchall()
-    agent_rows = conn.execute("SELECT id, name FROM agents").fetchall()
-    conn.close()
+    rows = list(rows)
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["ts"], rows[-1]["id"])
+    packets = [format_packet(row) for row in rows]
 
-    agent_map = {row["name"]: {"id": row["id"], "name": row["name"]} for row in agent_rows}
-    packets = [format_packet(row, agent_map) for row in rows]
+    return jsonify({"packets": packets, "next_cursor": next_cursor, "high_water": high_water(conn, "packets", rows, since)})
 
-    return jsonify({"packets": packets})
 
+def stream_packets(rows: Iterator[sqlite3.Row], limit: Optional[int]):
+    sent = 0
+    last = None
+    while True:
+        batch = list(itertools.islice(rows, NDJSON_BATCH_SIZE))
+        if not batch:
+            return
+        lines = []
+        for row in batch:
+            if limit and sent == limit:
+                lines.append(json.dumps({"next_cursor": encode_cursor(last["ts"], last["id"])}) + "\n")
+                yield "".join(lines)
+                return
+            lines.append(json.dumps(format_packet(row), ensure_ascii=False) + "\n")
+            last = row
+            sent += 1
+        yield "".join(lines)
+
+
+INVALID_RECORD = object()
+
+
+def iter_bulk_records():
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        pending = b""
+        while True:
+            chunk = request.stream.read(NDJSON_READ_SIZE)
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop() if chunk else b""
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield INVALID_RECORD
+            if not chunk:
+                return
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        abort(400)
+    yield from payload
+
+
+@app.route("/api/packets/bulk", methods=["POST"])
+def api_packets_bulk():
+    wait = request.args.get("wait", "1") != "0"
+    accepted = 0
+    rejected = 0
+    errors: List[Dict] = []
+    submissions = []
+    batch: List[Dict] = []
+    batch_start = 0
+
+    def reject(index: int, message: str):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < INGEST_MAX_ERRORS:
+            errors.append({"index": index, "error": message})
+
+    def summary(**extra):
+        return {"accepted": accepted, "rejected": rejected, "errors": errors, **extra}
+
+    try:
+        for index, record in enumerate(iter_bulk_records()):
+            if record is INVALID_RECORD:
+                reject(index, "JSON 파싱 실패")
+                continue
+            try:
+                packet = validate_packet(record)
+            except ValueError as exc:
+                reject(index, str(exc))
+                continue
+            if not batch:
+                batch_start = index
+            batch.append(packet)
+            if len(batch) >= INGEST_BATCH_SIZE:
+                submissions.append(packet_writer.submit(batch, timeout=INGEST_SUBMIT_TIMEOUT))
+                accepted += len(batch)
+                batch = []
+        if batch:
+            submissions.append(packet_writer.submit(batch, timeout=INGEST_SUBMIT_TIMEOUT))
+            accepted += len(batch)
+            batch = []
+    except Backpressure:
+        body = summary(error="수집 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.", retry_from=batch_start)
+        return jsonify(body), 503, {"Retry-After": "1"}
+
+    if not wait:
+        return jsonify(summary()), 202
+
+    error = None
+    for submission in submissions:
+        submission.wait()
+        if submission.failed:
+            accepted -= submission.failed
+            rejected += submission.failed
+            error = submission.error
+    if error is not None:
+        return jsonify(summary(error=f"저장 실패: {error}")), 500
+    return jsonify(summary())
+
+
+@app.route("/api/detect", methods=["POST"])
+def api_detect():
+    processed = 0
+    rejected = 0
+    batch: List[Dict] = []
+    submissions = []
+
+    def run(records: List[Dict]):
+        found = detection_engine.process(records)
+        if found:
+            submissions.append(alert_writer.submit(found, timeout=INGEST_SUBMIT_TIMEOUT))
+
+    def stored() -> Dict:
+        for submission in submissions:
+            submission.wait()
+        failed = sum(submission.failed for submission in submissions)
+        counts = {"alerts": sum(submission.written for submission in submissions)}
+        return {**counts, "failed_alerts": failed} if failed else counts
+
+    try:
+        for record in iter_bulk_records():
+            if not detection.well_formed(record):
+                rejected += 1
+                continue
+            batch.append(record)
+            if len(batch) >= INGEST_BATCH_SIZE:
+                run(batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            run(batch)
+            processed += len(batch)
+    except Backpressure:
+        body = {
+            "processed": processed + len(batch),
+            "rejected": rejected,
+            **stored(),
+            "error": "경보 저장 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.",
+        }
+        return jsonify(body), 503, {"Retry-After": "1"}
 
-@app.route("/api/overview")
-def api_overview():
-    conn = get_db_connection()
-    cur = conn.cursor()
+    return jsonify({"processed": processed, "rejected": rejected, **stored()})
 
-    agent_count = cur.execute("SELECT COUNT(*) FROM agents").fetchone()[0]
-    comm_count = cur.execute("SELECT COUNT(*) FROM communications").fetchone()[0]
-    total_packets = cur.execute("SELECT COUNT(*) FROM packets").fetchone()[0]
 
-    severity_rows = cur.execute(
-        """
-        SELECT severity, COUNT(*) as cnt
-        FROM packets
-        GROUP BY severity
-        """
-    ).fetchall()
-    severity_counts = {row["severity"]: row["cnt"] for row in severity_rows}
+@app.route("/api/detect/stats")
+def api_detect_stats():
+    return jsonify(detection_engine.stats())
 
-    status_rows = cur.execute(
-        """
-        SELECT status, COUNT(*) as cnt
-        FROM agents
-        GROUP BY status
-        """
-    ).fetchall()
-    status_counts = {row["status"]: row["cnt"] for row in status_rows}
 
-    layer_rows = cur.execute(
-        """
-        SELECT protocol_layer, COUNT(*) as cnt
-        FROM packets
-        GROUP BY protocol_layer
-        ORDER BY protocol_layer
-        """
-    ).fetchall()
-    layer_counts = {row["protocol_layer"]: row["cnt"] for row in layer_rows}
+def path_agent(argument: str) -> int:
+    key = (request.args.get(argument) or "").strip()
+    if not key:
+        abort(400)
+    position = path_index.lookup(key)
+    if position is None:
+        abort(404)
+    return position
 
-    persistent_rows = cur.execute(
-        """
-        SELECT source_agent, COUNT(*) as cnt, MAX(timestamp) as last_ts
-        FROM packets
-        WHERE severity = '높음'
-        GROUP BY source_agent
-        HAVING cnt >= 2
-        ORDER BY cnt DESC, datetime(last_ts) DESC
-        LIMIT 5
-        """
-    ).fetchall()
 
-    agent_rows = cur.execute("SELECT id, name FROM agents").fetchall()
-    agent_map = {row["name"]: row["id"] for row in agent_rows}
+def path_hops(argument: str) -> int:
+    return min(max(request.args.get(argument, PATH_DEFAULT_HOPS, type=int), 1), PATH_MAX_HOPS)
 
-    persistent_agents = []
-    for row in persistent_rows:
-        last_detail = cur.execute(
-            """
-            SELECT threat_type
-            FROM packets
-            WHERE source_agent = ? AND severity = '높음'
-            ORDER BY datetime(timestamp) DESC
-            LIMIT 1
-            """,
-            (row["source_agent"],),
-        ).fetchone()
-        persistent_agents.append(
-            {
-                "agent_name": row["source_agent"],
-                "agent_id": agent_map.get(row["source_agent"]),
-                "repeat_count": row["cnt"],
-                "last_detected": row["last_ts"],
-                "last_threat": last_detail[0] if last_detail else "-",
-            }
-        )
 
-    trend_rows = cur.execute(
-        """
-        SELECT strftime('%Y-%m-%d %H:00', timestamp) AS bucket,
-               COUNT(*) AS cnt
-        FROM packets
-        WHERE datetime(timestamp) >= datetime('now', '-12 hours')
-        GROUP BY bucket
-        ORDER BY datetime(bucket)
-        """
-    ).fetchall()
+@app.route("/api/paths/reachable")
+def api_paths_reachable():
+    start = path_agent("agent")
+    hops = path_hops("hops")
+    direction = request.args.get("direction", "out")
+    if direction not in ("out", "in"):
+        abort(400)
+    started = time.perf_counter()
+    positions, distances = path_index.reachable(start, hops, outgoing=direction == "out")
+    elapsed = (time.perf_counter() - started) * 1000
+    order = np.lexsort((-path_index.risk[positions], distances))[:PATH_RESULT_LIMIT]
+    return jsonify(
+        {
+            "agent": path_index.describe_node(start),
+            "direction": direction,
+            "hops": hops,
+            "total": len(positions),
+            "by_hop": np.bincount(distances, minlength=hops + 1)[1:].tolist(),
+            "agents": [
+                {**path_index.describe_node(position), "hop": int(distance)}
+                for position, distance in zip(positions[order].tolist(), distances[order].tolist())
+            ],
+            "truncated": len(positions) > PATH_RESULT_LIMIT,
+            "elapsed_ms": round(elapsed, 3),
+        }
+    )
 
-    now_utc = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-    buckets = [now_utc - timedelta(hours=offset) for offset in range(11, -1, -1)]
-    bucket_map = {row["bucket"]: row["cnt"] for row in trend_rows}
-    threat_trend = [
+
+@app.route("/api/paths/route")
+def api_paths_route():
+    start, goal = path_agent("source"), path_agent("target")
+    mode = request.args.get("mode", "shortest")
+    max_hops = min(max(request.args.get("max_hops", PATH_MAX_HOPS, type=int), 1), PATH_MAX_HOPS)
+    started = time.perf_counter()
+    if mode == "shortest":
+        path = path_index.shortest_path(start, goal, max_hops)
+    elif mode == "riskiest":
+        found = path_index.riskiest_path(start, goal, max_hops)
+        path = found[0] if found else None
+    else:
+        abort(400)
+    elapsed = (time.perf_counter() - started) * 1000
+    if path is None:
+        return jsonify({"message": f"{max_hops}홉 이내에 연결 경로가 없습니다.", "elapsed_ms": round(elapsed, 3)}), 404
+    edges = [path_index.describe_edge(row) for _, row in path[1:]]
+    probability = float(np.prod([edge["spread_probability"] for edge in edges])) if edges else 1.0
+    return jsonify(
         {
-            "window": bucket.strftime("%Y-%m-%d %H:00"),
-            "window_label": bucket.strftime("%m/%d %H시"),
-            "count": bucket_map.get(bucket.strftime("%Y-%m-%d %H:00"), 0),
+            "mode": mode,
+            "hops": len(edges),
+            "agents": [path_index.describe_node(position) for position, _ in path],
+            "edges": edges,
+            "spread_probability": round(found[1] if mode == "riskiest" else probability, 6),
+            "elapsed_ms": round(elapsed, 3),
         }
-        for bucket in buckets
-    ]
+    )
 
-    last_packet = cur.execute(
-        "SELECT timestamp FROM packets ORDER BY datetime(timestamp) DESC LIMIT 1"
-    ).fetchone()
-    last_update = last_packet[0] if last_packet else None
 
-    conn.close()
+@app.route("/api/paths/blast-radius")
+def api_paths_blast_radius():
+    start = path_agent("agent")
+    hops = path_hops("hops")
+    started = time.perf_counter()
+    positions, probabilities, distances = path_index.blast_radius(start, hops)
+    elapsed = (time.perf_counter() - started) * 1000
+    order = np.argsort(-probabilities, kind="stable")[:PATH_RESULT_LIMIT]
+    statuses = np.bincount(path_index.status[positions], minlength=3)
+    return jsonify(
+        {
+            "agent": path_index.describe_node(start),
+            "hops": hops,
+            "reachable": len(positions),
+            "expected_compromised": round(float(probabilities.sum()), 4),
+            "by_hop": np.bincount(distances, minlength=hops + 1)[1:].tolist(),
+            "by_status": {status: int(count) for status, count in zip(("정상", "주의", "격리"), statuses.tolist())},
+            "agents": [
+                {**path_index.describe_node(position), "hop": int(distance), "spread_probability": round(float(p), 4)}
+                for position, p, distance in zip(
+                    positions[order].tolist(), probabilities[order].tolist(), distances[order].tolist()
+                )
+            ],
+            "truncated": len(positions) > PATH_RESULT_LIMIT,
+            "elapsed_ms": round(elapsed, 3),
+        }
+    )
 
+
+@app.route("/api/paths/stats")
+def api_paths_stats():
+    return jsonify(path_index.stats())
+
+
+def analytics_range(argument: str) -> Optional[int]:
+    value = request.args.get(argument)
+    if not value:
+        return None
+    try:
+        return to_epoch_ms(value)
+    except ValueError:
+        abort(400)
+
+
+@app.route("/api/analytics")
+def api_analytics():
+    kind = request.args.get("kind", "packets")
+    group_by = [key.strip() for key in request.args.get("group_by", "").split(",") if key.strip()]
+    if (
+        kind not in ("packets", "alerts")
+        or not group_by
+        or len(group_by) > ANALYTICS_MAX_KEYS
+        or len(set(group_by)) != len(group_by)
+        or any(key not in GROUP_KEYS for key in group_by)
+    ):
+        abort(400)
+    where: Dict[str, object] = {}
+    for column in ("severity", "protocol_layer", "threat_type"):
+        if request.args.get(column):
+            where[column] = request.args[column]
+    for argument, column in (("source_agent", "source_agent_id"), ("target_agent", "target_agent_id")):
+        key = (request.args.get(argument) or "").strip()
+        if key:
+            agent_id = int(key) if key.isdigit() else agent_directory.id_for(key)
+            if agent_id is None:
+                abort(404)
+            where[column] = agent_id
+    top = request.args.get("top", type=int)
+
+    started = time.perf_counter()
+    refresh_columnar_live(get_db(), kind)
+    keys, counts, scan = column_store.aggregate(
+        kind, group_by, analytics_range("from"), analytics_range("to"), where
+    )
+    order = range(len(keys))
+    if top:
+        # Rank within each value of the first key (e.g. top offenders per month), or overall for one key.
+        groups: Dict[object, List[int]] = {}
+        for position, key in enumerate(keys):
+            groups.setdefault(key[0] if len(group_by) > 1 else None, []).append(position)
+        order = [
+            position
+            for members in groups.values()
+            for position in sorted(members, key=lambda position: -counts[position])[:top]
+        ]
+    rows = []
+    for position in itertools.islice(order, ANALYTICS_RESULT_LIMIT):
+        row: Dict[str, object] = {}
+        for name, value in zip(group_by, keys[position]):
+            if name in TIME_BUCKETS:
+                row[name] = bucket_label(value, name)
+            elif name in ID_COLUMNS:
+                row[name] = value
+                row[name[: -len("_id")]] = agent_directory.name_for(value) if value is not None else None
+            else:
+                row[name] = value
+        row["count"] = int(counts[position])
+        rows.append(row)
     return jsonify(
         {
-            "agent_count": agent_count,
-            "communication_count": comm_count,
-            "total_packets": total_packets,
-            "severity_counts": severity_counts,
-            "status_counts": status_counts,
-            "layer_counts": layer_counts,
-            "high_threats": severity_counts.get("높음", 0),
-            "last_update": last_update,
-            "persistent_agents": persistent_agents,
-            "threat_trend": threat_trend,
+            "kind": kind,
+            "group_by": group_by,
+            "rows": rows,
+            "groups": len(keys),
+            "total": int(counts.sum()),
+            "truncated": len(order) > ANALYTICS_RESULT_LIMIT,
+            **scan,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
         }
     )
 
 
+@app.route("/api/analytics/stats")
+def api_analytics_stats():
+    return jsonify(column_store.stats())
+
+
+@app.route("/api/compression/stats")
+def api_compression_stats():
+    return jsonify({"static": static_assets.stats(), "responses": response_compressor.stats()})
+
+
+@app.route("/api/storage/stats")
+def api_storage_stats():
+    return jsonify(partition_store.stats())
+
+
+@app.route("/api/anomaly/stats")
+def api_anomaly_stats():
+    return jsonify(scorer.stats())
+
+
+@app.route("/api/overview")
+@response_cache.cached("packets", "alerts", "agents", max_age=60)
+def api_overview():
+    return jsonify(overview.snapshot())
+
+
+@app.route("/api/overview/verify")
+def api_overview_verify():
+    result = overview.verify(get_db())
+    if not result["consistent"] and request.args.get("repair") == "1":
+        overview.load(get_db())
+        result["repaired"] = True
+    return jsonify(result)
+
+
 @app.route("/api/packets/recent")
+@response_cache.cached("packets", "agents")
 def api_recent_packets():
-    conn = get_db_connection()
-    rows = conn.execute(
-        "SELECT * FROM packets ORDER BY datetime(timestamp) DESC LIMIT 20"
-    ).fetchall()
-    agent_rows = conn.execute("SELECT id, name FROM agents").fetchall()
-    conn.close()
-
-    agent_map = {row["name"]: {"id": row["id"], "name": row["name"]} for row in agent_rows}
-    packets = [format_packet(row, agent_map) for row in rows]
-    return jsonify({"packets": packets})
+    return jsonify(recent_packets_body(get_db(), parse_since()))
+
+
+def recent_packets_body(conn: sqlite3.Connection, since_filter: Tuple = NO_SINCE) -> Dict:
+    rows, extra = recent_rows(conn, "packets", RECENT_PACKET_LIMIT, {}, since_filter)
+    return {"packets": [format_packet(row) for row in rows], **extra}
+
+
+@app.route("/api/dashboard/snapshot")
+@response_cache.cached("packets", "alerts", "agents", max_age=60)
+def api_dashboard_snapshot():
+    """Overview plus recent packets and alerts in one response.
+
+    Each section has the body of its own endpoint; ``fields`` (comma
+    separated, default all of ``DASHBOARD_SECTIONS``) picks the sections.
+    The two recent lists are read in one transaction and agree with each
+    other. ``overview`` comes from the in-memory aggregates, which are updated
+    after each write commits (and after peer events arrive), so it may trail
+    the lists by the writes in flight.
+    """
+    fields = [name.strip() for name in request.args.get("fields", "").split(",") if name.strip()]
+    if any(name not in DASHBOARD_SECTIONS for name in fields):
+        abort(400)
+    fields = fields or list(DASHBOARD_SECTIONS)
+
+    conn = get_db()
+    snapshot = {}
+    conn.execute("BEGIN")
+    try:
+        if "recent_packets" in fields:
+            snapshot["recent_packets"] = recent_packets_body(conn)
+        if "recent_alerts" in fields:
+            snapshot["recent_alerts"] = recent_alerts_body(conn, {})
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    if "overview" in fields:
+        snapshot["overview"] = overview.snapshot()
+    return jsonify(snapshot)
 
 
 @app.route("/stream")
 def stream():
-    return Response(event_stream(), mimetype="text/event-stream")
+    subscriber, backlog, complete = broadcaster.subscribe(
+        remote_addr=request.remote_addr,
+        last_event_id=parse_last_event_id(
+            request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+        ),
+        filters=parse_stream_filters(request.args),
+    )
+    batch = request.args.get("batch") == "1"
+    response = Response(event_stream(subscriber, backlog, complete, batch), mimetype="text/event-stream")
+    response.call_on_close(lambda: broadcaster.unsubscribe(subscriber))
+    return response
+
+
+@app.route("/api/db/stats")
+def api_db_stats():
+    return jsonify(db_pool.stats())
+
+
+@app.route("/api/ingest/stats")
+def api_ingest_stats():
+    return jsonify({"packets": packet_writer.stats(), "alerts": alert_writer.stats()})
 
 
-init_db()
+@app.route("/api/cache/stats")
+def api_cache_stats():
+    return jsonify(response_cache.stats())
+
+
+@app.route("/api/bus/stats")
+def api_bus_stats():
+    return jsonify({"pid": os.getpid(), **event_bus.stats()})
+
+
+@app.route("/api/stream/stats")
+def api_stream_stats():
+    return jsonify(broadcaster.stats())
+
+
+def collect_gauges() -> List[str]:
+    """Scrape-time gauges and counters read from the components' own ``stats()``."""
+    stream = broadcaster.stats()
+    pool = db_pool.stats()
+    cache = response_cache.stats()
+    bus = event_bus.stats()
+    writers = [("packets", packet_writer), ("alerts", alert_writer)]
+    writer_stats = [(name, writer.stats()) for name, writer in writers if writer is not None]
+    lines = []
+    for name, kind, help_text, samples in (
+        ("a2a_sse_subscribers", "gauge", "Connected SSE subscribers.", [((), stream["subscriber_count"])]),
+        (
+            "a2a_sse_subscriber_lag_events",
+            "gauge",
+            "Events queued for the slowest SSE subscriber.",
+            [((), max((item["lag"] for item in stream["subscribers"]), default=0))],
+        ),
+        (
+            "a2a_sse_queued_events",
+            "gauge",
+            "Events queued across all SSE subscribers.",
+            [((), sum(item["lag"] for item in stream["subscribers"]))],
+        ),
+        ("a2a_sse_published_total", "counter", "Events published to SSE.", [((), stream["published"])]),
+        ("a2a_sse_dropped_total", "counter", "Events dropped by connected slow subscribers.", [((), stream["total_dropped"])]),
+        (
+            "a2a_writer_queue_depth",
+            "gauge",
+            "Batches waiting in the writer queue.",
+            [((("writer", name),), item["queue_depth"]) for name, item in writer_stats],
+        ),
+        (
+            "a2a_writer_written_total",
+            "counter",
+            "Rows committed by the writer.",
+            [((("writer", name),), item["written"]) for name, item in writer_stats],
+        ),
+        (
+            "a2a_writer_failures_total",
+            "counter",
+            "Writer batches that failed.",
+            [((("writer", name),), item["failures"]) for name, item in writer_stats],
+        ),
+        ("a2a_db_pool_in_use", "gauge", "Pooled connections checked out.", [((), pool["in_use"])]),
+        ("a2a_db_pool_waits_total", "counter", "Checkouts that had to wait.", [((), pool["waits"])]),
+        ("a2a_db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection.", [((), pool["wait_seconds"])]),
+        ("a2a_cache_hits_total", "counter", "Response cache hits.", [((), cache["hits"])]),
+        ("a2a_cache_misses_total", "counter", "Response cache misses.", [((), cache["misses"])]),
+        ("a2a_bus_leader", "gauge", "1 when this worker holds the leader lock.", [((), int(bus["leader"]))]),
+        ("a2a_bus_published_total", "counter", "Events sent to other workers.", [((), bus["published"])]),
+    ):
+        lines += render_samples(name, kind, help_text, samples)
+    return lines
+
+
+@app.route("/metrics")
+def metrics():
+    if not METRICS_ENABLED:
+        abort(404)
+    lines = request_metrics.render() + sql_profiler.render() + collect_gauges()
+    return Response("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.route("/api/metrics/slow-queries")
+def api_slow_queries():
+    return jsonify({"threshold_ms": SLOW_QUERY_MS, "queries": list(reversed(sql_profiler.slow_queries))})
+
+
+static_assets.build()
+db_pool = create_db_pool()
+with file_lock(STARTUP_LOCK_PATH):
+    init_db()
+column_store.load()
+load_overview()
+load_agent_baselines()
+prime_replay_log()
+sql_profiler.reset()
+event_bus.start(handle_bus_event)
+if event_bus.is_leader:
+    export_columnar()
+    apply_retention()
+start_writers()
 background_event_thread()
 
 
@@ -0,0 +1,245 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from app import (
+    SSE_KEEPALIVE_SECONDS,
+    SSE_RETRY_MS,
+    app as flask_app,
+    broadcaster,
+    frame_interval,
+    parse_last_event_id,
+    parse_stream_filters,
+    stop_writers,
+)
+from broadcaster import AsyncSubscriber, encode_frames
+
+ASGI_DB_WORKERS = int(os.environ.get("A2A_ASGI_DB_WORKERS", "8"))
+ASGI_MAX_PENDING = int(os.environ.get("A2A_ASGI_MAX_PENDING", str(ASGI_DB_WORKERS * 4)))
+
+
+def build_environ(scope: Dict, body: bytes) -> Dict:
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    path = scope.get("path", "/")
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name == "CONTENT_LENGTH":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_wsgi(environ: Dict, emit: Callable[[Dict], None]):
+    """Run the Flask app on the calling (pool) thread and pass each body chunk to ``emit`` as it is produced.
+
+    The whole iteration stays on one thread, which ``stream_with_context``
+    generators need; a chunk is held back until the next one arrives so a
+    single-chunk response goes out as one message.
+    """
+    response: Dict = {}
+
+    def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers
+        ]
+
+    result = flask_app.wsgi_app(environ, start_response)
+    try:
+        pending: Optional[bytes] = None
+        for chunk in result:
+            if not chunk:
+                continue
+            if pending is None:
+                emit({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+            else:
+                emit({"type": "http.response.body", "body": pending, "more_body": True})
+            pending = chunk
+        if pending is None:
+            emit({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+        emit({"type": "http.response.body", "body": pending or b""})
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+
+
+class A2AAsgiApp:
+    """ASGI entry point serving the same routes as ``app.py``.
+
+    ``/stream`` is handled natively: every SSE client is a coroutine woken by
+    the broadcaster. All other routes are dispatched to the Flask app on a
+    bounded thread pool so SQLite work never blocks the event loop.
+    """
+
+    def __init__(self, workers: int = ASGI_DB_WORKERS, max_pending: int = ASGI_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure_executor(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="a2a-db")
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def __call__(self, scope: Dict, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        self._ensure_executor()
+        if scope["path"] == "/stream" and scope["method"] == "GET":
+            await self.stream(scope, receive, send)
+        else:
+            await self.dispatch(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._ensure_executor()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                await asyncio.get_running_loop().run_in_executor(None, stop_writers)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispatch(self, scope: Dict, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.extend(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+
+        environ = build_environ(scope, bytes(body))
+        loop = asyncio.get_running_loop()
+
+        def emit(message: Dict):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        async with self._slots:
+            await loop.run_in_executor(self.executor, call_wsgi, environ, emit)
+
+    async def stream(self, scope: Dict, receive, send):
+        headers = {name.lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        last_event_id = parse_last_event_id(
+            headers.get(b"last-event-id") or (query.get("last_event_id") or [None])[0]
+        )
+        client = scope.get("client") or (None, None)
+        loop = asyncio.get_running_loop()
+
+        subscriber, backlog, complete = broadcaster.subscribe(
+            remote_addr=client[0],
+            last_event_id=last_event_id,
+            subscriber_cls=AsyncSubscriber,
+            filters=parse_stream_filters(MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))),
+            loop=loop,
+        )
+        batch = (query.get("batch") or [None])[0] == "1"
+        interval = frame_interval()
+        sent_at = 0.0
+        disconnect = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream; charset=utf-8"),
+                        (b"cache-control", b"no-cache"),
+                    ],
+                }
+            )
+            frames = [f"retry: {SSE_RETRY_MS}\n\n"]
+            if not complete:
+                frames.append("event: resync\ndata: {}\n\n")
+            if backlog:
+                frames.append(encode_frames(backlog, batch))
+            await self._send_chunk(send, "".join(frames))
+
+            while not disconnect.done():
+                ready = asyncio.ensure_future(subscriber.ready.wait())
+                done, _ = await asyncio.wait(
+                    {ready, disconnect},
+                    timeout=SSE_KEEPALIVE_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if ready not in done:
+                    ready.cancel()
+                if disconnect in done:
+                    break
+                events = subscriber.drain()
+                if events:
+                    deadline = sent_at + interval
+                    while loop.time() < deadline:
+                        try:
+                            await asyncio.wait_for(subscriber.ready.wait(), deadline - loop.time())
+                        except asyncio.TimeoutError:
+                            break
+                        events += subscriber.drain()
+                    await self._send_chunk(send, encode_frames(events, batch))
+                    sent_at = loop.time()
+                elif not done:
+                    await self._send_chunk(send, ": keep-alive\n\n")
+        except OSError:
+            pass
+        finally:
+            disconnect.cancel()
+            broadcaster.unsubscribe(subscriber)
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    @staticmethod
+    async def _send_chunk(send, text: str):
+        await send({"type": "http.response.body", "body": text.encode("utf-8"), "more_body": True})
+
+
+app = A2AAsgiApp()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,95 @@
+"""Packet ingestion benchmark: per-row ``save_packet`` vs. ``POST /api/packets/bulk``.
+
+Runs against a throwaway database through the Flask test client, so the
+numbers measure validation, batching and SQLite commits rather than HTTP.
+
+    python bench/bulk_ingest.py --rows 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AGENTS = ["Atlas-Planner", "Hermes-Router", "Cetus-Analyzer", "Nyx-Vault", "Helios-Gateway", "Orion-Broker"]
+THREATS = ["Task Replay", "Message Schema Violation", "Poisoned AgentCard", "Artifact Tampering"]
+SEVERITIES = ["낮음", "중간", "높음"]
+LAYERS = ["Layer 2", "Layer 3", "Layer 4", "Layer 6", "Layer 7"]
+
+
+def make_records(count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(hours=6)
+    records = []
+    for index in range(count):
+        source, target = rng.sample(AGENTS, 2)
+        records.append(
+            {
+                "timestamp": (start + timedelta(milliseconds=index * 50)).isoformat(),
+                "source_agent": source,
+                "target_agent": target,
+                "protocol_layer": rng.choice(LAYERS),
+                "threat_type": rng.choice(THREATS),
+                "severity": rng.choice(SEVERITIES),
+                "description": f"bench record {seed}-{index}",
+                "resolution": "-",
+            }
+        )
+    return records
+
+
+def bench_single(app, records: List[Dict]) -> float:
+    start = time.perf_counter()
+    for record in records:
+        app.save_packet(app.validate_packet(record))
+    return time.perf_counter() - start
+
+
+def bench_bulk(client, records: List[Dict], chunk: int, ndjson: bool) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(records), chunk):
+        part = records[offset : offset + chunk]
+        if ndjson:
+            body = "\n".join(json.dumps(record, ensure_ascii=False) for record in part)
+            response = client.post("/api/packets/bulk", data=body, content_type="application/x-ndjson")
+        else:
+            response = client.post("/api/packets/bulk", json=part)
+        if response.status_code != 200:
+            sys.exit(f"bulk request failed: {response.status_code} {response.get_data(as_text=True)[:200]}")
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=5_000, help="rows for the slow per-row baseline")
+    parser.add_argument("--chunk", type=int, default=10_000, help="records per bulk request")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="a2a_ingest_")
+    os.environ["A2A_DATABASE_PATH"] = os.path.join(workdir, "bench.db")
+    sys.path.insert(0, ROOT)
+    import app
+
+    client = app.app.test_client()
+    results = [
+        ("save_packet (per row)", args.single_rows, bench_single(app, make_records(args.single_rows, 1))),
+        ("bulk JSON array", args.rows, bench_bulk(client, make_records(args.rows, 2), args.chunk, ndjson=False)),
+        ("bulk NDJSON", args.rows, bench_bulk(client, make_records(args.rows, 3), args.chunk, ndjson=True)),
+    ]
+
+    print(f"{'path':<24}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    for label, rows, seconds in results:
+        print(f"{label:<24}{rows:>10,}{seconds:>10.2f}{rows / seconds:>12,.0f}")
+    print(json.dumps(app.packet_writer.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
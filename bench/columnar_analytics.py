@@ -0,0 +1,175 @@
+"""Columnar analytics benchmark against SQLite GROUP BY queries.
+
+Fills a day-partition-shaped SQLite table with random packets spread over
+``--days`` days, exports each day into ``columnar.ColumnStore`` and times the
+long-range questions both ways: severity by protocol layer per week, top
+repeat offenders per month and threat-type trends per week. Results are
+compared before timing.
+
+    python bench/columnar_analytics.py --rows 2000000 --days 90
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_MS = 24 * 3600 * 1000
+SEVERITIES = ["낮음", "중간", "높음"]
+LAYERS = [f"Layer {number}" for number in range(1, 8)]
+THREATS = [
+    "정상 통신", "프롬프트 인젝션", "에이전트 사칭", "재전송 공격", "메시지 스키마 위반",
+    "알 수 없는 도메인의 에이전트 카드", "데이터 유출 시도", "권한 상승",
+]
+SOURCE_SQL = (
+    "SELECT id, ts, severity, protocol_layer, threat_type, source_agent_id, target_agent_id "
+    "FROM packets WHERE ts >= ? AND ts < ? ORDER BY id"
+)
+QUERIES = {
+    "severity x layer / week": (
+        "SELECT (ts / 86400000 + 3) / 7 AS week, severity, protocol_layer, COUNT(*) FROM packets "
+        "WHERE ts >= ? AND ts < ? GROUP BY 1, 2, 3",
+        ("week", "severity", "protocol_layer"),
+        {},
+    ),
+    "top offenders / month": (
+        "SELECT month, source_agent_id, hits FROM ("
+        " SELECT month, source_agent_id, hits,"
+        "  ROW_NUMBER() OVER (PARTITION BY month ORDER BY hits DESC, source_agent_id) AS rank FROM ("
+        "   SELECT CAST(strftime('%Y', ts / 1000, 'unixepoch') AS INTEGER) * 12"
+        "    + CAST(strftime('%m', ts / 1000, 'unixepoch') AS INTEGER) - 23641 AS month,"
+        "    source_agent_id, COUNT(*) AS hits FROM packets"
+        "   WHERE severity = '높음' AND ts >= ? AND ts < ? GROUP BY 1, 2)"
+        ") WHERE rank <= 10",
+        ("month", "source_agent_id"),
+        {"severity": "높음"},
+    ),
+    "threat trend / week": (
+        "SELECT (ts / 86400000 + 3) / 7 AS week, threat_type, COUNT(*) FROM packets "
+        "WHERE ts >= ? AND ts < ? GROUP BY 1, 2",
+        ("week", "threat_type"),
+        {},
+    ),
+}
+
+
+def populate(conn: sqlite3.Connection, rows: int, days: int, agents: int, start_ms: int, rng: np.random.Generator):
+    conn.executescript(
+        """
+        CREATE TABLE packets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts INTEGER NOT NULL,
+            source_agent_id INTEGER,
+            target_agent_id INTEGER,
+            protocol_layer TEXT NOT NULL,
+            threat_type TEXT NOT NULL,
+            severity TEXT NOT NULL
+        );
+        CREATE INDEX idx_packets_ts ON packets(ts);
+        CREATE INDEX idx_packets_severity_ts ON packets(severity, ts);
+        """
+    )
+    batch = 200_000
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        ts = np.sort(rng.integers(start_ms, start_ms + days * DAY_MS, count))
+        conn.executemany(
+            "INSERT INTO packets (ts, source_agent_id, target_agent_id, protocol_layer, threat_type, severity) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            zip(
+                ts.tolist(),
+                (rng.zipf(1.3, count) % agents + 1).tolist(),
+                rng.integers(1, agents + 1, count).tolist(),
+                (LAYERS[code] for code in rng.integers(0, len(LAYERS), count).tolist()),
+                (THREATS[code] for code in rng.choice(len(THREATS), count, p=[0.72] + [0.04] * 7).tolist()),
+                (SEVERITIES[code] for code in rng.choice(3, count, p=[0.7, 0.2, 0.1]).tolist()),
+            ),
+        )
+    conn.commit()
+
+
+def timed(label: str, repeat: int, query: Callable[[], object]) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        samples.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(samples)
+    print(f"  {label:<10} median {median:9.2f} ms   min {min(samples):9.2f} ms")
+    return median
+
+
+def top_per_first_key(keys: List[Tuple], counts: np.ndarray, top: int) -> Dict[Tuple, int]:
+    groups: Dict[object, List[int]] = {}
+    for position, key in enumerate(keys):
+        groups.setdefault(key[0], []).append(position)
+    return {
+        keys[position]: int(counts[position])
+        for members in groups.values()
+        for position in sorted(members, key=lambda position: (-counts[position], keys[position][1]))[:top]
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--agents", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from columnar import ColumnStore
+
+    rng = np.random.default_rng(11)
+    start_ms = (int(time.time() * 1000) // DAY_MS - args.days) * DAY_MS
+    end_ms = start_ms + args.days * DAY_MS
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "bench.db"))
+        started = time.perf_counter()
+        populate(conn, args.rows, args.days, args.agents, start_ms, rng)
+        size = os.path.getsize(os.path.join(directory, "bench.db"))
+        elapsed = time.perf_counter() - started
+        print(f"sqlite: {args.rows:,} rows over {args.days} days in {elapsed:.1f} s, {size / 2**20:.0f} MiB")
+
+        store = ColumnStore(os.path.join(directory, "columnar"))
+        store.load()
+        started = time.perf_counter()
+        for day in range(start_ms // DAY_MS, end_ms // DAY_MS):
+            name = time.strftime("%Y%m%d", time.gmtime(day * DAY_MS / 1000))
+            store.export("packets", name, conn.execute(SOURCE_SQL, (day * DAY_MS, (day + 1) * DAY_MS)), day * DAY_MS)
+        stats = store.stats()["packets"]
+        print(
+            f"columnar: exported {stats['segments']} segments in {time.perf_counter() - started:.1f} s, "
+            f"{stats['bytes'] / 2**20:.0f} MiB ({stats['bytes'] / max(stats['rows'], 1):.1f} bytes/row)"
+        )
+
+        for label, (sql, group_by, where) in QUERIES.items():
+            expected = {tuple(row[:-1]): row[-1] for row in conn.execute(sql, (start_ms, end_ms))}
+            keys, counts, _ = store.aggregate("packets", group_by, start_ms, end_ms, where)
+            if label.startswith("top"):
+                actual = top_per_first_key(keys, counts, 10)
+            else:
+                actual = {tuple(key): int(count) for key, count in zip(keys, counts)}
+            assert actual == expected, label
+        print("columnar group-bys match SQLite results")
+
+        for label, (sql, group_by, where) in QUERIES.items():
+            print(f"{label}:")
+            row_ms = timed("sqlite", args.repeat, lambda: conn.execute(sql, (start_ms, end_ms)).fetchall())
+            column_ms = timed(
+                "columnar", args.repeat, lambda: store.aggregate("packets", group_by, start_ms, end_ms, where)
+            )
+            print(f"  speedup    {row_ms / column_ms:9.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Response compression benchmark: payload size and latency per encoding.
+
+Requests the dashboard's static assets and the heaviest JSON endpoints through
+the Flask test client with ``Accept-Encoding`` set to identity, gzip and (when
+the ``brotli`` package is installed) br, and reports bytes on the wire, the
+median server time including compression, and the transfer time those bytes
+would take on a ``--mbps`` link.
+
+    python bench/compression.py --packets 20000 --mbps 10
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    "/api/packets?limit=1000",
+    "/api/packets?limit=100",
+    "/api/agents",
+    "/api/overview",
+    "/api/alerts/recent",
+    "/api/packets/recent",
+    "/api/analytics?group_by=hour,threat_type,severity",
+]
+THREATS = [
+    "Agent Card Spoofing",
+    "Task Replay",
+    "Message Schema Violation",
+    "Artifact Tampering",
+    "Supply Chain Attack",
+]
+DESCRIPTIONS = [
+    "동일 Task ID 재요청 패턴 확인 ({token})",
+    "AgentCard 스키마 필드 누락 ({token})",
+    "TLS 핸드셰이크 중 위조 인증서 수신 ({token})",
+    "미등록 도메인에서 AgentCard 수신 ({token})",
+]
+RESOLUTIONS = ["재전송 차단 정책 적용", "스키마 검증 강화", "세션 차단 및 키 회전", "도메인 블록리스트 추가"]
+
+
+def populate(app, packets: int):
+    with app.db_pool.read() as conn:
+        agents = [row[0] for row in conn.execute("SELECT name FROM agents")]
+    rng = random.Random(5)
+    now = datetime.utcnow()
+    batch = []
+    for index in range(packets):
+        moment = now - timedelta(seconds=packets - index)
+        source, target = rng.sample(agents, 2)
+        batch.append(
+            {
+                "timestamp": moment.isoformat(),
+                "ts": app.to_epoch_ms(moment),
+                "source_agent": source,
+                "target_agent": target,
+                "protocol_layer": rng.choice(["Layer 2", "Layer 3", "Layer 4", "Layer 7"]),
+                "threat_type": rng.choice(THREATS),
+                "severity": rng.choice(app.SEVERITIES),
+                "description": rng.choice(DESCRIPTIONS).format(token=f"task-{rng.randrange(1_000_000)}"),
+                "resolution": rng.choice(RESOLUTIONS),
+            }
+        )
+    app.write_packets(batch)
+
+
+def measure(client, url: str, encoding: str, repeat: int) -> Dict:
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers={"Accept-Encoding": encoding})
+        size = len(response.get_data())
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+    return {"bytes": size, "server_ms": statistics.median(samples)}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=20_000)
+    parser.add_argument("--mbps", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="a2a-compression-")
+    os.environ["A2A_DATABASE_PATH"] = os.path.join(directory, "bench.db")
+    sys.path.insert(0, ROOT)
+    import app
+    from compression import ENCODINGS
+
+    populate(app, args.packets)
+    client = app.app.test_client()
+    page = client.get("/dashboard", headers={"Accept-Encoding": "identity"}).get_data(as_text=True)
+    urls = ["/dashboard"] + re.findall(r'"(/assets/[^"]+)"', page) + ENDPOINTS
+
+    encodings = ["identity"] + [encoding for encoding in ("gzip", "br") if encoding in ENCODINGS]
+    print(f"{'url':<40}" + "".join(f"{encoding + ' bytes':>14}{'server':>10}{'wire':>10}" for encoding in encodings))
+    totals = {encoding: 0.0 for encoding in encodings}
+    for url in urls:
+        cells = []
+        for encoding in encodings:
+            result = measure(client, url, encoding, args.repeat)
+            wire_ms = result["bytes"] * 8 / (args.mbps * 1000)
+            totals[encoding] += result["server_ms"] + wire_ms
+            cells.append(f"{result['bytes']:>14,}{result['server_ms']:>8.2f}ms{wire_ms:>8.1f}ms")
+        print(f"{url[:39]:<40}" + "".join(cells))
+    print(
+        f"total server + wire at {args.mbps:g} Mbit/s: "
+        + ", ".join(f"{encoding} {total:.0f} ms" for encoding, total in totals.items())
+    )
+
+
+if __name__ == "__main__":
+    main()
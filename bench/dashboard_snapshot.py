@@ -0,0 +1,88 @@
+"""Dashboard first-load benchmark: three API calls versus ``/api/dashboard/snapshot``.
+
+Loads the dashboard data through the Flask test client either as the three
+requests the page used to send (``/api/overview``, ``/api/packets/recent``,
+``/api/alerts/recent``) or as one snapshot request, and reports per page load
+the median wall time, the CPU time of the process (server plus test client),
+the bytes returned and the pool checkouts. ``cold`` invalidates the response
+cache before every load, ``warm`` serves from it.
+
+    python bench/dashboard_snapshot.py --packets 20000 --repeat 300
+"""
+
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEQUENCES = {
+    "three calls": ["/api/overview", "/api/packets/recent", "/api/alerts/recent"],
+    "snapshot": ["/api/dashboard/snapshot"],
+}
+
+
+def load_populate():
+    spec = importlib.util.spec_from_file_location("compression_bench", os.path.join(ROOT, "bench", "compression.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.populate
+
+
+def measure(app, client, urls: List[str], repeat: int, cold: bool) -> Dict:
+    wall = []
+    cpu = 0.0
+    size = 0
+    checkouts = app.db_pool.stats()["checkouts"]
+    for _ in range(repeat):
+        if cold:
+            for topic in ("packets", "alerts", "agents"):
+                app.response_cache.invalidate(topic)
+        started, cpu_started = time.perf_counter(), time.process_time()
+        size = 0
+        for url in urls:
+            response = client.get(url, headers={"Accept-Encoding": "identity"})
+            size += len(response.get_data())
+            assert response.status_code == 200, (url, response.status_code)
+        cpu += time.process_time() - cpu_started
+        wall.append((time.perf_counter() - started) * 1000)
+    return {
+        "wall_ms": statistics.median(wall),
+        "cpu_ms": cpu / repeat * 1000,
+        "bytes": size,
+        "checkouts": (app.db_pool.stats()["checkouts"] - checkouts) / repeat,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="a2a-snapshot-")
+    os.environ["A2A_DATABASE_PATH"] = os.path.join(directory, "bench.db")
+    sys.path.insert(0, ROOT)
+    import app
+
+    load_populate()(app, args.packets)
+    client = app.app.test_client()
+
+    print(f"{'cache':<7}{'sequence':<14}{'wall p50':>11}{'cpu/load':>11}{'bytes':>9}{'checkouts':>11}")
+    for cold in (True, False):
+        for name, urls in SEQUENCES.items():
+            measure(app, client, urls, max(args.repeat // 10, 1), cold)
+            result = measure(app, client, urls, args.repeat, cold)
+            print(
+                f"{'cold' if cold else 'warm':<7}{name:<14}{result['wall_ms']:>9.3f}ms{result['cpu_ms']:>9.3f}ms"
+                f"{result['bytes']:>9,}{result['checkouts']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
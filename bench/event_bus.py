@@ -0,0 +1,152 @@
+"""Cross-process event bus benchmark: fan-out throughput and latency per worker count.
+
+Spawns N worker processes that share one ``bus.SocketBus``. The first to win
+the leader lock hosts the hub and plays the elected producer. Two phases are
+measured:
+
+- throughput: the leader publishes ``--events`` alert-sized events as fast as
+  it can, and the phase ends once every follower has received all of them.
+  Each follower also publishes ``--events // 10`` events, standing in for
+  alerts from API requests it serves.
+- latency: the leader publishes ``--paced`` events at ``--rate`` per second and
+  the followers record the send-to-handler delay.
+
+    python bench/event_bus.py --workers 1 4 16 --events 50000
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ALERT = {
+    "id": 0,
+    "timestamp": "2026-10-17T09:00:00.000000",
+    "ts": 0,
+    "source_agent": "Atlas-Planner",
+    "target_agent": "Hermes-Router",
+    "source_agent_id": 1,
+    "target_agent_id": 2,
+    "threat_type": "Task Replay",
+    "severity": "높음",
+    "protocol_layer": "Layer 7",
+    "description": "동일 Task ID 재요청 패턴 확인 (task-424242) - 재전송 차단 정책 적용 대상",
+}
+
+
+def worker(directory: str, workers: int, events: int, paced: int, rate: float, ready, results):
+    sys.path.insert(0, ROOT)
+    from bus import SocketBus
+
+    bus = SocketBus(os.path.join(directory, "bus.sock"), os.path.join(directory, "leader.lock"))
+    received = {"throughput": 0, "latency": []}
+    done = threading.Event()
+    side = events // 10
+
+    def handler(topic: str, payload: Dict):
+        if topic == "throughput":
+            received["throughput"] += 1
+            if received["throughput"] == expected:
+                done.set()
+        else:
+            received["latency"].append(time.time() - payload["sent"])
+
+    bus.start(handler)
+    while not (bus.is_leader or bus.stats()["connected"]):
+        time.sleep(0.01)
+    expected = (workers - 2) * side + events if not bus.is_leader else (workers - 1) * side
+    ready.wait()
+    if bus.is_leader:
+        while bus.stats()["peers"] < workers - 1:
+            time.sleep(0.01)
+    ready.wait()
+
+    started = time.perf_counter()
+    for sequence in range(events if bus.is_leader else side):
+        bus.publish("throughput", {**ALERT, "id": sequence})
+    if expected:
+        done.wait(120)
+    elapsed = time.perf_counter() - started
+    ready.wait()
+
+    if bus.is_leader:
+        for sequence in range(paced):
+            bus.publish("latency", {**ALERT, "id": sequence, "sent": time.time()})
+            time.sleep(1 / rate)
+    time.sleep(0.5)
+    results.put(
+        {
+            "leader": bus.is_leader,
+            "received": received["throughput"],
+            "expected": expected,
+            "elapsed": elapsed,
+            "latency": received["latency"],
+            "lost": bus.stats()["dropped"] + bus.stats()["slow_disconnects"],
+        }
+    )
+    ready.wait()
+    bus.stop()
+
+
+def run(workers: int, events: int, paced: int, rate: float) -> Dict:
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(workers)
+    results = context.Queue()
+    with tempfile.TemporaryDirectory() as directory:
+        processes = [
+            context.Process(target=worker, args=(directory, workers, events, paced, rate, ready, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get(timeout=300) for _ in processes]
+        for process in processes:
+            process.join(timeout=30)
+    latencies = sorted(value * 1000 for item in collected for value in item["latency"])
+    delivered = sum(item["received"] for item in collected)
+    elapsed = max(item["elapsed"] for item in collected)
+    return {
+        "leaders": sum(item["leader"] for item in collected),
+        "published": events + (workers - 1) * (events // 10),
+        "delivered": delivered,
+        "complete": all(item["received"] == item["expected"] for item in collected),
+        "lost": sum(item["lost"] for item in collected),
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies) if latencies else None,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--events", type=int, default=50_000, help="events published by the leader")
+    parser.add_argument("--paced", type=int, default=500, help="leader events for the latency phase")
+    parser.add_argument("--rate", type=float, default=200.0, help="leader events per second")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'workers':>7}{'leaders':>9}{'published':>11}{'delivered':>11}{'elapsed':>10}{'deliveries/s':>14}"
+        f"{'p50':>10}{'p99':>10}"
+    )
+    for workers in args.workers:
+        result = run(workers, args.events, args.paced, args.rate)
+        rate = result["delivered"] / result["elapsed"] if result["delivered"] else 0
+        p50 = f"{result['p50']:.2f}ms" if result["p50"] is not None else "-"
+        p99 = f"{result['p99']:.2f}ms" if result["p99"] is not None else "-"
+        print(
+            f"{workers:>7}{result['leaders']:>9}{result['published']:>11,}{result['delivered']:>11,}"
+            f"{result['elapsed']:>9.2f}s{rate:>14,.0f}{p50:>10}{p99:>10}"
+            + ("" if result["complete"] else f"  (incomplete, {result['lost']} dropped/disconnected)")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Packet search benchmark: LIKE scans vs. the FTS5 index.
+
+Builds (or reuses) synthetic packet partitions covering the retention window
+and times the same filters through both search paths of
+``app.text_search_clause``, for the first page of ``/api/packets`` (ORDER BY
+ts DESC LIMIT 100, newest partition first) and for a full match count.
+
+    python bench/fts_search.py --rows 2000000 --db /tmp/a2a_fts_bench.db
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+THREATS = [
+    "Agent Card Spoofing",
+    "Task Replay",
+    "Message Schema Violation",
+    "Server Impersonation",
+    "Cross-Agent Task Escalation",
+    "Artifact Tampering",
+    "Supply Chain Attack",
+    "Authentication Threat",
+    "Poisoned AgentCard",
+    "Emergent Vulnerability",
+]
+PREFIXES = ["Atlas", "Hermes", "Cetus", "Nyx", "Helios", "Orion", "Vega", "Lyra", "Draco", "Aquila"]
+ROLES = ["Planner", "Router", "Analyzer", "Vault", "Executor", "Gateway", "Indexer", "Broker"]
+DESCRIPTIONS = [
+    "동일 Task ID 재요청 패턴 확인 ({token})",
+    "AgentCard 스키마 필드 누락 ({token})",
+    "TLS 핸드셰이크 중 위조 인증서 수신 ({token})",
+    "미등록 도메인에서 AgentCard 수신 ({token})",
+    "Artifact 해시 불일치 ({token})",
+    "외부 종속성 업데이트 중 악성 패키지 감지 ({token})",
+]
+RESOLUTIONS = ["재전송 차단 정책 적용", "스키마 검증 강화", "세션 차단 및 키 회전", "도메인 블록리스트 추가"]
+SEVERITIES = ["낮음", "중간", "높음"]
+LAYERS = ["Layer 2", "Layer 3", "Layer 4", "Layer 6", "Layer 7"]
+
+CASES: List[Dict[str, Optional[str]]] = [
+    {"threat_type": "Replay"},
+    {"source_agent": "Nyx"},
+    {None: "재요청"},
+    {None: "인증서", "target_agent": "Helios"},
+    {None: "task-4242"},
+    {None: "zzz-no-match"},
+]
+
+
+def populate(app, rows: int, batch_size: int = 50000):
+    agents = [f"{prefix}-{role}" for prefix in PREFIXES for role in ROLES]
+    days = max(1, app.RETENTION_DAYS - 1)
+    start = datetime.utcnow() - timedelta(days=days)
+    step_ms = max(1, int(days * 86400 * 1000 / rows))
+    rng = random.Random(42)
+    inserted = 0
+    began = time.perf_counter()
+    while inserted < rows:
+        batch = []
+        for offset in range(min(batch_size, rows - inserted)):
+            index = inserted + offset
+            moment = start + timedelta(milliseconds=index * step_ms)
+            source, target = rng.sample(agents, 2)
+            batch.append(
+                {
+                    "timestamp": moment.isoformat(),
+                    "ts": app.to_epoch_ms(moment),
+                    "source_agent": source,
+                    "target_agent": target,
+                    "protocol_layer": rng.choice(LAYERS),
+                    "threat_type": rng.choice(THREATS),
+                    "severity": rng.choice(SEVERITIES),
+                    "description": rng.choice(DESCRIPTIONS).format(token=f"task-{rng.randrange(1_000_000)}"),
+                    "resolution": rng.choice(RESOLUTIONS),
+                }
+            )
+        with app.db_pool.write() as conn:
+            groups, _ = app.route_rows(conn, "packets", batch)
+            for day, group in groups.items():
+                sql = app.PACKET_INSERT_SQL.format(table=app.partition_store.table(day, "packets"))
+                conn.executemany(sql, map(app.packet_params, group))
+        inserted += len(batch)
+        print(f"\rinserted {inserted:,}/{rows:,}", end="", file=sys.stderr)
+    print(f"\rinserted {rows:,} rows in {time.perf_counter() - began:.1f}s", file=sys.stderr)
+
+
+def time_query(query: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run_case(app, conn, filters: Dict[str, Optional[str]], repeat: int) -> Dict:
+    result = {"filters": ", ".join(f"{key or 'q'}={value}" for key, value in filters.items())}
+    for label, enabled in (("like", False), ("fts", True)):
+        app.fts_enabled = enabled
+        clause, params = app.text_search_clause(conn, "packets", filters)
+        page_sql = f"SELECT * FROM {{schema}}.packets WHERE 1=1{clause} ORDER BY ts DESC, id DESC"
+        count_sql = f"SELECT COUNT(*) FROM {{schema}}.packets WHERE 1=1{clause}"
+
+        def page():
+            return list(app.partition_store.select(conn, page_sql, params, limit=100))
+
+        def count():
+            return sum(
+                conn.execute(count_sql.format(schema=app.partition_store.schema(day)), params).fetchone()[0]
+                for day in app.partition_store.attached_days(conn)
+            )
+
+        result[f"{label}_page_ms"] = time_query(page, repeat)
+        result[f"{label}_count_ms"] = time_query(count, repeat)
+        result["matches"] = count()
+    app.fts_enabled = True
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "a2a_fts_bench.db"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ["A2A_DATABASE_PATH"] = args.db
+    sys.path.insert(0, ROOT)
+    import app
+
+    if not app.fts_enabled:
+        sys.exit("SQLite was built without FTS5; nothing to compare")
+
+    with app.db_pool.read() as conn:
+        existing = conn.execute("SELECT COUNT(*) FROM packets").fetchone()[0]
+    if existing < args.rows:
+        populate(app, args.rows - existing)
+
+    print(f"{'filters':<40}{'matches':>10}{'LIKE page':>12}{'FTS page':>11}{'LIKE count':>13}{'FTS count':>12}")
+    with app.db_pool.read() as conn:
+        for filters in CASES:
+            row = run_case(app, conn, filters, args.repeat)
+            print(
+                f"{row['filters']:<40}{row['matches']:>10,}{row['like_page_ms']:>10.1f}ms"
+                f"{row['fts_page_ms']:>9.1f}ms{row['like_count_ms']:>11.1f}ms{row['fts_count_ms']:>10.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Instrumentation overhead benchmark: request latency with metrics off and on.
+
+Two parts:
+
+- statement: the per-statement cost of ``metrics.ProfiledConnection`` against
+  a plain ``sqlite3`` connection, for a point lookup and a 1000-row result
+  read with ``fetchall`` and by iteration.
+- endpoints: the app is started in child processes, alternating
+  ``A2A_METRICS=0`` and ``A2A_METRICS=1`` for ``--rounds`` rounds on the same
+  ``--packets`` rows, and the median over rounds of each endpoint's p50 and
+  p99 latency is compared through the Flask test client.
+
+    python bench/metrics_overhead.py --packets 20000 --repeat 200 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    "/api/overview",
+    "/api/packets?limit=100",
+    "/api/packets?limit=1000",
+    "/api/packets?severity=%EB%86%92%EC%9D%8C&limit=100",
+    "/api/alerts/recent",
+    "/api/agents",
+]
+
+
+def time_statements(conn: sqlite3.Connection, repeat: int) -> Dict[str, float]:
+    results = {}
+    for label, sql, parameters, consume in (
+        ("point lookup", "SELECT * FROM t WHERE id = ?", None, lambda cursor: cursor.fetchone()),
+        ("1000-row fetchall", "SELECT * FROM t WHERE id > ? LIMIT 1000", (0,), lambda cursor: cursor.fetchall()),
+        ("1000-row iterate", "SELECT * FROM t WHERE id > ? LIMIT 1000", (0,), lambda cursor: sum(1 for _ in cursor)),
+    ):
+        count = repeat if parameters is None else max(repeat // 100, 10)
+        started = time.perf_counter()
+        for index in range(count):
+            consume(conn.execute(sql, parameters or (index % 1000 + 1,)))
+        results[label] = (time.perf_counter() - started) / count * 1e6
+    return results
+
+
+def statement_overhead(repeat: int):
+    from metrics import ProfiledConnection, SqlProfiler
+
+    print(f"{'statement':<20}{'plain':>12}{'profiled':>12}{'overhead':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "statements.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, value REAL)")
+            conn.executemany("INSERT INTO t VALUES (?, ?, ?)", ((i, f"row-{i}", i * 0.5) for i in range(1, 5001)))
+        plain = sqlite3.connect(path)
+        profiled = sqlite3.connect(path, factory=ProfiledConnection)
+        profiled.profiler = SqlProfiler()
+        for conn in (plain, profiled):
+            conn.row_factory = sqlite3.Row
+            time_statements(conn, repeat // 10)
+        baseline = time_statements(plain, repeat)
+        measured = time_statements(profiled, repeat)
+        for label in baseline:
+            print(
+                f"{label:<20}{baseline[label]:>10.1f}us{measured[label]:>10.1f}us"
+                f"{measured[label] - baseline[label]:>10.1f}us"
+            )
+
+
+def child(packets: int, repeat: int):
+    """Runs inside a child process; prints per-endpoint latencies as JSON."""
+    import importlib.util
+
+    import app
+
+    spec = importlib.util.spec_from_file_location("compression_bench", os.path.join(ROOT, "bench", "compression.py"))
+    compression_bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(compression_bench)
+    compression_bench.populate(app, packets)
+    client = app.app.test_client()
+    results = {}
+    for url in ENDPOINTS:
+        for _ in range(repeat // 10):
+            client.get(url, headers={"Accept-Encoding": "identity"})
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(url, headers={"Accept-Encoding": "identity"})
+            response.get_data()
+            samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, (url, response.status_code)
+        samples.sort()
+        results[url] = {"p50": statistics.median(samples), "p99": samples[int(len(samples) * 0.99) - 1]}
+    scrape = time.perf_counter()
+    body = client.get("/metrics").get_data() if app.METRICS_ENABLED else b""
+    results["/metrics"] = {"ms": (time.perf_counter() - scrape) * 1000, "bytes": len(body)}
+    print(json.dumps(results))
+
+
+def endpoint_overhead(packets: int, repeat: int, rounds: int):
+    runs: Dict[str, List[Dict]] = {"0": [], "1": []}
+    for enabled in ("0", "1") * rounds:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "A2A_METRICS": enabled,
+                "A2A_DATABASE_PATH": os.path.join(directory, "bench.db"),
+                "A2A_SLOW_QUERY_MS": "100",
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", "--packets", str(packets), "--repeat", str(repeat)],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        runs[enabled].append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"\n{'endpoint':<52}{'off p50':>10}{'on p50':>10}{'delta':>9}{'off p99':>10}{'on p99':>10}")
+    for url in ENDPOINTS:
+        off, on = ({key: statistics.median(run[url][key] for run in runs[mode]) for key in ("p50", "p99")} for mode in "01")
+        delta = (on["p50"] - off["p50"]) / off["p50"] * 100
+        print(
+            f"{url[:51]:<52}{off['p50']:>8.2f}ms{on['p50']:>8.2f}ms{delta:>8.1f}%"
+            f"{off['p99']:>8.2f}ms{on['p99']:>8.2f}ms"
+        )
+    scrape = runs["1"][-1]["/metrics"]
+    print(f"/metrics scrape: {scrape['ms']:.1f} ms, {scrape['bytes']:,} bytes")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packets", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3, help="child processes per mode, run alternately")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.child:
+        child(args.packets, args.repeat)
+        return
+    statement_overhead(args.repeat * 50)
+    endpoint_overhead(args.packets, args.repeat, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
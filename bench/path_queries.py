@@ -0,0 +1,132 @@
+"""Adjacency index benchmark for attack-path queries.
+
+Builds ``adjacency.AdjacencyIndex`` over a random directed agent graph, then
+times k-hop reachability, shortest and riskiest paths and blast radius from
+random agents, before and after a batch of incremental inserts. Paths are
+checked against plain reference searches on a small graph first.
+
+    python bench/path_queries.py --agents 100000 --edges 1000000
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build(index_cls, names: List[str], edges: int, rng: np.random.Generator):
+    index = index_cls()
+    risks = rng.random(len(names)).tolist()
+    index.register((position + 1, name, risks[position], "정상") for position, name in enumerate(names))
+    sources = rng.integers(0, len(names), edges)
+    targets = (sources + rng.integers(1, len(names), edges)) % len(names)
+    severities = rng.choice([-1, 0, 1, 2], edges, p=[0.3, 0.4, 0.2, 0.1])
+    index.add_edges(
+        (names[s], names[t], 1, None if sev < 0 else sev)
+        for s, t, sev in zip(sources.tolist(), targets.tolist(), severities.tolist())
+    )
+    return index
+
+
+def timed(label: str, queries: int, query: Callable[[], object]):
+    samples = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        query()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<24} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def reference_riskiest(index, start: int, goal: int, max_hops: int) -> float:
+    m = index.edge_count
+    rows = np.arange(m)
+    logs = index._spread_log(rows)
+    best = np.full(index.count, -np.inf)
+    best[start] = 0.0
+    for _ in range(max_hops):
+        step = best.copy()
+        np.maximum.at(step, index.edge_target[:m], best[index.edge_source[:m]] + logs)
+        best = step
+    return math.exp(best[goal]) if np.isfinite(best[goal]) else 0.0
+
+
+def verify(index_cls, rng: np.random.Generator):
+    names = [f"check-{position}" for position in range(300)]
+    index = build(index_cls, names, 1500, rng)
+    for _ in range(50):
+        start, goal = (int(value) for value in rng.integers(0, len(names), 2))
+        if start == goal:
+            continue
+        found = index.riskiest_path(start, goal, 4)
+        expected = reference_riskiest(index, start, goal, 4)
+        actual = found[1] if found else 0.0
+        assert math.isclose(actual, expected, rel_tol=1e-9), (start, goal, actual, expected)
+        if found:
+            path = found[0]
+            product = math.prod(math.exp(index._spread_log(np.array([row]))[0]) for _, row in path[1:])
+            assert len(path) - 1 <= 4 and math.isclose(product, actual, rel_tol=1e-9)
+        positions, hops = index.reachable(start, 4)
+        expected_hops = hops[positions == goal]
+        shortest = index.shortest_path(start, goal, 4)
+        assert (shortest is None) == (len(expected_hops) == 0)
+        if shortest:
+            assert len(shortest) - 1 == expected_hops[0] and shortest[0][0] == start and shortest[-1][0] == goal
+            assert all(int(index.edge_target[row]) == node for node, row in shortest[1:])
+    print("riskiest and shortest paths match reference searches on 300 agents / 1,500 edges")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--hops", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--inserts", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from adjacency import AdjacencyIndex
+
+    rng = np.random.default_rng(7)
+    verify(AdjacencyIndex, rng)
+
+    names = [f"agent-{position:06d}" for position in range(args.agents)]
+    start = time.perf_counter()
+    index = build(AdjacencyIndex, names, args.edges, rng)
+    print(f"load {args.agents:,} agents / {index.edge_count:,} edges: {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    index._compact()
+    print(f"compact CSR: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def pick() -> int:
+        return int(rng.integers(0, args.agents))
+
+    for phase in ("indexed", "after inserts"):
+        if phase == "after inserts":
+            start = time.perf_counter()
+            index.apply_packets(
+                {"source_agent": names[pick()], "target_agent": names[pick()], "severity": "높음"}
+                for _ in range(args.inserts)
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"insert {args.inserts:,} packets: {elapsed:.0f} ms, pending {index.stats()['pending_edges']:,}")
+        print(f"{phase}:")
+        timed("reachable 1 hop", args.queries, lambda: index.reachable(pick(), 1))
+        timed(f"reachable {args.hops} hops", args.queries, lambda: index.reachable(pick(), args.hops))
+        timed("shortest path", args.queries, lambda: index.shortest_path(pick(), pick(), 6))
+        timed(f"riskiest path ({args.hops} hops)", args.queries, lambda: index.riskiest_path(pick(), pick(), args.hops))
+        timed("blast radius 2 hops", args.queries, lambda: index.blast_radius(pick(), 2))
+        timed(f"blast radius {args.hops} hops", args.queries, lambda: index.blast_radius(pick(), args.hops))
+
+
+if __name__ == "__main__":
+    main()
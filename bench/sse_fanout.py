@@ -0,0 +1,140 @@
+"""SSE fan-out benchmark: filtered delivery, encode-once and burst coalescing.
+
+Two parts, both in-process:
+
+- fanout: ``--subscribers`` clients, ``--filtered`` of them subscribed with a
+  severity or agent filter, receive ``--events`` alerts. The previous
+  behaviour (every client gets every event and each stream generator calls
+  ``json.dumps``) is compared with ``EventBroadcaster.publish`` (predicate
+  index, one encode per event) by time per event and bytes written.
+- burst: ``--burst`` alerts are published over one second to a single
+  ``app.event_stream`` generator and the number of writes it yields is
+  counted, with ``A2A_SSE_MAX_FPS`` pacing on and off. Events beyond the
+  subscriber buffer (``SSE_BUFFER_SIZE``) per frame interval are dropped.
+
+    python bench/sse_fanout.py --subscribers 1000 10000 --events 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEVERITIES = ("낮음", "중간", "높음")
+AGENTS = [f"Agent-{index:04d}" for index in range(500)]
+
+
+def make_alert(rng: random.Random, alert_id: int) -> dict:
+    source, target = rng.sample(AGENTS, 2)
+    return {
+        "id": alert_id,
+        "timestamp": "2026-10-17T09:00:00.000000",
+        "ts": 1792227600000 + alert_id,
+        "source_agent": source,
+        "target_agent": target,
+        "source_agent_id": AGENTS.index(source) + 1,
+        "target_agent_id": AGENTS.index(target) + 1,
+        "threat_type": rng.choice(["Task Replay", "Agent Card Spoofing", "Message Schema Violation"]),
+        "severity": rng.choices(SEVERITIES, weights=(6, 3, 1))[0],
+        "protocol_layer": rng.choice(["Layer 2", "Layer 3", "Layer 4", "Layer 7"]),
+        "description": "동일 Task ID 재요청 패턴 확인 (task-424242) - 재전송 차단 정책 적용 대상",
+    }
+
+
+def subscribe_all(broadcaster, count: int, filtered: float, rng: random.Random):
+    for index in range(count):
+        filters = {}
+        if rng.random() < filtered:
+            if index % 2:
+                filters["severity"] = frozenset(["높음"])
+            else:
+                filters["agent"] = frozenset([rng.choice(AGENTS)])
+        broadcaster.subscribe(filters=filters)
+
+
+def fanout(subscribers: int, events: int, filtered: float):
+    from broadcaster import EventBroadcaster
+
+    rng = random.Random(7)
+    alerts = [make_alert(rng, index + 1) for index in range(events)]
+    broadcaster = EventBroadcaster(buffer_size=events)
+    subscribe_all(broadcaster, subscribers, filtered, rng)
+    everyone = broadcaster._subscribers
+
+    started = time.perf_counter()
+    old_bytes = 0
+    for alert in alerts:
+        for _ in everyone:
+            old_bytes += len(f"id: {alert['id']}\ndata: {json.dumps(alert, ensure_ascii=False)}\n\n")
+    old_us = (time.perf_counter() - started) / events * 1e6
+
+    started = time.perf_counter()
+    for alert in alerts:
+        broadcaster.publish(alert)
+    new_bytes = sum(len(event.frame) for subscriber in everyone for event in subscriber.drain())
+    new_us = (time.perf_counter() - started) / events * 1e6
+
+    print(
+        f"{subscribers:>11,}{filtered:>9.0%}{old_us:>13.0f}us{new_us:>12.0f}us"
+        f"{old_bytes / events / 1024:>12,.0f}KB{new_bytes / events / 1024:>11,.0f}KB"
+    )
+
+
+def burst(app, count: int, batch: bool) -> Tuple[int, int]:
+    rng = random.Random(3)
+    subscriber, backlog, complete = app.broadcaster.subscribe()
+    stream = app.event_stream(subscriber, backlog, complete, batch)
+    next(stream)
+
+    def produce():
+        for index in range(count):
+            app.broadcaster.publish(make_alert(rng, 1_000_000 + index))
+            time.sleep(1 / count)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    writes = received = 0
+    while received + subscriber.dropped < count:
+        chunk = next(stream)
+        writes += 1
+        received += chunk.count('{"id": ')
+    producer.join()
+    stream.close()
+    return writes, subscriber.dropped
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--filtered", type=float, default=0.8, help="share of subscribers with a filter")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=1000, help="alerts published within one second")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    print(f"{'subscribers':>11}{'filtered':>9}{'old/event':>15}{'new/event':>14}{'old bytes':>14}{'new bytes':>13}")
+    for subscribers in args.subscribers:
+        fanout(subscribers, min(args.events, 2_000_000 // subscribers), args.filtered)
+
+    directory = tempfile.mkdtemp(prefix="a2a-sse-")
+    os.environ["A2A_DATABASE_PATH"] = os.path.join(directory, "bench.db")
+    import app
+
+    print(f"\nburst of {args.burst} alerts in 1s to one stream")
+    for fps in (0.0, app.SSE_MAX_FRAMES_PER_SECOND):
+        app.SSE_MAX_FRAMES_PER_SECOND = fps
+        for batch in (False, True):
+            writes, dropped = burst(app, args.burst, batch)
+            label = f"max {fps:g} fps" if fps else "unpaced"
+            print(f"  {label:<12} batch={'on ' if batch else 'off'}  {writes:>5} writes  {dropped:>5} dropped")
+
+
+if __name__ == "__main__":
+    main()
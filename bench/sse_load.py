@@ -0,0 +1,184 @@
+"""SSE fan-out load benchmark: WSGI (werkzeug, threaded) vs. ASGI (uvicorn).
+
+For each level of concurrent ``/stream`` clients it reports the server's RSS
+and the p50/p99 latency of ``/api/overview`` measured while those clients are
+connected.
+
+    python bench/sse_load.py --levels 0 100 500 1000 --mode wsgi asgi
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": [
+        sys.executable,
+        "-c",
+        "import sys, app; app.app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True, debug=False)",
+    ],
+    "asgi": [
+        sys.executable,
+        "-c",
+        "import sys, uvicorn; uvicorn.run('asgi:app', host='127.0.0.1', port=int(sys.argv[1]), "
+        "log_level='warning', backlog=4096)",
+    ],
+}
+
+
+def rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as handle:
+        for line in handle:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def thread_count(pid: int) -> int:
+    return len(os.listdir(f"/proc/{pid}/task"))
+
+
+async def http_get(port: int, path: str) -> float:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    await reader.read()
+    writer.close()
+    return time.perf_counter() - start
+
+
+async def open_stream(port: int, received: List[int]):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /stream HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+
+    async def consume():
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return
+            received[0] += chunk.count(b"\ndata: ")
+
+    return writer, asyncio.ensure_future(consume())
+
+
+async def wait_for_server(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            await http_get(port, "/api/stream/stats")
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def measure(port: int, requests: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            latencies.append(await http_get(port, "/api/overview"))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode: str, levels: List[int], port: int, requests: int, concurrency: int, settle: float):
+    workdir = tempfile.mkdtemp(prefix="a2a-bench-")
+    db_path = os.path.join(workdir, "a2a_demo.db")
+    source_db = os.path.join(ROOT, "a2a_demo.db")
+    if os.path.exists(source_db):
+        shutil.copy(source_db, db_path)
+    env = dict(os.environ, A2A_DATABASE_PATH=db_path, PYTHONPATH=ROOT)
+    server = subprocess.Popen(
+        SERVERS[mode] + [str(port)], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    streams = []
+    received = [0]
+    rows = []
+    try:
+        await wait_for_server(port)
+        baseline_rss = rss_kib(server.pid)
+        for level in levels:
+            while len(streams) < level:
+                batch = min(100, level - len(streams))
+                streams.extend(await asyncio.gather(*(open_stream(port, received) for _ in range(batch))))
+            await asyncio.sleep(settle)
+            latencies = await measure(port, requests, concurrency)
+            rss = rss_kib(server.pid)
+            rows.append(
+                {
+                    "mode": mode,
+                    "clients": level,
+                    "rss_mib": rss / 1024,
+                    "kib_per_client": (rss - baseline_rss) / level if level else 0.0,
+                    "threads": thread_count(server.pid),
+                    "p50_ms": statistics.median(latencies) * 1000,
+                    "p99_ms": percentile(latencies, 99) * 1000,
+                }
+            )
+    finally:
+        for writer, task in streams:
+            task.cancel()
+            writer.close()
+        await asyncio.sleep(0.5)
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rows, received[0]
+
+
+def print_rows(rows):
+    print(f"{'mode':<6}{'clients':>9}{'rss MiB':>10}{'KiB/client':>12}{'threads':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for row in rows:
+        print(
+            f"{row['mode']:<6}{row['clients']:>9}{row['rss_mib']:>10.1f}{row['kib_per_client']:>12.1f}"
+            f"{row['threads']:>9}{row['p50_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", nargs="+", choices=sorted(SERVERS), default=["wsgi", "asgi"])
+    parser.add_argument("--levels", nargs="+", type=int, default=[0, 50, 200, 500])
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--settle", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    all_rows = []
+    for mode in args.mode:
+        rows, received = asyncio.run(
+            run_mode(mode, sorted(args.levels), args.port, args.requests, args.concurrency, args.settle)
+        )
+        all_rows.extend(rows)
+        print(f"[{mode}] SSE frames received across clients: {received}", file=sys.stderr)
+    print_rows(all_rows)
+
+
+if __name__ == "__main__":
+    main()
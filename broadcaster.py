@@ -0,0 +1,362 @@
+import asyncio
+import itertools
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Subscription filter name -> event fields it is matched against.
+FILTER_FIELDS = {
+    "severity": ("severity",),
+    "threat_type": ("threat_type",),
+    "protocol_layer": ("protocol_layer",),
+    "agent": ("source_agent", "target_agent", "source_agent_id", "target_agent_id"),
+}
+Filters = Dict[str, FrozenSet[str]]
+
+
+def encode_json(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+class Event:
+    """A published event with its JSON text and SSE frame, encoded once and shared by every subscriber.
+
+    ``seq`` is the broadcaster's publish sequence; the SSE ``id`` is
+    ``<instance>-<seq>`` so a Last-Event-ID from another process or an
+    earlier run is recognized as foreign.
+    """
+
+    __slots__ = ("seq", "id", "data", "text", "frame")
+
+    def __init__(self, data: dict, text: str, seq: int, instance: str):
+        self.seq = seq
+        self.id = f"{instance}-{seq}"
+        self.data = data
+        self.text = text
+        self.frame = f"id: {self.id}\ndata: {text}\n\n"
+
+
+def encode_frames(events: List[Event], batch: bool = False) -> str:
+    """SSE text for ``events``: one message each, or with ``batch`` a single ``batch`` message holding a JSON array."""
+    if not batch or len(events) == 1:
+        return "".join(event.frame for event in events)
+    return f"id: {events[-1].id}\nevent: batch\ndata: [" + ",".join(event.text for event in events) + "]\n\n"
+
+
+def event_keys(data: dict, name: str) -> Set[str]:
+    return {str(data[field]) for field in FILTER_FIELDS[name] if data.get(field) is not None}
+
+
+class Subscriber:
+    """One SSE client: a bounded ring buffer that drops its oldest event when full.
+
+    ``filters`` maps ``FILTER_FIELDS`` names to accepted values; an event is
+    delivered when every named filter matches (empty means everything).
+    """
+
+    def __init__(
+        self,
+        subscriber_id: int,
+        buffer_size: int,
+        remote_addr: Optional[str] = None,
+        filters: Optional[Filters] = None,
+    ):
+        self.id = subscriber_id
+        self.remote_addr = remote_addr
+        self.filters: Filters = {name: values for name, values in (filters or {}).items() if values}
+        self.connected_at = time.time()
+        self.buffer: Deque[Event] = deque(maxlen=buffer_size)
+        self.delivered = 0
+        self.dropped = 0
+        self.last_delivery: Optional[float] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def accepts(self, data: dict) -> bool:
+        return all(event_keys(data, name) & values for name, values in self.filters.items())
+
+    def push(self, event: Event):
+        with self._lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(event)
+        self._wake()
+
+    def _wake(self):
+        self._ready.set()
+
+    def drain(self) -> List[Event]:
+        with self._lock:
+            items = list(self.buffer)
+            self.buffer.clear()
+            self._ready.clear()
+        if items:
+            self.delivered += len(items)
+            self.last_delivery = time.time()
+        return items
+
+    def wait(self, timeout: Optional[float] = None) -> List[Event]:
+        self._ready.wait(timeout)
+        return self.drain()
+
+    @property
+    def lag(self) -> int:
+        return len(self.buffer)
+
+    def stats(self) -> Dict:
+        return {
+            "id": self.id,
+            "remote_addr": self.remote_addr,
+            "filters": {name: sorted(values) for name, values in self.filters.items()},
+            "connected_at": self.connected_at,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": self.lag,
+            "buffer_size": self.buffer.maxlen,
+            "last_delivery": self.last_delivery,
+        }
+
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber whose wake-up is delivered to an asyncio loop instead of a thread."""
+
+    def __init__(
+        self,
+        subscriber_id: int,
+        buffer_size: int,
+        remote_addr: Optional[str] = None,
+        filters: Optional[Filters] = None,
+        loop=None,
+    ):
+        super().__init__(subscriber_id, buffer_size, remote_addr=remote_addr, filters=filters)
+        self.loop = loop or asyncio.get_running_loop()
+        self.ready = asyncio.Event()
+        self._scheduled = False
+
+    def _wake(self):
+        if self._scheduled:
+            return
+        self._scheduled = True
+        try:
+            self.loop.call_soon_threadsafe(self.ready.set)
+        except RuntimeError:
+            pass
+
+    def drain(self) -> List[Event]:
+        self._scheduled = False
+        self.ready.clear()
+        return super().drain()
+
+
+class ReplayLog:
+    """Bounded window of recently published events, ordered by their ``seq``."""
+
+    def __init__(self, size: int = 1000):
+        self.events: Deque[Event] = deque(maxlen=size)
+        self.replayed = 0
+        self.truncated = 0
+
+    def append(self, event: Event):
+        self.events.append(event)
+
+    @property
+    def first_seq(self) -> Optional[int]:
+        return self.events[0].seq if self.events else None
+
+    @property
+    def last_seq(self) -> Optional[int]:
+        return self.events[-1].seq if self.events else None
+
+    def since(self, last_seq: int) -> Tuple[List[Event], bool]:
+        """Return events published after ``last_seq`` and whether the window still reaches back to it."""
+        missed: List[Event] = []
+        for event in reversed(self.events):
+            if event.seq <= last_seq:
+                break
+            missed.append(event)
+        missed.reverse()
+        complete = not self.events or self.events[0].seq <= last_seq + 1
+        self.replayed += len(missed)
+        if not complete:
+            self.truncated += 1
+        return missed, complete
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self.events),
+            "capacity": self.events.maxlen,
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+            "replayed": self.replayed,
+            "truncated": self.truncated,
+        }
+
+
+class SubscriptionIndex:
+    """Immutable predicate index over a subscriber set.
+
+    Unfiltered subscribers match every event. For filtered ones, each
+    ``(filter, value)`` pair has a posting list; an event looks up only its own
+    values and a subscriber matches once all of its filters were hit, so the
+    cost follows the number of candidates rather than the number of clients.
+    ``added``/``removed`` return a new index sharing every untouched list.
+    """
+
+    def __init__(
+        self,
+        unfiltered: Tuple[Subscriber, ...] = (),
+        postings: Optional[Dict[str, Dict[str, Tuple[Subscriber, ...]]]] = None,
+    ):
+        self.unfiltered = unfiltered
+        self.postings = postings or {}
+
+    def added(self, subscriber: Subscriber) -> "SubscriptionIndex":
+        if not subscriber.filters:
+            return SubscriptionIndex(self.unfiltered + (subscriber,), self.postings)
+        postings = dict(self.postings)
+        for name, values in subscriber.filters.items():
+            lists = postings[name] = dict(postings.get(name, {}))
+            for value in values:
+                lists[value] = lists.get(value, ()) + (subscriber,)
+        return SubscriptionIndex(self.unfiltered, postings)
+
+    def removed(self, subscriber: Subscriber) -> "SubscriptionIndex":
+        if not subscriber.filters:
+            return SubscriptionIndex(tuple(item for item in self.unfiltered if item is not subscriber), self.postings)
+        postings = dict(self.postings)
+        for name, values in subscriber.filters.items():
+            lists = dict(postings.get(name, {}))
+            for value in values:
+                remaining = tuple(item for item in lists.get(value, ()) if item is not subscriber)
+                if remaining:
+                    lists[value] = remaining
+                else:
+                    lists.pop(value, None)
+            if lists:
+                postings[name] = lists
+            else:
+                postings.pop(name, None)
+        return SubscriptionIndex(self.unfiltered, postings)
+
+    def match(self, data: dict) -> List[Subscriber]:
+        matched = list(self.unfiltered)
+        if not self.postings:
+            return matched
+        hits: Dict[Subscriber, int] = {}
+        for name, lists in self.postings.items():
+            seen: Set[Subscriber] = set()
+            for key in event_keys(data, name):
+                for subscriber in lists.get(key, ()):
+                    if subscriber not in seen:
+                        seen.add(subscriber)
+                        hits[subscriber] = hits.get(subscriber, 0) + 1
+        matched.extend(subscriber for subscriber, count in hits.items() if count == len(subscriber.filters))
+        return matched
+
+
+class EventBroadcaster:
+    """Fans every published event out to the subscribers whose filters accept it.
+
+    Each event is encoded once (``encode`` gives its JSON text) into an
+    ``Event`` that every subscriber buffer and the replay log share. The
+    subscriber set and its ``SubscriptionIndex`` are replaced (copy-on-write)
+    on subscribe/unsubscribe so that delivery happens outside the registry lock.
+    Events are numbered in publish order and kept in a replay log so
+    reconnecting clients can resume from ``Last-Event-ID``; arrival order, not
+    the payload ``id``, decides what a client has seen.
+    """
+
+    def __init__(self, buffer_size: int = 100, replay_size: int = 1000, encode: Callable[[dict], str] = encode_json):
+        self.buffer_size = buffer_size
+        self.encode = encode
+        self.published = 0
+        self.matched = 0
+        self.replay = ReplayLog(replay_size)
+        self.instance = secrets.token_hex(4)
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers: Tuple[Subscriber, ...] = ()
+        self._index = SubscriptionIndex()
+
+    def subscribe(
+        self,
+        remote_addr: Optional[str] = None,
+        last_event_id: Optional[str] = None,
+        subscriber_cls=Subscriber,
+        filters: Optional[Filters] = None,
+        **kwargs,
+    ) -> Tuple[Subscriber, List[Event], bool]:
+        """Register a subscriber and return it with the events it missed since ``last_event_id``.
+
+        Registration and the replay scan happen under the same lock as the
+        replay-log append in ``publish``, so every event is seen exactly once:
+        either in the backlog or in the subscriber's buffer. An id issued by
+        another broadcaster gives an empty, incomplete backlog (resync).
+        """
+        subscriber = subscriber_cls(
+            next(self._ids), self.buffer_size, remote_addr=remote_addr, filters=filters, **kwargs
+        )
+        backlog: List[Event] = []
+        complete = True
+        with self._lock:
+            self._subscribers = self._subscribers + (subscriber,)
+            self._index = self._index.added(subscriber)
+            if last_event_id is not None:
+                last_seq = self.sequence_of(last_event_id)
+                if last_seq is None:
+                    complete = False
+                else:
+                    backlog, complete = self.replay.since(last_seq)
+        backlog = [event for event in backlog if subscriber.accepts(event.data)]
+        return subscriber, backlog, complete
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers = tuple(item for item in self._subscribers if item is not subscriber)
+            self._index = self._index.removed(subscriber)
+
+    def sequence_of(self, event_id: str) -> Optional[int]:
+        instance, _, seq = event_id.rpartition("-")
+        return int(seq) if instance == self.instance and seq.isdigit() else None
+
+    def prime(self, events: Iterable[dict]):
+        """Seed the replay log (oldest first) without delivering anything."""
+        with self._lock:
+            for data in events:
+                self.replay.append(Event(data, self.encode(data), next(self._seq), self.instance))
+
+    def publish(self, data: dict):
+        text = self.encode(data)
+        with self._lock:
+            event = Event(data, text, next(self._seq), self.instance)
+            self.published += 1
+            self.replay.append(event)
+            subscribers = self._index.match(data)
+            self.matched += len(subscribers)
+        for subscriber in subscribers:
+            subscriber.push(event)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> Dict:
+        subscribers = [item.stats() for item in self._subscribers]
+        subscribers.sort(key=lambda item: (item["lag"], item["dropped"]), reverse=True)
+        return {
+            "instance": self.instance,
+            "published": self.published,
+            "matched": self.matched,
+            "subscriber_count": len(subscribers),
+            "filtered_subscribers": sum(1 for item in subscribers if item["filters"]),
+            "buffer_size": self.buffer_size,
+            "total_dropped": sum(item["dropped"] for item in subscribers),
+            "replay": self.replay.stats(),
+            "subscribers": subscribers,
+        }
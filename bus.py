@@ -0,0 +1,320 @@
+import fcntl
+import json
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+Handler = Callable[[str, object], None]
+HEADER = struct.Struct("!I")
+
+
+def encode_frame(topic: str, payload: object) -> bytes:
+    body = json.dumps({"topic": topic, "payload": payload}, ensure_ascii=False, separators=(",", ":")).encode()
+    return HEADER.pack(len(body)) + body
+
+
+def split_frames(buffer: bytearray) -> Iterator[bytes]:
+    """Pop every complete frame (header included) off the front of ``buffer``."""
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        (length,) = HEADER.unpack_from(buffer, offset)
+        if len(buffer) - offset - HEADER.size < length:
+            break
+        end = offset + HEADER.size + length
+        yield bytes(buffer[offset:end])
+        offset = end
+    del buffer[:offset]
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive ``flock`` on ``path`` for the duration (serializes startup across workers)."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class LocalBus:
+    """Single-process bus: this process is always the leader and there are no peers to notify."""
+
+    is_leader = True
+
+    def __init__(self):
+        self.published = 0
+
+    def start(self, handler: Handler):
+        self.handler = handler
+
+    def publish(self, topic: str, payload: object):
+        self.published += 1
+
+    def stop(self):
+        pass
+
+    def stats(self) -> Dict:
+        return {"transport": "local", "leader": True, "published": self.published}
+
+
+class Peer:
+    __slots__ = ("sock", "inbox", "outbox")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+
+
+class SocketBus:
+    """Fans events out to every worker process on the host over a Unix-domain socket hub.
+
+    Workers race for an ``flock`` on ``lock_path``; the winner is the leader:
+    it hosts the hub on ``socket_path`` and is the only process that should run
+    singleton jobs (the event generator, scoring, retention). Every other
+    worker connects as a client. ``publish`` sends a frame to all *other*
+    workers (the caller applies its own event locally) and ``handler`` is
+    called for every frame from a peer, on the bus thread. The lock is released
+    by the kernel when the leader dies; a client that loses the hub tries to
+    take over, otherwise reconnects, and frames published in the meantime are
+    queued up to ``pending_size``. A client whose hub-side backlog exceeds
+    ``max_backlog`` bytes is disconnected rather than stalling the hub.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        lock_path: str,
+        pending_size: int = 10000,
+        max_backlog: int = 64 * 1024 * 1024,
+        retry_interval: float = 0.2,
+    ):
+        self.socket_path = socket_path
+        self.lock_path = lock_path
+        self.max_backlog = max_backlog
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self._handler: Optional[Handler] = None
+        self._lock_fd: Optional[int] = None
+        self._client: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._pending: Deque[bytes] = deque(maxlen=pending_size)
+        self._peers: Dict[int, Peer] = {}
+        self._peers_lock = threading.Lock()
+        self._selector: Optional[selectors.DefaultSelector] = None
+        self._wakeup: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.slow_disconnects = 0
+        self.elected_at: Optional[float] = None
+
+    def start(self, handler: Handler):
+        self._handler = handler
+        if not self._try_lead():
+            self._connect()
+        threading.Thread(target=self._run, name="event-bus", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._wakeup is not None:
+            self._wakeup.send(b"\0")
+        if self._client is not None:
+            self._client.close()
+
+    def publish(self, topic: str, payload: object):
+        frame = encode_frame(topic, payload)
+        self.published += 1
+        if self.is_leader:
+            self._broadcast(frame, None)
+            return
+        with self._send_lock:
+            if self._client is not None:
+                try:
+                    self._client.sendall(frame)
+                    return
+                except OSError:
+                    self._client.close()
+                    self._client = None
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(frame)
+
+    def _try_lead(self) -> bool:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(128)
+        server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(server, selectors.EVENT_READ, "accept")
+        self._wakeup, wake_reader = socket.socketpair()
+        wake_reader.setblocking(False)
+        self._selector.register(wake_reader, selectors.EVENT_READ, "wakeup")
+        with self._send_lock:
+            pending, self._pending = list(self._pending), deque(maxlen=self._pending.maxlen)
+            self.is_leader = True
+            self.elected_at = time.time()
+        for frame in pending:
+            self._broadcast(frame, None)
+        return True
+
+    def _connect(self) -> bool:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+        with self._send_lock:
+            try:
+                while self._pending:
+                    sock.sendall(self._pending[0])
+                    self._pending.popleft()
+            except OSError:
+                sock.close()
+                return False
+            self._client = sock
+        return True
+
+    def _deliver(self, frame: bytes):
+        self.received += 1
+        try:
+            message = json.loads(frame[HEADER.size :])
+            self._handler(message["topic"], message["payload"])
+        except Exception:
+            self.errors += 1
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self.is_leader:
+                self._serve()
+                return
+            sock = self._client
+            if sock is None:
+                if not self._try_lead() and not self._connect():
+                    time.sleep(self.retry_interval)
+                else:
+                    self.reconnects += 1
+                continue
+            buffer = bytearray()
+            try:
+                while True:
+                    chunk = sock.recv(256 * 1024)
+                    if not chunk:
+                        break
+                    buffer.extend(chunk)
+                    for frame in split_frames(buffer):
+                        self._deliver(frame)
+            except OSError:
+                pass
+            with self._send_lock:
+                if self._client is sock:
+                    self._client = None
+            sock.close()
+
+    def _broadcast(self, frame: bytes, source: Optional[int]):
+        with self._peers_lock:
+            for key, peer in list(self._peers.items()):
+                if key == source:
+                    continue
+                if len(peer.outbox) > self.max_backlog:
+                    self.slow_disconnects += 1
+                    self._drop_peer(key)
+                    continue
+                if not peer.outbox:
+                    self._selector.modify(peer.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, key)
+                peer.outbox.extend(frame)
+        if self._wakeup is not None and source is None:
+            self._wakeup.send(b"\0")
+
+    def _drop_peer(self, key: int):
+        peer = self._peers.pop(key)
+        self._selector.unregister(peer.sock)
+        peer.sock.close()
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            for selected, events in self._selector.select(timeout=1.0):
+                if selected.data == "accept":
+                    sock, _ = selected.fileobj.accept()
+                    sock.setblocking(False)
+                    with self._peers_lock:
+                        self._peers[sock.fileno()] = Peer(sock)
+                        self._selector.register(sock, selectors.EVENT_READ, sock.fileno())
+                    continue
+                if selected.data == "wakeup":
+                    try:
+                        selected.fileobj.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                key = selected.data
+                with self._peers_lock:
+                    peer = self._peers.get(key)
+                if peer is None:
+                    continue
+                try:
+                    if events & selectors.EVENT_WRITE:
+                        with self._peers_lock:
+                            sent = peer.sock.send(peer.outbox)
+                            del peer.outbox[:sent]
+                            if not peer.outbox:
+                                self._selector.modify(peer.sock, selectors.EVENT_READ, key)
+                    if events & selectors.EVENT_READ:
+                        chunk = peer.sock.recv(256 * 1024)
+                        if not chunk:
+                            raise ConnectionResetError
+                        peer.inbox.extend(chunk)
+                        frames = list(split_frames(peer.inbox))
+                        if frames:
+                            self._broadcast(b"".join(frames), key)
+                        for frame in frames:
+                            self._deliver(frame)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    with self._peers_lock:
+                        if key in self._peers:
+                            self._drop_peer(key)
+
+    def stats(self) -> Dict:
+        with self._peers_lock:
+            backlog = sum(len(peer.outbox) for peer in self._peers.values())
+            peers = len(self._peers)
+        return {
+            "transport": "unix",
+            "socket": self.socket_path,
+            "leader": self.is_leader,
+            "elected_at": self.elected_at,
+            "peers": peers,
+            "backlog_bytes": backlog,
+            "connected": self.is_leader or self._client is not None,
+            "published": self.published,
+            "received": self.received,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "slow_disconnects": self.slow_disconnects,
+        }
@@ -0,0 +1,124 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, request
+
+
+class CacheEntry:
+    __slots__ = ("body", "mimetype", "etag")
+
+    def __init__(self, body: bytes, mimetype: str, etag: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = etag
+
+
+class ResponseCache:
+    """Caches read-only JSON responses until one of their data topics is written.
+
+    Every write path bumps the version of the topics it touches (``packets``,
+    ``alerts``, ``agents``). A response is keyed by endpoint and normalized
+    query arguments and is valid as long as the versions of the topics it
+    depends on are unchanged; its ETag is derived from those versions alone, so
+    a matching ``If-None-Match`` is answered with 304 before the view runs.
+    The counters are per process and restart at zero, so the ETag also mixes
+    in a random ``instance`` id: a tag issued by another worker or before a
+    restart never matches.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.instance = secrets.token_hex(8)
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def invalidate(self, *topics: str):
+        with self._lock:
+            for topic in topics:
+                self._versions[topic] = self._versions.get(topic, 0) + 1
+            self.invalidations += 1
+
+    def versions(self, topics: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(topic, 0) for topic in topics)
+
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, *topics: str, max_age: Optional[int] = None, state: Optional[Callable[[], Tuple]] = None):
+        """Decorate a view whose output depends only on ``topics`` (and on time, if ``max_age`` is set).
+
+        ``state`` replaces the topic versions in the key for views that serve
+        a snapshot lagging behind its topics; it returns the versions the
+        snapshot was built from.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key_state = state() if state else self.versions(topics)
+                if max_age:
+                    key_state += (int(time.time() // max_age),)
+                query = tuple(sorted((key, value) for key, value in request.args.items(multi=True) if value))
+                key = (request.endpoint, tuple(sorted(kwargs.items())), query, key_state)
+                etag = hashlib.blake2b(repr((self.instance, key)).encode(), digest_size=8).hexdigest()
+
+                if request.if_none_match.contains_weak(etag):
+                    with self._lock:
+                        self.not_modified += 1
+                    return Response(status=304, headers={"ETag": f'"{etag}"', "Cache-Control": "no-cache"})
+
+                entry = self.get(key)
+                if entry is None:
+                    response = view(*args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    entry = CacheEntry(response.get_data(), response.mimetype, etag)
+                    self.put(key, entry)
+                    with self._lock:
+                        self.misses += 1
+                else:
+                    with self._lock:
+                        self.hits += 1
+
+                return Response(
+                    entry.body,
+                    mimetype=entry.mimetype,
+                    headers={"ETag": f'"{entry.etag}"', "Cache-Control": "no-cache"},
+                )
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "versions": dict(self._versions),
+            }
@@ -0,0 +1,348 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+STRING_COLUMNS = ("severity", "protocol_layer", "threat_type")
+ID_COLUMNS = ("source_agent_id", "target_agent_id")
+SOURCE_COLUMNS = ("id", "ts") + STRING_COLUMNS + ID_COLUMNS
+TIME_BUCKETS = ("hour", "day", "week", "month")
+GROUP_KEYS = TIME_BUCKETS + STRING_COLUMNS + ID_COLUMNS
+EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_values(ts: np.ndarray, bucket: str) -> np.ndarray:
+    if bucket == "hour":
+        return ts // HOUR_MS
+    if bucket == "day":
+        return ts // DAY_MS
+    if bucket == "week":
+        return (ts // DAY_MS + 3) // 7
+    return ts.astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+
+
+def bucket_label(value: int, bucket: str) -> str:
+    if bucket == "hour":
+        return (EPOCH + timedelta(hours=value)).strftime("%Y-%m-%dT%H:00")
+    if bucket == "day":
+        return (EPOCH + timedelta(days=value)).strftime("%Y-%m-%d")
+    if bucket == "week":
+        return (EPOCH + timedelta(days=value * 7 - 3)).strftime("%Y-%m-%d")
+    return f"{1970 + value // 12:04d}-{value % 12 + 1:02d}"
+
+
+def code_dtype(size: int):
+    return np.uint8 if size <= 256 else np.uint16 if size <= 65536 else np.uint32
+
+
+def group_counts(
+    parts: List[np.ndarray], weights: Optional[np.ndarray] = None
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Distinct rows of the equal-length integer ``parts`` with their (weighted) counts, sorted by key.
+
+    Keys are packed into one ``int64`` by mixed radix over each part's value
+    range; small key spaces are counted with ``bincount``, larger ones with
+    ``unique``.
+    """
+    offsets = [int(values.min()) for values in parts]
+    sizes = [int(values.max()) - offset + 1 for values, offset in zip(parts, offsets)]
+    if float(np.prod(sizes, dtype=float)) >= 2**62:
+        stacked, inverse = np.unique(np.stack(parts, axis=1), axis=0, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=weights, minlength=len(stacked))
+        return list(stacked.T), counts.astype(np.int64)
+    combined = np.zeros(len(parts[0]), dtype=np.int64)
+    for values, offset, size in zip(parts, offsets, sizes):
+        combined = combined * size + (values - offset)
+    total = int(np.prod(sizes))
+    if total <= max(4 * len(combined), 1 << 16):
+        counts = np.bincount(combined, weights=weights, minlength=total)
+        unique = np.flatnonzero(counts)
+        counts = counts[unique]
+    else:
+        unique, inverse = np.unique(combined, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights, minlength=len(unique))
+    columns = []
+    for offset, size in zip(reversed(offsets), reversed(sizes)):
+        columns.append(unique % size + offset)
+        unique = unique // size
+    columns.reverse()
+    return columns, counts.astype(np.int64)
+
+
+class Segment:
+    """Column arrays for one day of packets or alerts.
+
+    Strings are dictionary-encoded into the narrowest unsigned type, ``ts`` is
+    stored as ``uint32`` milliseconds past ``base_ts`` and agent ids as
+    ``int32`` with ``-1`` for unknown agents, about 16 bytes per row.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_ts: int,
+        max_id: int,
+        columns: Dict[str, np.ndarray],
+        dictionaries: Dict[str, List[str]],
+    ):
+        self.name = name
+        self.base_ts = base_ts
+        self.max_id = max_id
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.rows = len(columns["ts"])
+        self.min_ts = base_ts + int(columns["ts"].min()) if self.rows else base_ts
+        self.max_ts = base_ts + int(columns["ts"].max()) if self.rows else base_ts
+        self._luts: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def build(cls, name: str, rows: Iterable[Sequence], base_ts: int) -> "Segment":
+        """Encode ``(id, ts, severity, protocol_layer, threat_type, source_agent_id, target_agent_id)`` rows."""
+        values = list(zip(*rows)) or [()] * len(SOURCE_COLUMNS)
+        by_name = dict(zip(SOURCE_COLUMNS, values))
+        columns: Dict[str, np.ndarray] = {
+            "ts": (np.fromiter(by_name["ts"], dtype=np.int64, count=len(by_name["ts"])) - base_ts).astype(np.uint32)
+        }
+        dictionaries: Dict[str, List[str]] = {}
+        for column in STRING_COLUMNS:
+            lookup: Dict[str, int] = {}
+            codes = [lookup.setdefault(value, len(lookup)) for value in by_name[column]]
+            columns[column] = np.array(codes, dtype=code_dtype(len(lookup)))
+            dictionaries[column] = list(lookup)
+        for column in ID_COLUMNS:
+            columns[column] = np.array([-1 if value is None else value for value in by_name[column]], dtype=np.int32)
+        return cls(name, base_ts, max(by_name["id"], default=0), columns, dictionaries)
+
+    def extend(self, other: "Segment") -> "Segment":
+        """Return a segment holding this one's rows followed by ``other``'s (same ``base_ts``)."""
+        columns = {"ts": np.concatenate([self.columns["ts"], other.columns["ts"]])}
+        dictionaries: Dict[str, List[str]] = {}
+        for column in STRING_COLUMNS:
+            merged = list(self.dictionaries[column])
+            index = {value: code for code, value in enumerate(merged)}
+            for value in other.dictionaries[column]:
+                if value not in index:
+                    index[value] = len(merged)
+                    merged.append(value)
+            remap = np.array([index[value] for value in other.dictionaries[column]], dtype=np.int64)
+            dtype = code_dtype(len(merged))
+            tail = remap[other.columns[column]] if len(remap) else np.zeros(0, dtype=np.int64)
+            columns[column] = np.concatenate([self.columns[column].astype(dtype), tail.astype(dtype)])
+            dictionaries[column] = merged
+        for column in ID_COLUMNS:
+            columns[column] = np.concatenate([self.columns[column], other.columns[column]])
+        return Segment(self.name, self.base_ts, max(self.max_id, other.max_id), columns, dictionaries)
+
+    def ts(self) -> np.ndarray:
+        return self.columns["ts"].astype(np.int64) + self.base_ts
+
+    def lut(self, column: str, registry: "Dictionary") -> np.ndarray:
+        values = self.dictionaries[column]
+        lut = self._luts.get(column)
+        if lut is None or len(lut) != len(values):
+            lut = self._luts[column] = np.array([registry.code(column, value) for value in values], dtype=np.int64)
+        return lut
+
+    def save(self, directory: str):
+        staging = directory + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for column, array in self.columns.items():
+            np.save(os.path.join(staging, f"{column}.npy"), array)
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump(
+                {"rows": self.rows, "base_ts": self.base_ts, "max_id": self.max_id, "dictionaries": self.dictionaries},
+                handle,
+                ensure_ascii=False,
+            )
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+
+    @classmethod
+    def open(cls, directory: str) -> "Segment":
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        columns = {
+            column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode="r")
+            for column in ("ts",) + STRING_COLUMNS + ID_COLUMNS
+        }
+        return cls(os.path.basename(directory), meta["base_ts"], meta["max_id"], columns, meta["dictionaries"])
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.columns.values())
+
+
+class Dictionary:
+    """Process-wide value -> code registry so segments with their own dictionaries can be grouped together."""
+
+    def __init__(self):
+        self.codes: Dict[str, Dict[str, int]] = {column: {} for column in STRING_COLUMNS}
+        self.values: Dict[str, List[str]] = {column: [] for column in STRING_COLUMNS}
+
+    def code(self, column: str, value: str) -> int:
+        codes = self.codes[column]
+        if value not in codes:
+            codes[value] = len(self.values[column])
+            self.values[column].append(value)
+        return codes[value]
+
+
+class ColumnStore:
+    """Columnar copy of packets and alerts for long-range analytics.
+
+    Closed days are exported once into ``<root>/<kind>/<YYYYMMDD>/`` as one
+    ``.npy`` file per column plus ``meta.json`` and memory-mapped on read;
+    days still being written are kept as in-memory live segments that grow by
+    the rows past their ``max_id``. ``aggregate`` runs the group-by per
+    segment with NumPy (a mixed-radix key and ``bincount``/``unique``) and
+    merges the small per-segment results.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.dictionary = Dictionary()
+        self.segments: Dict[str, Dict[str, Segment]] = {"packets": {}, "alerts": {}}
+        self.live: Dict[str, Dict[str, Segment]] = {"packets": {}, "alerts": {}}
+        self.exports = 0
+
+    def load(self):
+        for kind in self.segments:
+            directory = os.path.join(self.root, kind)
+            os.makedirs(directory, exist_ok=True)
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if name.endswith(".tmp"):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.exists(os.path.join(path, "meta.json")):
+                    self.segments[kind][name] = Segment.open(path)
+
+    def exported_max_id(self, kind: str, name: str) -> Optional[int]:
+        segment = self.segments[kind].get(name)
+        return segment.max_id if segment else None
+
+    def export(self, kind: str, name: str, rows: Iterable[Sequence], base_ts: int) -> Segment:
+        """Write a closed day to disk (replacing an older export) and serve it memory-mapped."""
+        path = os.path.join(self.root, kind, name)
+        Segment.build(name, rows, base_ts).save(path)
+        segment = Segment.open(path)
+        with self._lock:
+            self.segments[kind][name] = segment
+            self.live[kind].pop(name, None)
+            self.exports += 1
+        return segment
+
+    def live_max_id(self, kind: str, name: str) -> int:
+        segment = self.live[kind].get(name)
+        return segment.max_id if segment else 0
+
+    def append_live(self, kind: str, name: str, rows: Iterable[Sequence], base_ts: int):
+        segment = Segment.build(name, rows, base_ts)
+        if not segment.rows and name in self.live[kind]:
+            return
+        with self._lock:
+            current = self.live[kind].get(name)
+            self.live[kind][name] = current.extend(segment) if current else segment
+
+    def retain_live(self, kind: str, names: Iterable[str]):
+        keep = set(names)
+        with self._lock:
+            for name in [name for name in self.live[kind] if name not in keep]:
+                del self.live[kind][name]
+
+    def aggregate(
+        self,
+        kind: str,
+        group_by: Sequence[str],
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        where: Optional[Dict[str, object]] = None,
+    ) -> Tuple[List[Tuple], np.ndarray, Dict]:
+        """Count rows per distinct ``group_by`` key; returns ``(keys, counts, scan_stats)`` sorted by key."""
+        where = where or {}
+        with self._lock:
+            segments = list(self.segments[kind].values()) + [
+                segment for name, segment in self.live[kind].items() if name not in self.segments[kind]
+            ]
+            results = []
+            scanned = 0
+            used = 0
+            for segment in segments:
+                if not segment.rows:
+                    continue
+                if start_ts is not None and segment.max_ts < start_ts:
+                    continue
+                if end_ts is not None and segment.min_ts >= end_ts:
+                    continue
+                used += 1
+                scanned += segment.rows
+                result = self._aggregate_segment(segment, group_by, start_ts, end_ts, where)
+                if result is not None:
+                    results.append(result)
+        if results:
+            columns, counts = group_counts(
+                [np.concatenate([result[0][position] for result in results]) for position in range(len(group_by))],
+                np.concatenate([result[1] for result in results]),
+            )
+            ordered = zip(*(column.tolist() for column in columns))
+        else:
+            ordered, counts = [], np.zeros(0, dtype=np.int64)
+        keys = [tuple(self._decode(name, value) for name, value in zip(group_by, key)) for key in ordered]
+        return keys, counts, {"segments": used, "rows_scanned": scanned}
+
+    def _decode(self, name: str, value: int):
+        if name in STRING_COLUMNS:
+            return self.dictionary.values[name][value]
+        if name in ID_COLUMNS and value < 0:
+            return None
+        return value
+
+    def _aggregate_segment(self, segment: Segment, group_by, start_ts, end_ts, where):
+        mask = np.ones(segment.rows, dtype=bool)
+        ts = None
+        if (start_ts is not None and segment.min_ts < start_ts) or (end_ts is not None and segment.max_ts >= end_ts):
+            ts = segment.ts()
+            if start_ts is not None:
+                mask &= ts >= start_ts
+            if end_ts is not None:
+                mask &= ts < end_ts
+        for column, value in where.items():
+            if column in STRING_COLUMNS:
+                if value not in segment.dictionaries[column]:
+                    return None
+                mask &= segment.columns[column] == segment.dictionaries[column].index(value)
+            else:
+                mask &= segment.columns[column] == value
+        if not mask.any():
+            return None
+
+        parts = []
+        for name in group_by:
+            if name in TIME_BUCKETS:
+                ts = segment.ts() if ts is None else ts
+                values = bucket_values(ts[mask], name)
+            elif name in STRING_COLUMNS:
+                values = segment.lut(name, self.dictionary)[segment.columns[name][mask]]
+            else:
+                values = segment.columns[name][mask].astype(np.int64)
+            parts.append(values)
+        return group_counts(parts)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                kind: {
+                    "segments": len(self.segments[kind]),
+                    "rows": sum(segment.rows for segment in self.segments[kind].values()),
+                    "bytes": sum(segment.nbytes() for segment in self.segments[kind].values()),
+                    "live_segments": len(self.live[kind]),
+                    "live_rows": sum(segment.rows for segment in self.live[kind].values()),
+                }
+                for kind in self.segments
+            } | {"exports": self.exports}
@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip covers every browser
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".html", ".txt", ".map"}
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "application/x-ndjson"}
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best encoding the client accepts (``request.accept_encodings``), preferring brotli on ties."""
+    return accept_encodings.best_match(ENCODINGS)
+
+
+def brotli_quality(level: int) -> int:
+    return 11 if level >= 9 else 4
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """``level`` is a gzip level (1-9); brotli gets a quality of similar speed."""
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality(level))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after every chunk so clients still see rows as they are produced."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality(level))
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class Asset:
+    __slots__ = ("path", "mimetype", "etag", "bodies")
+
+    def __init__(self, path: str, mimetype: str, etag: str, bodies: Dict[Optional[str], bytes]):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.bodies = bodies
+
+
+class StaticAssets:
+    """Content-fingerprinted, precompressed copies of the ``static`` folder.
+
+    ``build`` reads every file once at startup, names it
+    ``<stem>.<hash>.<ext>`` and keeps the identity body plus gzip (level 9)
+    and brotli (quality 11) variants when they are meaningfully smaller. Since
+    a fingerprinted URL never changes content, responses are marked
+    ``immutable`` for a year and templates pick up new names on restart.
+    """
+
+    def __init__(self, folder: str, max_age: int = 365 * 24 * 3600):
+        self.folder = folder
+        self.max_age = max_age
+        self.urls: Dict[str, str] = {}
+        self.assets: Dict[str, Asset] = {}
+        self.served: Dict[Optional[str], int] = {}
+
+    def build(self):
+        urls: Dict[str, str] = {}
+        assets: Dict[str, Asset] = {}
+        for directory, _, files in os.walk(self.folder):
+            for filename in sorted(files):
+                path = os.path.relpath(os.path.join(directory, filename), self.folder).replace(os.sep, "/")
+                with open(os.path.join(directory, filename), "rb") as handle:
+                    data = handle.read()
+                digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+                stem, extension = os.path.splitext(path)
+                fingerprinted = f"{stem}.{digest}{extension}"
+                bodies: Dict[Optional[str], bytes] = {None: data}
+                if extension in COMPRESSIBLE_EXTENSIONS:
+                    for encoding in ENCODINGS:
+                        encoded = compress(data, encoding, 9)
+                        if len(encoded) < len(data) * 0.9:
+                            bodies[encoding] = encoded
+                mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                urls[path] = fingerprinted
+                assets[fingerprinted] = Asset(path, mimetype, digest, bodies)
+        self.urls, self.assets = urls, assets
+
+    def url_path(self, filename: str) -> Optional[str]:
+        return self.urls.get(filename)
+
+    def response(self, fingerprinted: str, accept_encodings, if_none_match) -> Optional[Response]:
+        asset = self.assets.get(fingerprinted)
+        if asset is None:
+            return None
+        headers = {
+            "ETag": f'"{asset.etag}"',
+            "Cache-Control": f"public, max-age={self.max_age}, immutable",
+            "Vary": "Accept-Encoding",
+        }
+        if if_none_match.contains_weak(asset.etag):
+            return Response(status=304, headers=headers)
+        encoding = accept_encodings.best_match([encoding for encoding in ENCODINGS if encoding in asset.bodies])
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        self.served[encoding] = self.served.get(encoding, 0) + 1
+        return Response(asset.bodies[encoding], mimetype=asset.mimetype, headers=headers)
+
+    def stats(self) -> Dict:
+        return {
+            "assets": len(self.assets),
+            "bytes": {
+                encoding or "identity": sum(
+                    len(asset.bodies.get(encoding, asset.bodies[None])) for asset in self.assets.values()
+                )
+                for encoding in (None,) + ENCODINGS
+            },
+            "served": {encoding or "identity": count for encoding, count in self.served.items()},
+        }
+
+
+class ResponseCompressor:
+    """Negotiated gzip/brotli for dynamic JSON, HTML and NDJSON responses.
+
+    Bodies under ``min_size`` bytes go out as-is (the headers would eat the
+    saving), SSE is never compressed, and streamed NDJSON is compressed
+    chunk by chunk. Responses carrying a strong ETag (the ``ResponseCache``
+    views) keep their encoded bodies in a small LRU so a cache hit is not
+    recompressed; their ETag becomes weak because the bytes differ per
+    encoding.
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 5, memo_entries: int = 256):
+        self.min_size = min_size
+        self.level = level
+        self.memo_entries = memo_entries
+        self._memo: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.streamed = 0
+        self.skipped = 0
+        self.memo_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def apply(self, response: Response, accept_encodings) -> Response:
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.iter_encoded(), encoding, self.level)
+            response.headers["Content-Encoding"] = encoding
+            response.headers.pop("Content-Length", None)
+            with self._lock:
+                self.streamed += 1
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            with self._lock:
+                self.skipped += 1
+            return response
+        etag, weak = response.get_etag()
+        key = (etag, encoding) if etag and not weak else None
+        with self._lock:
+            encoded = self._memo.get(key) if key else None
+            if encoded is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+        if encoded is None:
+            encoded = compress(data, encoding, self.level)
+            if key:
+                with self._lock:
+                    self._memo[key] = encoded
+                    while len(self._memo) > self.memo_entries:
+                        self._memo.popitem(last=False)
+        response.set_data(encoded)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(encoded)
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "encodings": list(ENCODINGS),
+                "min_size": self.min_size,
+                "level": self.level,
+                "compressed": self.compressed,
+                "streamed": self.streamed,
+                "skipped": self.skipped,
+                "memo_hits": self.memo_hits,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            }
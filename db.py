@@ -0,0 +1,148 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+ConnectionFactory = Callable[[], sqlite3.Connection]
+ConnectionHook = Callable[[sqlite3.Connection], None]
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+class ConnectionPool:
+    """SQLite connections shared across threads: a bounded read pool and one writer.
+
+    Readers are created lazily up to ``size`` and handed out through a queue;
+    the writer is a single connection serialized by a lock, which matches
+    SQLite's one-writer model and avoids ``database is locked`` retries.
+    ``prepare`` runs on every checkout of an idle connection (reader or
+    writer) and may bring per-connection state such as attachments up to date.
+    """
+
+    def __init__(
+        self,
+        factory: ConnectionFactory,
+        size: int = 8,
+        timeout: float = 10.0,
+        prepare: Optional[ConnectionHook] = None,
+    ):
+        self.factory = factory
+        self.prepare = prepare
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._writer = factory()
+        self._writer_lock = threading.Lock()
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.in_use = 0
+        self.write_checkouts = 0
+        self.write_waits = 0
+        self.write_wait_seconds = 0.0
+
+    def _create_reader(self) -> sqlite3.Connection:
+        conn = self.factory()
+        self._all.append(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if len(self._all) < self.size:
+                    conn = self._create_reader()
+            if conn is None:
+                start = time.perf_counter()
+                with self._lock:
+                    self.waits += 1
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise PoolTimeout(f"no SQLite connection available after {self.timeout}s")
+                finally:
+                    with self._lock:
+                        self.wait_seconds += time.perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+        if self.prepare is not None:
+            try:
+                self.prepare(conn)
+            except BaseException:
+                self.release(conn)
+                raise
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self.in_use -= 1
+        self._idle.put(conn)
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer connection, committing on success and rolling back on error."""
+        if not self._writer_lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._writer_lock.acquire()
+            self.write_waits += 1
+            self.write_wait_seconds += time.perf_counter() - start
+        try:
+            self.write_checkouts += 1
+            if self.prepare is not None:
+                self.prepare(self._writer)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+        finally:
+            self._writer_lock.release()
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+        self._writer.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._all),
+                "max_size": self.size,
+                "in_use": self.in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "writer": {
+                    "checkouts": self.write_checkouts,
+                    "waits": self.write_waits,
+                    "wait_seconds": round(self.write_wait_seconds, 6),
+                },
+            }
@@ -0,0 +1,268 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+EPOCH = datetime(1970, 1, 1)
+MAX_TS = (datetime(9999, 12, 31) - EPOCH) // timedelta(milliseconds=1)
+
+MESSAGE_SCHEMAS: Dict[str, Dict[str, type]] = {
+    "task": {"task_id": str, "body.message": dict},
+    "message": {"task_id": str, "body.role": str, "body.parts": list},
+    "artifact": {"task_id": str, "body.name": str, "body.parts": list},
+    "agent_card": {"body.name": str, "body.url": str, "body.version": str, "body.skills": list},
+}
+TRUSTED_AGENT_DOMAINS = ("a2a.internal", "agents.a2a-demo.local")
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """ISO 8601 text as naive UTC; offsets (``Z``, ``+09:00``) are converted."""
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def record_ts(record: Dict) -> int:
+    ts = record.get("ts")
+    timestamp = record.get("timestamp")
+    if ts is not None:
+        ts = int(ts)
+    elif timestamp:
+        ts = int((parse_timestamp(timestamp) - EPOCH).total_seconds() * 1000)
+    else:
+        ts = int(time.time() * 1000)
+    if not 0 <= ts <= MAX_TS:
+        raise ValueError(f"ts out of range: {ts}")
+    return ts
+
+
+def well_formed(record) -> bool:
+    """Whether ``record`` is a dict whose ``kind``, agents and ``protocol_layer`` have the expected types."""
+    if not isinstance(record, dict):
+        return False
+    kind, layer = record.get("kind"), record.get("protocol_layer")
+    return (
+        (kind is None or isinstance(kind, str))
+        and isinstance(record.get("source_agent"), str)
+        and isinstance(record.get("target_agent"), str)
+        and (layer is None or isinstance(layer, str))
+    )
+
+
+def alert_timestamp(record: Dict, ts: int) -> str:
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, str) and timestamp:
+        try:
+            return parse_timestamp(timestamp).isoformat()
+        except (OverflowError, ValueError):
+            pass
+    return datetime.utcfromtimestamp(ts / 1000).isoformat()
+
+
+class Rule:
+    """One detection rule. ``kinds`` lists the message kinds it applies to (``None`` means all).
+
+    ``check`` returns ``None``, a description, or ``(description, severity)``
+    to override the rule's default severity for that match.
+    """
+
+    name = "rule"
+    kinds: Optional[Tuple[str, ...]] = None
+    threat_type = ""
+    severity = "중간"
+    protocol_layer = "Layer 7"
+
+    def check(self, record: Dict, ts: int) -> Union[None, str, Tuple[str, str]]:
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class TaskReplayRule(Rule):
+    """Flags a Task ID seen again within ``window_seconds`` of its previous use."""
+
+    name = "task_replay"
+    kinds = ("task",)
+    threat_type = "Task Replay"
+    severity = "높음"
+    protocol_layer = "Layer 3"
+
+    def __init__(self, window_seconds: float = 300):
+        self.window_ms = int(window_seconds * 1000)
+        self._seen: Dict[str, int] = {}
+        self._expiry: Deque[Tuple[int, str]] = deque()
+        self.invalid_task_ids = 0
+
+    def check(self, record: Dict, ts: int) -> Optional[str]:
+        task_id = record.get("task_id")
+        if task_id is not None and not isinstance(task_id, str):
+            self.invalid_task_ids += 1
+            return None
+        if not task_id:
+            return None
+        cutoff = ts - self.window_ms
+        seen, expiry = self._seen, self._expiry
+        while expiry and expiry[0][0] < cutoff:
+            old_ts, old_id = expiry.popleft()
+            if seen.get(old_id) == old_ts:
+                del seen[old_id]
+
+        previous = seen.get(task_id)
+        seen[task_id] = ts
+        expiry.append((ts, task_id))
+        if previous is None:
+            return None
+        return f"동일 Task ID 재요청 패턴 확인 ({task_id}, {(ts - previous) / 1000:.1f}초 전 최초 요청)"
+
+    def stats(self) -> Dict:
+        return {
+            "tracked_task_ids": len(self._seen),
+            "window_seconds": self.window_ms / 1000,
+            "invalid_task_ids": self.invalid_task_ids,
+        }
+
+
+class SchemaRule(Rule):
+    """Checks required fields and their types per message kind.
+
+    Dotted field paths (``body.parts``) are split once at construction, so a
+    check is a dict lookup by kind plus a walk over that kind's own fields.
+    """
+
+    name = "schema"
+    threat_type = "Message Schema Violation"
+    severity = "중간"
+    protocol_layer = "Layer 2"
+
+    def __init__(self, schemas: Dict[str, Dict[str, type]] = MESSAGE_SCHEMAS):
+        self.kinds = tuple(schemas)
+        self._compiled = {
+            kind: tuple((field, tuple(field.split(".")), expected) for field, expected in fields.items())
+            for kind, fields in schemas.items()
+        }
+
+    def check(self, record: Dict, ts: int) -> Optional[str]:
+        problems = []
+        for field, path, expected in self._compiled[record["kind"]]:
+            value = record
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                problems.append(f"{field} 누락")
+            elif not isinstance(value, expected):
+                problems.append(f"{field} 타입 오류")
+        if not problems:
+            return None
+        return f"{record['kind']} 메시지 스키마 위반: {', '.join(problems)}"
+
+
+class UnknownDomainCardRule(Rule):
+    """Flags AgentCards whose ``url`` host is not a trusted domain or one of its subdomains."""
+
+    name = "unknown_domain_card"
+    kinds = ("agent_card",)
+    threat_type = "Agent Card Spoofing"
+    severity = "높음"
+    protocol_layer = "Layer 3"
+
+    def __init__(self, trusted_domains: Iterable[str] = TRUSTED_AGENT_DOMAINS):
+        self.trusted = frozenset(domain.lower().strip(".") for domain in trusted_domains)
+
+    def check(self, record: Dict, ts: int) -> Optional[str]:
+        body = record.get("body")
+        url = body.get("url") if isinstance(body, dict) else None
+        if not isinstance(url, str):
+            return None
+        try:
+            host = (urlsplit(url).hostname or "").rstrip(".")
+        except ValueError:
+            host = ""
+        labels = host.split(".")
+        for index in range(len(labels)):
+            if ".".join(labels[index:]) in self.trusted:
+                return None
+        return f"미등록 도메인에서 AgentCard 수신 ({host or url})"
+
+
+class DetectionEngine:
+    """Runs raw A2A message records through a fixed rule set.
+
+    A record is a dict with ``kind`` (``task``, ``message``, ``artifact``,
+    ``agent_card``), ``source_agent``, ``target_agent``, an optional
+    ``timestamp``/``ts`` and optional ``task_id``/``body``/``protocol_layer``.
+    Rules are indexed by kind when the engine is built, so each record only
+    visits the rules registered for its kind. Matches are returned as alert
+    dicts in the shape ``write_alerts`` stores.
+    """
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = tuple(rules)
+        wildcard = tuple(rule for rule in self.rules if rule.kinds is None)
+        kinds = {kind for rule in self.rules for kind in rule.kinds or ()}
+        self._index: Dict[str, Tuple[Rule, ...]] = {
+            kind: tuple(rule for rule in self.rules if rule.kinds and kind in rule.kinds) + wildcard for kind in kinds
+        }
+        self._wildcard = wildcard
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.invalid = 0
+        self.matches: Dict[str, int] = {rule.name: 0 for rule in self.rules}
+
+    def process(self, records: Iterable[Dict]) -> List[Dict]:
+        alerts: List[Dict] = []
+        index, wildcard = self._index, self._wildcard
+        with self._lock:
+            for record in records:
+                self.processed += 1
+                if not well_formed(record):
+                    self.invalid += 1
+                    continue
+                kind = record.get("kind")
+                try:
+                    ts = record_ts(record)
+                except (OverflowError, TypeError, ValueError):
+                    self.invalid += 1
+                    continue
+                for rule in index.get(kind, wildcard):
+                    description = rule.check(record, ts)
+                    if description is None:
+                        continue
+                    severity = rule.severity
+                    if isinstance(description, tuple):
+                        description, severity = description
+                    self.matches[rule.name] += 1
+                    alerts.append(
+                        {
+                            "timestamp": alert_timestamp(record, ts),
+                            "source_agent": record.get("source_agent") or "-",
+                            "target_agent": record.get("target_agent") or "-",
+                            "threat_type": rule.threat_type,
+                            "severity": severity,
+                            "protocol_layer": record.get("protocol_layer") or rule.protocol_layer,
+                            "description": description,
+                        }
+                    )
+        return alerts
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "processed": self.processed,
+                "invalid": self.invalid,
+                "matches": dict(self.matches),
+                "rules": {rule.name: {"kinds": list(rule.kinds or ["*"]), **rule.stats()} for rule in self.rules},
+            }
+
+
+def default_engine(replay_window_seconds: float = 300, trusted_domains: Iterable[str] = TRUSTED_AGENT_DOMAINS):
+    return DetectionEngine(
+        [
+            TaskReplayRule(replay_window_seconds),
+            SchemaRule(),
+            UnknownDomainCardRule(trusted_domains),
+        ]
+    )
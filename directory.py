@@ -0,0 +1,46 @@
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+class AgentDirectory:
+    """Process-wide ``agents`` id/name map shared by every request and write path.
+
+    The map is loaded lazily through ``loader`` (rows of ``(id, name)``) and
+    kept until ``invalidate`` is called after agents are added, renamed or
+    removed. Readers get a consistent pair of dicts without taking a lock;
+    duplicate names resolve to the lowest id, matching the migration backfill.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Tuple[int, str]]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._maps: Optional[Tuple[Dict[str, int], Dict[int, str]]] = None
+        self.loads = 0
+
+    def _current(self) -> Tuple[Dict[str, int], Dict[int, str]]:
+        maps = self._maps
+        if maps is None:
+            with self._lock:
+                maps = self._maps
+                if maps is None:
+                    by_name: Dict[str, int] = {}
+                    by_id: Dict[int, str] = {}
+                    for agent_id, name in self._loader():
+                        by_id[agent_id] = name
+                        by_name.setdefault(name, agent_id)
+                    maps = self._maps = (by_name, by_id)
+                    self.loads += 1
+        return maps
+
+    def invalidate(self):
+        self._maps = None
+
+    def id_for(self, name: str) -> Optional[int]:
+        return self._current()[0].get(name)
+
+    def name_for(self, agent_id: int) -> Optional[str]:
+        return self._current()[1].get(agent_id)
+
+    def stats(self) -> Dict:
+        by_name, by_id = self._current()
+        return {"agents": len(by_id), "names": len(by_name), "loads": self.loads}
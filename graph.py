@@ -0,0 +1,215 @@
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEVERITIES = ("낮음", "중간", "높음")
+STATUS_ORDER = {"정상": 0, "주의": 1, "격리": 2}
+CLUSTER_FIELDS = ("department", "location")
+UNKNOWN_GROUP = "미분류"
+
+
+class AgentGraph:
+    """Immutable summary of the agent graph behind ``/api/agents``.
+
+    Parallel edges (communication sessions and packets between the same pair)
+    are collapsed into one edge with a count and the highest packet severity
+    when the graph is built, and kept as NumPy arrays over agent positions.
+    The views cut that graph down to something a browser can lay out: the
+    whole graph, clusters by department or location, the induced subgraph of
+    the ``k`` riskiest agents, or the ego network within ``depth`` hops of one
+    agent. Views that exceed ``max_edges`` keep the most severe, busiest edges.
+    """
+
+    def __init__(
+        self,
+        agents: Sequence[Dict],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        sessions: np.ndarray,
+        packets: np.ndarray,
+        severity: np.ndarray,
+        summaries: Optional[Dict[Tuple[int, int], str]] = None,
+        communications: Sequence[Dict] = (),
+    ):
+        self.agents = sorted(agents, key=lambda agent: agent["id"])
+        self.ids = np.array([agent["id"] for agent in self.agents], dtype=np.int64)
+        self.risk = np.array([agent["risk_score"] for agent in self.agents], dtype=float)
+        self.summaries = summaries or {}
+        self.communications = list(communications)
+        self._clusters: Dict[Tuple[str, int], Dict] = {}
+
+        n = len(self.ids)
+        source_pos, source_ok = self._positions(np.asarray(sources, dtype=np.int64))
+        target_pos, target_ok = self._positions(np.asarray(targets, dtype=np.int64))
+        keep = source_ok & target_ok
+        codes = source_pos[keep] * max(n, 1) + target_pos[keep]
+        unique, inverse = np.unique(codes, return_inverse=True)
+        self.edge_source = unique // max(n, 1)
+        self.edge_target = unique % max(n, 1)
+        self.edge_sessions = np.bincount(inverse, weights=np.asarray(sessions)[keep], minlength=len(unique))
+        self.edge_packets = np.bincount(inverse, weights=np.asarray(packets)[keep], minlength=len(unique))
+        self.edge_severity = np.full(len(unique), -1, dtype=np.int64)
+        np.maximum.at(self.edge_severity, inverse, np.asarray(severity, dtype=np.int64)[keep])
+        self.edge_count = (self.edge_sessions + self.edge_packets).astype(np.int64)
+
+        ends = np.concatenate([self.edge_source, self.edge_target])
+        others = np.concatenate([self.edge_target, self.edge_source])
+        order = np.argsort(ends, kind="stable")
+        self.neighbor_ptr = np.concatenate([[0], np.cumsum(np.bincount(ends, minlength=n))])
+        self.neighbor_idx = others[order]
+
+    def _positions(self, agent_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        positions = np.searchsorted(self.ids, agent_ids)
+        positions = np.minimum(positions, max(len(self.ids) - 1, 0))
+        found = (self.ids[positions] == agent_ids) if len(self.ids) else np.zeros(len(agent_ids), dtype=bool)
+        return positions, found
+
+    def _rank_edges(self, edges: np.ndarray, max_edges: int) -> Tuple[np.ndarray, bool]:
+        if len(edges) <= max_edges:
+            return edges, False
+        order = np.lexsort((self.edge_count[edges], self.edge_severity[edges]))[::-1]
+        return edges[order[:max_edges]], True
+
+    def _edge_payload(self, edge: int) -> Dict:
+        source, target = int(self.ids[self.edge_source[edge]]), int(self.ids[self.edge_target[edge]])
+        count = int(self.edge_count[edge])
+        severity = int(self.edge_severity[edge])
+        return {
+            "id": f"{source}-{target}",
+            "from": source,
+            "to": target,
+            "count": count,
+            "sessions": int(self.edge_sessions[edge]),
+            "packets": int(self.edge_packets[edge]),
+            "severity": SEVERITIES[severity] if severity >= 0 else None,
+            "label": self.summaries.get((source, target)) or f"{count}건",
+            "value": count,
+        }
+
+    def _subgraph(self, selected: np.ndarray, max_edges: int) -> Dict:
+        mask = np.zeros(len(self.ids), dtype=bool)
+        mask[selected] = True
+        edges = np.flatnonzero(mask[self.edge_source] & mask[self.edge_target])
+        edges, truncated = self._rank_edges(edges, max_edges)
+        agents = [self.agents[position] for position in np.sort(selected).tolist()]
+        return {
+            "agents": agents,
+            "nodes": [
+                {"id": agent["id"], "label": agent["name"], "group": agent["status"], "risk_score": agent["risk_score"]}
+                for agent in agents
+            ],
+            "edges": [self._edge_payload(edge) for edge in edges.tolist()],
+            "truncated": truncated,
+        }
+
+    def full(self, max_edges: int) -> Dict:
+        return self._subgraph(np.arange(len(self.ids)), max_edges)
+
+    def top_risk(self, k: int, max_edges: int) -> Dict:
+        k = min(k, len(self.ids))
+        selected = np.argpartition(-self.risk, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        return self._subgraph(selected, max_edges)
+
+    def ego(self, agent_id: int, depth: int, max_nodes: int, max_edges: int) -> Optional[Dict]:
+        positions, found = self._positions(np.array([agent_id], dtype=np.int64))
+        if not found[0]:
+            return None
+        center = int(positions[0])
+        seen = {center}
+        frontier = deque([(center, 0)])
+        truncated = False
+        pointer, neighbors = self.neighbor_ptr, self.neighbor_idx
+        while frontier and not truncated:
+            current, distance = frontier.popleft()
+            if distance >= depth:
+                continue
+            for neighbor in neighbors[pointer[current] : pointer[current + 1]].tolist():
+                if neighbor in seen:
+                    continue
+                if len(seen) >= max_nodes:
+                    truncated = True
+                    break
+                seen.add(neighbor)
+                frontier.append((neighbor, distance + 1))
+        payload = self._subgraph(np.fromiter(seen, dtype=np.int64, count=len(seen)), max_edges)
+        payload["truncated"] = payload["truncated"] or truncated
+        payload["center"] = agent_id
+        return payload
+
+    def clusters(self, field: str, max_edges: int) -> Dict:
+        key = (field, max_edges)
+        if key not in self._clusters:
+            self._clusters[key] = self._build_clusters(field, max_edges)
+        return self._clusters[key]
+
+    def _build_clusters(self, field: str, max_edges: int) -> Dict:
+        names: List[str] = []
+        lookup: Dict[str, int] = {}
+        membership = np.empty(len(self.agents), dtype=np.int64)
+        for position, agent in enumerate(self.agents):
+            name = agent.get(field) or UNKNOWN_GROUP
+            membership[position] = lookup.setdefault(name, len(names))
+            if membership[position] == len(names):
+                names.append(name)
+
+        size = np.bincount(membership, minlength=len(names))
+        max_risk = np.full(len(names), -np.inf)
+        np.maximum.at(max_risk, membership, self.risk)
+        risk_sum = np.bincount(membership, weights=self.risk, minlength=len(names))
+        status_counts: List[Dict[str, int]] = [{} for _ in names]
+        for position, agent in enumerate(self.agents):
+            counts = status_counts[membership[position]]
+            counts[agent["status"]] = counts.get(agent["status"], 0) + 1
+
+        nodes = []
+        for index, name in enumerate(names):
+            worst = max(status_counts[index], key=lambda status: STATUS_ORDER.get(status, 0))
+            nodes.append(
+                {
+                    "id": f"cluster:{name}",
+                    "label": f"{name} ({size[index]})",
+                    "group": worst,
+                    "cluster": {
+                        "field": field,
+                        "name": name,
+                        "size": int(size[index]),
+                        "max_risk": float(max_risk[index]),
+                        "avg_risk": round(float(risk_sum[index] / size[index]), 4),
+                        "status_counts": status_counts[index],
+                    },
+                    "value": int(size[index]),
+                }
+            )
+
+        source, target = membership[self.edge_source], membership[self.edge_target]
+        between = source != target
+        codes = source[between] * len(names) + target[between]
+        unique, inverse = np.unique(codes, return_inverse=True)
+        sessions = np.bincount(inverse, weights=self.edge_sessions[between], minlength=len(unique))
+        packets = np.bincount(inverse, weights=self.edge_packets[between], minlength=len(unique))
+        severity = np.full(len(unique), -1, dtype=np.int64)
+        np.maximum.at(severity, inverse, self.edge_severity[between])
+        count = (sessions + packets).astype(np.int64)
+        order = np.lexsort((count, severity))[::-1][:max_edges]
+
+        edges = []
+        for edge in order.tolist():
+            source_name, target_name = names[unique[edge] // len(names)], names[unique[edge] % len(names)]
+            edges.append(
+                {
+                    "id": f"cluster:{source_name}-cluster:{target_name}",
+                    "from": f"cluster:{source_name}",
+                    "to": f"cluster:{target_name}",
+                    "count": int(count[edge]),
+                    "sessions": int(sessions[edge]),
+                    "packets": int(packets[edge]),
+                    "severity": SEVERITIES[severity[edge]] if severity[edge] >= 0 else None,
+                    "label": f"{count[edge]}건",
+                    "value": int(count[edge]),
+                }
+            )
+        return {"agents": [], "nodes": nodes, "edges": edges, "truncated": len(unique) > max_edges}
+
+    def stats(self) -> Dict:
+        return {"agents": len(self.ids), "edges": len(self.edge_source)}
@@ -0,0 +1,388 @@
+import bisect
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[Labels, float]
+
+logger = logging.getLogger("a2a.sql")
+
+WHITESPACE = re.compile(r"\s+")
+PARTITION_SCHEMA = re.compile(r"\bd\d{8}\b")
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+# Schema and connection setup (startup DDL, migrations, per-connection TEMP views) is not profiled.
+UNPROFILED_VERBS = frozenset({"CREATE", "DROP", "ALTER", "PRAGMA", "ATTACH", "DETACH", "ANALYZE", "VACUUM", "REINDEX"})
+LABEL_PREFIX = 48
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a statement (partition names, literals and ``IN`` lists folded) so its variants group together."""
+    text = WHITESPACE.sub(" ", sql).strip()
+    text = PARTITION_SCHEMA.sub("d*", text)
+    text = STRING_LITERAL.sub("'?'", text)
+    text = NUMBER_LITERAL.sub("N", text)
+    return PLACEHOLDER_LIST.sub("?, ...", text)
+
+
+def statement_label(text: str) -> str:
+    """Short, stable metric label for a fingerprint: its first words plus a hash of the whole text."""
+    digest = hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+    prefix = text if len(text) <= LABEL_PREFIX else text[:LABEL_PREFIX].rstrip() + "..."
+    return f"{prefix} #{digest}"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def quote(value) -> str:
+    return '"' + escape_label(str(value)) + '"'
+
+
+def format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f"{key}={quote(value)}" for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: Labels) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket{format_labels(labels, 'le=' + quote(bound))} {cumulative}"
+        yield f"{name}_bucket{format_labels(labels, 'le=' + quote('+Inf'))} {self.count}"
+        yield f"{name}_sum{format_labels(labels)} {self.sum:.6f}"
+        yield f"{name}_count{format_labels(labels)} {self.count}"
+
+
+class RequestMetrics:
+    """Latency histograms per (route rule, method, status)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.histograms: Dict[Labels, Histogram] = {}
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        labels = (("route", route), ("method", method), ("status", str(status)))
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.histograms.get(labels)
+            if histogram is None:
+                histogram = self.histograms[labels] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP a2a_http_request_duration_seconds Time to produce the response (first byte for streams).",
+            "# TYPE a2a_http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for labels, histogram in sorted(self.histograms.items()):
+                lines.extend(histogram.lines("a2a_http_request_duration_seconds", labels))
+            lines += [
+                "# HELP a2a_http_requests_in_flight Requests currently being handled.",
+                "# TYPE a2a_http_requests_in_flight gauge",
+                f"a2a_http_requests_in_flight {self.in_flight}",
+            ]
+        return lines
+
+
+class StatementStats:
+    __slots__ = ("histogram", "rows", "errors", "slow", "explained_at")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.histogram = Histogram(buckets)
+        self.rows = 0
+        self.errors = 0
+        self.slow = 0
+        self.explained_at = 0.0
+
+
+class SqlProfiler:
+    """Per-statement timing and row counts fed by ``ProfiledConnection``.
+
+    Time covers ``execute`` plus every fetch until the cursor is exhausted,
+    re-executed, closed or collected, so a lazily consumed SELECT is charged
+    for all of its steps. Statements are labelled by ``statement_label``;
+    schema and connection setup (``UNPROFILED_VERBS``) is skipped. Statements
+    slower than ``slow_ms`` are logged and kept in a short list with their
+    full normalized text and ``EXPLAIN QUERY PLAN``; the plan is captured at
+    most once per ``explain_interval`` seconds per statement.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = 100.0,
+        max_statements: int = 500,
+        slow_log_size: int = 50,
+        explain_interval: float = 60.0,
+        buckets: Sequence[float] = SQL_BUCKETS,
+    ):
+        self.slow_seconds = slow_ms / 1000
+        self.max_statements = max_statements
+        self.explain_interval = explain_interval
+        self.buckets = buckets
+        self.statements: Dict[str, StatementStats] = {}
+        self.slow_queries: Deque[Dict] = deque(maxlen=slow_log_size)
+        self._labels: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def label(self, sql: str) -> Optional[str]:
+        """Metric label for ``sql``, or ``None`` when it is not profiled; cached per statement text."""
+        try:
+            return self._labels[sql]
+        except KeyError:
+            pass
+        words = sql.split(None, 1)
+        label = None if not words or words[0].upper() in UNPROFILED_VERBS else statement_label(fingerprint(sql))
+        if len(self._labels) < 4 * self.max_statements:
+            self._labels[sql] = label
+        return label
+
+    def reset(self):
+        """Forget the per-statement series (the slow-query list is kept), e.g. once one-off startup work is done."""
+        with self._lock:
+            self.statements.clear()
+
+    def _stats(self, key: str) -> StatementStats:
+        stats = self.statements.get(key)
+        if stats is None:
+            if len(self.statements) >= self.max_statements:
+                key = "other"
+                stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats(self.buckets)
+        return stats
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        label: str,
+        sql: str,
+        parameters,
+        seconds: float,
+        rows: int,
+        error: bool = False,
+    ):
+        explain = False
+        with self._lock:
+            stats = self._stats(label)
+            stats.histogram.observe(seconds)
+            stats.rows += max(rows, 0)
+            stats.errors += error
+            if seconds >= self.slow_seconds and not error:
+                stats.slow += 1
+                now = time.time()
+                if now - stats.explained_at >= self.explain_interval:
+                    stats.explained_at = now
+                    explain = True
+        if not explain:
+            return
+        plan = self.explain(conn, sql, parameters)
+        entry = {
+            "at": time.time(),
+            "label": label,
+            "statement": fingerprint(sql),
+            "elapsed_ms": round(seconds * 1000, 3),
+            "rows": rows,
+            "plan": plan,
+        }
+        self.slow_queries.append(entry)
+        logger.warning("slow query %.1f ms, %d rows: %s\n%s", seconds * 1000, rows, entry["statement"], "\n".join(plan))
+
+    @staticmethod
+    def explain(conn: sqlite3.Connection, sql: str, parameters) -> List[str]:
+        verb = sql.split(None, 1)[0].upper() if sql.strip() else ""
+        if parameters is None or verb not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+            return []
+        try:
+            rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        except sqlite3.Error as error:
+            return [f"(plan unavailable: {error})"]
+        depth: Dict[int, int] = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return lines
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP a2a_sql_statement_duration_seconds Execute plus fetch time per normalized statement.",
+            "# TYPE a2a_sql_statement_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self.statements.items())
+            for key, stats in items:
+                lines.extend(stats.histogram.lines("a2a_sql_statement_duration_seconds", (("statement", key),)))
+            for name, help_text, attribute in (
+                ("a2a_sql_rows_total", "Rows returned (SELECT) or changed (DML) per statement.", "rows"),
+                ("a2a_sql_errors_total", "Statements that raised.", "errors"),
+                ("a2a_sql_slow_queries_total", "Statements slower than the slow-query threshold.", "slow"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                lines += [
+                    f"{name}{format_labels((('statement', key),))} {getattr(stats, attribute)}"
+                    for key, stats in items
+                    if getattr(stats, attribute)
+                ]
+        return lines
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to its connection's ``profiler`` once it is done.
+
+    ``for row in cursor`` reads ahead ``FETCH_BATCH`` rows per call so the
+    timing is paid per batch rather than per row; do not mix iteration with
+    ``fetch*`` calls on the same result set.
+    """
+
+    FETCH_BATCH = 64
+
+    _pending: Optional[list] = None
+
+    def _finish(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            self.connection.profiler.record(self.connection, *pending)
+
+    def execute(self, sql: str, parameters=()):
+        self._finish()
+        profiler = self.connection.profiler
+        label = profiler.label(sql)
+        if label is None:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.Error:
+            profiler.record(self.connection, label, sql, None, time.perf_counter() - started, 0, True)
+            raise
+        elapsed = time.perf_counter() - started
+        if self.description is None:
+            profiler.record(self.connection, label, sql, parameters, elapsed, self.rowcount)
+        else:
+            self._pending = [label, sql, parameters, elapsed, 0]
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters):
+        self._finish()
+        profiler = self.connection.profiler
+        label = profiler.label(sql)
+        if label is None:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error:
+            profiler.record(self.connection, label, sql, None, time.perf_counter() - started, 0, True)
+            raise
+        profiler.record(self.connection, label, sql, None, time.perf_counter() - started, self.rowcount)
+        return self
+
+    def _fetched(self, started: float, rows: int, done: bool):
+        pending = self._pending
+        if pending is not None:
+            pending[3] += time.perf_counter() - started
+            pending[4] += rows
+            if done:
+                self._finish()
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(self.FETCH_BATCH)
+            yield from rows
+            if len(rows) < self.FETCH_BATCH:
+                return
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None):
+        started = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """``sqlite3.connect(..., factory=ProfiledConnection)``; set ``profiler`` before use."""
+
+    profiler: SqlProfiler
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def render_samples(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{format_labels(labels)} {value:g}" for labels, value in samples]
+    return lines
@@ -0,0 +1,417 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DAY_MS = 24 * 3600 * 1000
+HOUR_MS = 3600 * 1000
+MAX_CLOCK_SKEW_MS = 5 * 60 * 1000
+KINDS = ("packets", "alerts")
+COLUMNS = {
+    "packets": (
+        "id", "timestamp", "ts", "source_agent", "target_agent", "source_agent_id", "target_agent_id",
+        "protocol_layer", "threat_type", "severity", "description", "resolution",
+    ),
+    "alerts": (
+        "id", "timestamp", "ts", "source_agent", "target_agent", "source_agent_id", "target_agent_id",
+        "threat_type", "severity", "protocol_layer", "description",
+    ),
+}
+SCHEMA = {
+    "packets": """
+        CREATE TABLE IF NOT EXISTS {schema}.packets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            source_agent TEXT NOT NULL,
+            target_agent TEXT NOT NULL,
+            source_agent_id INTEGER,
+            target_agent_id INTEGER,
+            protocol_layer TEXT NOT NULL,
+            threat_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            description TEXT NOT NULL,
+            resolution TEXT NOT NULL
+        )
+    """,
+    "alerts": """
+        CREATE TABLE IF NOT EXISTS {schema}.alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            source_agent TEXT NOT NULL,
+            target_agent TEXT NOT NULL,
+            source_agent_id INTEGER,
+            target_agent_id INTEGER,
+            threat_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            protocol_layer TEXT NOT NULL,
+            description TEXT NOT NULL
+        )
+    """,
+}
+INDEXES = {
+    "packets": ("ts", "severity, ts", "source_agent_id, ts", "target_agent_id, ts", "protocol_layer"),
+    "alerts": ("ts", "severity, ts", "source_agent_id, ts", "target_agent_id, ts"),
+}
+ROLLUP_TABLES = {"packets": "packet_rollups", "alerts": "alert_rollups"}
+
+
+def day_of(ts: int) -> int:
+    return ts // DAY_MS
+
+
+def day_label(day: int) -> str:
+    return datetime.fromtimestamp(day * DAY_MS / 1000, tz=timezone.utc).strftime("%Y%m%d")
+
+
+class PartitionStore:
+    """Packets and alerts stored in one attached SQLite file per UTC day.
+
+    Every pooled connection attaches the live day files (``sync`` runs on each
+    checkout and is a dict lookup unless the set changed) and gets TEMP views
+    named ``packets`` and ``alerts`` over ``main`` plus every day, so ad-hoc
+    and aggregate SQL keeps working unchanged. Ordered, limited reads should
+    go through ``select``, which runs the query per partition newest first and
+    stops once the limit is reached.
+
+    Row ids come from one counter per kind in ``main.row_ids`` (``allocate_ids``
+    on the writer), so they are unique across partitions and increase in
+    commit order whatever day a row is filed under. Rows older than ``retention_days``
+    are never stored; they, and every partition that ages out, are folded into
+    hourly rollups in the main database. Dropping a day detaches and deletes
+    its file, which needs neither ``VACUUM`` nor a long write transaction.
+    """
+
+    def __init__(self, directory: str, prefix: str, retention_days: int = 7, fts_columns: Optional[Dict] = None):
+        self.directory = directory
+        self.prefix = prefix
+        self.retention_days = retention_days
+        self.fts_columns = fts_columns
+        self._lock = threading.Lock()
+        self._state: Optional[Tuple[int, Tuple[int, ...]]] = None
+        self._attached: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+        self._pending_delete: List[str] = []
+
+        self.created = 0
+        self.dropped = 0
+        self.rolled_up_rows = Counter()
+
+    @staticmethod
+    def schema(day: int) -> str:
+        return f"d{day_label(day)}"
+
+    def path(self, day: int) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{day_label(day)}.db")
+
+    def days(self) -> Tuple[int, ...]:
+        return self._state[1] if self._state else ()
+
+    def cutoff_day(self, now_ms: Optional[int] = None) -> int:
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        return day_of(now_ms) - self.retention_days + 1
+
+    def route(self, ts: int, now_ms: Optional[int] = None) -> Optional[int]:
+        """Partition day for a row at ``ts``; ``None`` means it is already past retention.
+
+        Timestamps more than ``MAX_CLOCK_SKEW_MS`` ahead are filed as if they
+        were at that bound; writers clamp such rows (``clamp_ts``) beforehand.
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        day = day_of(min(ts, now_ms + MAX_CLOCK_SKEW_MS))
+        return day if day >= self.cutoff_day(now_ms) else None
+
+    @staticmethod
+    def clamp_ts(ts: int, now_ms: int) -> Optional[int]:
+        """``now_ms`` for a timestamp beyond the allowed clock skew, ``None`` if ``ts`` is acceptable."""
+        return now_ms if ts > now_ms + MAX_CLOCK_SKEW_MS else None
+
+    def open(self, conn: sqlite3.Connection):
+        """Load the registry and prepare ``conn``; call once at startup, outside a transaction."""
+        os.makedirs(self.directory, exist_ok=True)
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if self.retention_days + 1 > limit:
+            raise ValueError(f"retention of {self.retention_days} days needs more than {limit} attached databases")
+        days = tuple(sorted(row[0] for row in conn.execute("SELECT day FROM main.partitions")))
+        with self._lock:
+            self._state = (0, days)
+        self.sync(conn)
+        self.sync_ids(conn)
+
+    def sync(self, conn: sqlite3.Connection):
+        """Attach/detach day files on ``conn`` so it matches the registry, then rebuild the TEMP views."""
+        state = self._state
+        if state is None or self._attached.get(id(conn), (None,))[0] == state[0]:
+            return
+        epoch, days = state
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        wanted = {self.schema(day): day for day in days}
+        for kind in KINDS:
+            conn.execute(f"DROP VIEW IF EXISTS temp.{kind}")
+        for schema in attached - set(wanted) - {"main", "temp"}:
+            conn.execute(f"DETACH DATABASE {schema}")
+        for schema, day in wanted.items():
+            if schema not in attached:
+                conn.execute("ATTACH DATABASE ? AS " + schema, (self.path(day),))
+        for kind in KINDS:
+            columns = ", ".join(COLUMNS[kind])
+            arms = [f"SELECT {columns} FROM main.{kind}"]
+            arms += [f"SELECT {columns} FROM {self.schema(day)}.{kind}" for day in days]
+            conn.execute(f"CREATE TEMP VIEW {kind} AS " + " UNION ALL ".join(arms))
+        self._attached[id(conn)] = (epoch, days)
+
+    def attached_days(self, conn: sqlite3.Connection) -> Tuple[int, ...]:
+        return self._attached.get(id(conn), (None, ()))[1]
+
+    def _create(self, conn: sqlite3.Connection, day: int):
+        schema = self.schema(day)
+        conn.execute("ATTACH DATABASE ? AS " + schema, (self.path(day),))
+        conn.execute(f"PRAGMA {schema}.journal_mode = WAL")
+        for kind in KINDS:
+            conn.execute(SCHEMA[kind].format(schema=schema))
+            for columns in INDEXES[kind]:
+                name = f"idx_{kind}_{columns.replace(', ', '_')}"
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.{name} ON {kind} ({columns})")
+            if self.fts_columns:
+                self._create_fts(conn, schema, kind, self.fts_columns[kind])
+        conn.execute("INSERT OR IGNORE INTO main.partitions (day, created_at) VALUES (?, ?)", (day, int(time.time())))
+        conn.commit()
+
+    @staticmethod
+    def _create_fts(conn: sqlite3.Connection, schema: str, kind: str, columns: Sequence[str]):
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.{kind}_fts USING fts5(
+                {column_list},
+                content='{kind}',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {schema}.{kind}_fts_insert AFTER INSERT ON {kind} BEGIN
+                INSERT INTO {kind}_fts (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+            """
+        )
+
+    def reload(self, conn: sqlite3.Connection):
+        """Re-read the registry after another process created or dropped partitions."""
+        days = tuple(sorted(row[0] for row in conn.execute("SELECT day FROM main.partitions")))
+        with self._lock:
+            epoch, current = self._state
+            if days != current:
+                self._state = (epoch + 1, days)
+
+    def ensure(self, conn: sqlite3.Connection, days: Iterable[int]) -> List[int]:
+        """Create missing partitions for ``days`` on the writer ``conn``; must run before its first write.
+
+        Returns the days that were not known to this process before.
+        """
+        missing = sorted(set(days) - set(self.days()))
+        if not missing:
+            return missing
+        if conn.in_transaction:
+            conn.commit()
+        with self._lock:
+            for day in missing:
+                self._create(conn, day)
+                self.created += 1
+            epoch, days_now = self._state
+            self._state = (epoch + 1, tuple(sorted(set(days_now) | set(missing))))
+        self.sync(conn)
+        return missing
+
+    def table(self, day: int, kind: str) -> str:
+        return f"{self.schema(day)}.{kind}"
+
+    def select(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        params: Sequence = (),
+        limit: Optional[int] = None,
+        before_ts: Optional[int] = None,
+        after_ts: Optional[int] = None,
+    ) -> Iterator[sqlite3.Row]:
+        """Run ``sql`` against each partition, newest first, until ``limit`` rows are produced.
+
+        ``sql`` names the partition through ``{schema}`` (for example
+        ``SELECT * FROM {schema}.packets WHERE ... ORDER BY ts DESC``) and must
+        order newest first; ``LIMIT ?`` is appended. Partitions that start
+        after ``before_ts`` or end at or before ``after_ts`` are skipped.
+        """
+        remaining = limit
+        for day in reversed(self.attached_days(conn)):
+            if before_ts is not None and day * DAY_MS > before_ts:
+                continue
+            if after_ts is not None and (day + 1) * DAY_MS <= after_ts:
+                return
+            cursor = conn.execute(sql.format(schema=self.schema(day)) + " LIMIT ?", [*params, remaining or -1])
+            for row in cursor:
+                yield row
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+
+    @staticmethod
+    def allocate_ids(conn: sqlite3.Connection, kind: str, count: int) -> Iterator[int]:
+        """Reserve ``count`` consecutive row ids for ``kind`` inside the writer's transaction.
+
+        The counter row stays write-locked until the transaction commits, so
+        ids become visible in increasing order even with several writer
+        processes.
+        """
+        if count <= 0:
+            return iter(())
+        last = conn.execute(
+            "UPDATE main.row_ids SET last_id = last_id + ? WHERE kind = ? RETURNING last_id", (count, kind)
+        ).fetchone()[0]
+        return iter(range(last - count + 1, last + 1))
+
+    def sync_ids(self, conn: sqlite3.Connection):
+        """Raise the id counters (and ``main``'s AUTOINCREMENT used by seeds) above every stored row."""
+        if conn.in_transaction:
+            conn.commit()
+        for kind in KINDS:
+            top = conn.execute(
+                f"SELECT MAX(COALESCE((SELECT last_id FROM main.row_ids WHERE kind = ?), 0), "
+                f"COALESCE((SELECT MAX(id) FROM temp.{kind}), 0))",
+                (kind,),
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO main.row_ids (kind, last_id) VALUES (?, ?) "
+                "ON CONFLICT (kind) DO UPDATE SET last_id = MAX(last_id, excluded.last_id)",
+                (kind, top),
+            )
+            conn.execute("DELETE FROM main.sqlite_sequence WHERE name = ?", (kind,))
+            conn.execute("INSERT INTO main.sqlite_sequence (name, seq) VALUES (?, ?)", (kind, top))
+        conn.commit()
+
+    @staticmethod
+    def rollup(conn: sqlite3.Connection, source: str, after_id: int = 0) -> Tuple[List[Tuple], int]:
+        """Hourly ``(hour, severity, protocol_layer, threat_type, count)`` rows of ``source`` with ``id > after_id``."""
+        rows = conn.execute(
+            f"""
+            SELECT ts / {HOUR_MS}, severity, protocol_layer, threat_type, COUNT(*), MAX(id)
+            FROM {source}
+            WHERE id > ?
+            GROUP BY 1, 2, 3, 4
+            """,
+            (after_id,),
+        ).fetchall()
+        last_id = max((row[5] for row in rows), default=after_id)
+        return [tuple(row[:5]) for row in rows], last_id
+
+    def add_rollups(self, conn: sqlite3.Connection, kind: str, rows: Iterable[Tuple]):
+        rows = list(rows)
+        conn.executemany(
+            f"""
+            INSERT INTO main.{ROLLUP_TABLES[kind]} (hour, severity, protocol_layer, threat_type, count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (hour, severity, protocol_layer, threat_type) DO UPDATE SET count = count + excluded.count
+            """,
+            rows,
+        )
+        self.rolled_up_rows[kind] += sum(row[4] for row in rows)
+
+    def rollup_records(self, conn: sqlite3.Connection, kind: str, records: Iterable[Dict]):
+        """Fold rows that are already past retention straight into the hourly rollups."""
+        counts = Counter(
+            (record["ts"] // HOUR_MS, record["severity"], record.get("protocol_layer", "Layer ?"), record["threat_type"])
+            for record in records
+        )
+        self.add_rollups(conn, kind, (key + (count,) for key, count in counts.items()))
+
+    def expired(self, now_ms: Optional[int] = None) -> List[int]:
+        cutoff = self.cutoff_day(now_ms)
+        return [day for day in self.days() if day < cutoff]
+
+    def drop(self, conn: sqlite3.Connection, day: int, rollups: Dict[str, Tuple[List[Tuple], int]]):
+        """Store ``rollups`` (from ``rollup`` on a reader) plus anything written since, then drop ``day``.
+
+        Only rows newer than the reader's snapshot are aggregated here, so the
+        writer is held for a primary-key range scan and a few small inserts.
+        """
+        schema = self.schema(day)
+        if conn.in_transaction:
+            conn.commit()
+        self.sync(conn)
+        for kind in KINDS:
+            rows, last_id = rollups[kind]
+            late, _ = self.rollup(conn, f"{schema}.{kind}", last_id)
+            self.add_rollups(conn, kind, rows + late)
+        conn.execute("DELETE FROM main.partitions WHERE day = ?", (day,))
+        conn.commit()
+        with self._lock:
+            epoch, days = self._state
+            self._state = (epoch + 1, tuple(existing for existing in days if existing != day))
+            self._pending_delete.append(self.path(day))
+            self.dropped += 1
+        self.sync(conn)
+        self.purge()
+
+    def purge(self):
+        """Delete files of dropped partitions; files still held open elsewhere are retried later."""
+        with self._lock:
+            pending, self._pending_delete = self._pending_delete, []
+            for path in pending:
+                try:
+                    for suffix in ("-wal", "-shm", ""):
+                        if os.path.exists(path + suffix):
+                            os.remove(path + suffix)
+                except OSError:
+                    self._pending_delete.append(path)
+
+    def adopt(self, conn: sqlite3.Connection, now_ms: Optional[int] = None):
+        """Move rows left in the ``main`` tables (legacy data, startup seeds) into their partitions."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        for kind in KINDS:
+            columns = ", ".join(COLUMNS[kind])
+            days = [row[0] for row in conn.execute(f"SELECT DISTINCT ts / {DAY_MS} FROM main.{kind}")]
+            if not days:
+                continue
+            if conn.in_transaction:
+                conn.commit()
+            targets = {day: self.route(day * DAY_MS, now_ms) for day in days}
+            self.ensure(conn, {target for target in targets.values() if target is not None})
+            for day, target in targets.items():
+                where = f"ts >= {day * DAY_MS} AND ts < {(day + 1) * DAY_MS}"
+                if target is None:
+                    rows, _ = self.rollup(conn, f"(SELECT * FROM main.{kind} WHERE {where})")
+                    self.add_rollups(conn, kind, rows)
+                else:
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO {self.table(target, kind)} ({columns}) "
+                        f"SELECT {columns} FROM main.{kind} WHERE {where}"
+                    )
+                conn.execute(f"DELETE FROM main.{kind} WHERE {where}")
+                conn.commit()
+        self.sync_ids(conn)
+
+    def stats(self) -> Dict:
+        days = self.days()
+        files = {
+            day_label(day): sum(
+                os.path.getsize(path) for path in (self.path(day), self.path(day) + "-wal") if os.path.exists(path)
+            )
+            for day in days
+        }
+        return {
+            "retention_days": self.retention_days,
+            "partitions": files,
+            "total_bytes": sum(files.values()),
+            "created": self.created,
+            "dropped": self.dropped,
+            "pending_delete": len(self._pending_delete),
+            "rolled_up_rows": dict(self.rolled_up_rows),
+        }
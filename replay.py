@@ -0,0 +1,173 @@
+import math
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from detection import Rule
+
+MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` items at ``error_rate``.
+
+    Positions are derived from two 64-bit hashes by double hashing
+    (Kirsch-Mitzenmacher), so an insert costs two hash calls regardless of
+    ``hash_count``. The hashes are Python's own string hash, which is
+    randomized per process; that is fine because filters are never persisted.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate within (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        first, second = hash(key) & MASK64, (hash((key, 1)) & MASK64) | 1
+        size = self.size
+        return [(first + index * second) % size for index in range(self.hash_count)]
+
+    def add(self, key: str) -> bool:
+        """Insert ``key`` and return whether it was (probably) present already."""
+        bits = self.bits
+        present = True
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def estimated_error_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.bits)
+
+
+class WindowedReplayRule(Rule):
+    """Task Replay detection with memory bounded by the window, not by traffic.
+
+    Task IDs go into the Bloom filter of the current window; the filter of the
+    previous window is kept read-only, so an ID is remembered for between one
+    and two windows. A filter that reaches ``capacity`` is rotated early to keep
+    the false-positive rate at ``error_rate``. A Bloom hit is confirmed against
+    an LRU of the last ``confirm_size`` Task IDs: confirmed hits are reported as
+    ``severity``, unconfirmed ones (a false positive or an ID already evicted
+    from the LRU) as ``unconfirmed_severity`` unless that is ``None``.
+    """
+
+    name = "task_replay"
+    kinds = ("task",)
+    threat_type = "Task Replay"
+    severity = "높음"
+    protocol_layer = "Layer 3"
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        confirm_size: int = 100_000,
+        unconfirmed_severity: Optional[str] = "중간",
+    ):
+        self.window_ms = int(window_seconds * 1000)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.confirm_size = confirm_size
+        self.unconfirmed_severity = unconfirmed_severity
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous: Optional[BloomFilter] = None
+        self.window_start: Optional[int] = None
+        self._recent: "OrderedDict[str, int]" = OrderedDict()
+
+        self.rotations = 0
+        self.early_rotations = 0
+        self.confirmed = 0
+        self.unconfirmed = 0
+        self.invalid_task_ids = 0
+
+    def _rotate(self, ts: int):
+        self.previous = self.current
+        self.current = BloomFilter(self.capacity, self.error_rate)
+        self.window_start = ts
+        self.rotations += 1
+
+    def observe(self, task_id: str, ts: int) -> Tuple[bool, Optional[int]]:
+        """Record ``task_id`` and return ``(seen_before, previous_ts)``; ``previous_ts`` is set only when confirmed."""
+        if self.window_start is None:
+            self.window_start = ts
+        elif ts - self.window_start >= self.window_ms:
+            self._rotate(ts)
+        elif self.current.count >= self.capacity:
+            self.early_rotations += 1
+            self._rotate(ts)
+
+        in_previous = self.previous is not None and task_id in self.previous
+        seen = self.current.add(task_id) or in_previous
+
+        recent = self._recent
+        previous_ts = recent.get(task_id)
+        if previous_ts is not None and ts - previous_ts > 2 * self.window_ms:
+            previous_ts = None
+        recent[task_id] = ts
+        recent.move_to_end(task_id)
+        if len(recent) > self.confirm_size:
+            recent.popitem(last=False)
+        return seen, previous_ts if seen else None
+
+    def check(self, record: Dict, ts: int):
+        task_id = record.get("task_id")
+        if task_id is not None and not isinstance(task_id, str):
+            self.invalid_task_ids += 1
+            return None
+        if not task_id:
+            return None
+        seen, previous_ts = self.observe(task_id, ts)
+        if not seen:
+            return None
+        if previous_ts is not None:
+            self.confirmed += 1
+            return f"동일 Task ID 재요청 패턴 확인 ({task_id}, {(ts - previous_ts) / 1000:.1f}초 전 최초 요청)"
+        self.unconfirmed += 1
+        if self.unconfirmed_severity is None:
+            return None
+        return (
+            f"동일 Task ID 재요청 의심 ({task_id}, 확률적 판정 · 오탐률 {self.error_rate:.2%} 이하)",
+            self.unconfirmed_severity,
+        )
+
+    def memory(self) -> Dict:
+        filters = self.current.memory_bytes() + (self.previous.memory_bytes() if self.previous else 0)
+        recent = sys.getsizeof(self._recent) + sum(sys.getsizeof(key) for key in self._recent)
+        return {"filters": filters, "confirm_lru": recent, "total": filters + recent}
+
+    def stats(self) -> Dict:
+        return {
+            "window_seconds": self.window_ms / 1000,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "hash_count": self.current.hash_count,
+            "filter_bits": self.current.size,
+            "current_items": self.current.count,
+            "previous_items": self.previous.count if self.previous else 0,
+            "estimated_error_rate": round(self.current.estimated_error_rate(), 6),
+            "rotations": self.rotations,
+            "early_rotations": self.early_rotations,
+            "confirmed": self.confirmed,
+            "unconfirmed": self.unconfirmed,
+            "invalid_task_ids": self.invalid_task_ids,
+            "confirm_lru_size": len(self._recent),
+            "memory_bytes": self.memory(),
+        }
@@ -11,7 +11,16 @@ let layerChart;
 let trendChart;
 let alertHistory = [];
 let alertStreamStarted = false;
+let eventSource = null;
+let lastAlertEventId = null;
 let alertsInitialized = false;
+let alertHighWater = null;
+let timelinePackets = [];
+let timelineHighWater = null;
+let packetQuery = '';
+let packetCursor = null;
+let packetLoading = false;
+let packetRequestId = 0;
 let mainAgentNetwork;
 let agentDetailNetwork;
 
@@ -236,8 +245,10 @@ function renderStatusBand(statusCounts = {}, severityCounts = {}, agentTotal = 0
 async function loadOverviewMetrics() {
   const res = await fetch('/api/overview');
   if (!res.ok) return;
-  const data = await res.json();
+  renderOverview(await res.json());
+}
 
+function renderOverview(data) {
   const agentTotal = data.agent_count ?? 0;
   const highThreatTotal = data.high_threats ?? 0;
   const commTotal = data.communication_count ?? 0;
@@ -515,15 +526,62 @@ function renderPersistentList(items) {
   });
 }
 
+const TIMELINE_SIZE = 20;
+
+function mergeNewest(current, incoming, size) {
+  const seen = new Set(incoming.map((item) => item.id));
+  return incoming
+    .concat(current.filter((item) => !seen.has(item.id)))
+    .sort((a, b) => (b.ts - a.ts) || (b.id - a.id))
+    .slice(0, size);
+}
+
+function advanceHighWater(previous, next) {
+  if (!previous) return next;
+  const larger = (a, b) => (a === null || a === undefined ? b : b === null || b === undefined ? a : Math.max(a, b));
+  return { id: larger(previous.id, next.id), ts: larger(previous.ts, next.ts) };
+}
+
+function timelineItem(packet) {
+  const item = document.createElement('li');
+  item.className = `timeline-item severity-${severityMap[packet.severity] || 'medium'}`;
+  item.dataset.id = packet.id;
+  item.innerHTML = `
+    <a href="/packets/${packet.id}">
+      <div class="timeline-header">
+        <strong>${packet.threat_type}</strong>
+        <span class="badge ${severityMap[packet.severity] || 'medium'}">${packet.severity}</span>
+      </div>
+      <p class="meta">${formatTimestamp(packet.timestamp)} · ${packet.protocol_layer}</p>
+      <p class="meta">${packet.source_agent} → ${packet.target_agent}</p>
+      <p>${packet.description}</p>
+    </a>
+  `;
+  return item;
+}
+
 async function loadTimeline() {
-  const res = await fetch('/api/packets/recent');
+  const delta = timelineHighWater && timelineHighWater.id !== null;
+  const res = await fetch(delta ? `/api/packets/recent?since_id=${timelineHighWater.id}` : '/api/packets/recent');
   if (!res.ok) return;
-  const data = await res.json();
+  renderTimeline(await res.json(), delta);
+}
+
+function renderTimeline(data, delta) {
   const timeline = document.getElementById('timeline-list');
   if (!timeline) return;
 
-  timeline.innerHTML = '';
-  if (!data.packets.length) {
+  const full = !delta || data.truncated;
+  if (!full && !data.packets.length) return;
+  timelineHighWater = full ? data.high_water : advanceHighWater(timelineHighWater, data.high_water);
+  if (full) {
+    timelinePackets = data.packets;
+    timeline.innerHTML = '';
+  } else {
+    timelinePackets = mergeNewest(timelinePackets, data.packets, TIMELINE_SIZE);
+  }
+
+  if (!timelinePackets.length) {
     const li = document.createElement('li');
     li.className = 'empty-state';
     li.textContent = '최근 저장된 패킷이 없습니다.';
@@ -531,21 +589,23 @@ async function loadTimeline() {
     return;
   }
 
-  data.packets.forEach((packet) => {
-    const item = document.createElement('li');
-    item.className = `timeline-item severity-${severityMap[packet.severity] || 'medium'}`;
-    item.innerHTML = `
-      <a href="/packets/${packet.id}">
-        <div class="timeline-header">
-          <strong>${packet.threat_type}</strong>
-          <span class="badge ${severityMap[packet.severity] || 'medium'}">${packet.severity}</span>
-        </div>
-        <p class="meta">${formatTimestamp(packet.timestamp)} · ${packet.protocol_layer}</p>
-        <p class="meta">${packet.source_agent} → ${packet.target_agent}</p>
-        <p>${packet.description}</p>
-      </a>
-    `;
-    timeline.appendChild(item);
+  // Reuse the items that are still in the window and only build the new ones.
+  const existing = new Map();
+  timeline.querySelectorAll('li').forEach((item) => {
+    if (item.dataset.id) existing.set(item.dataset.id, item);
+    else item.remove();
+  });
+  const kept = new Set();
+  timelinePackets.forEach((packet, index) => {
+    const key = String(packet.id);
+    const item = existing.get(key) || timelineItem(packet);
+    kept.add(key);
+    if (timeline.children[index] !== item) {
+      timeline.insertBefore(item, timeline.children[index] || null);
+    }
+  });
+  existing.forEach((item, key) => {
+    if (!kept.has(key)) item.remove();
   });
 }
 
@@ -555,46 +615,130 @@ async function loadInitialAlerts() {
     return;
   }
   try {
-    const res = await fetch('/api/alerts/recent');
+    const delta = alertHighWater && alertHighWater.id !== null && liveEvents.length;
+    const res = await fetch(delta ? `/api/alerts/recent?since_id=${alertHighWater.id}` : '/api/alerts/recent');
     if (!res.ok) return;
-    const data = await res.json();
-    if (!Array.isArray(data.alerts)) return;
+    applyRecentAlerts(await res.json(), delta);
+  } finally {
+    alertsInitialized = true;
+    renderAlertBar();
+  }
+}
+
+function applyRecentAlerts(data, delta) {
+  if (!Array.isArray(data.alerts)) return;
+  alertHighWater = delta && !data.truncated ? advanceHighWater(alertHighWater, data.high_water) : data.high_water;
+
+  const alerts = delta && !data.truncated ? mergeNewest(liveEvents, data.alerts, 30) : data.alerts;
+  liveEvents = alerts.slice(0, delta ? 30 : 12);
+  renderLiveFeed();
 
-    liveEvents = data.alerts.slice(0, 12);
-    renderLiveFeed();
+  alertHistory = alerts.slice(0, 3);
+}
 
-    alertHistory = data.alerts.slice(0, 3);
+async function loadDashboardSnapshot() {
+  // One request, one read transaction: overview, timeline and alert feed on first paint.
+  try {
+    const res = await fetch('/api/dashboard/snapshot');
+    if (!res.ok) return;
+    const data = await res.json();
+    renderOverview(data.overview);
+    renderTimeline(data.recent_packets, false);
+    applyRecentAlerts(data.recent_alerts, false);
   } finally {
     alertsInitialized = true;
     renderAlertBar();
   }
 }
 
-function appendLiveEvent(event) {
-  liveEvents.unshift(event);
-  if (liveEvents.length > 30) {
-    liveEvents = liveEvents.slice(0, 30);
-  }
+function receiveAlerts(payloads) {
+  const fresh = payloads.filter((payload) => !liveEvents.some((item) => item.id === payload.id));
+  if (!fresh.length) return;
+  fresh.forEach((payload) => {
+    // A filtered stream skips alerts, so only an unfiltered one may advance the delta mark.
+    if (!showOnlyCritical && alertHighWater && payload.id > alertHighWater.id) {
+      alertHighWater = { id: payload.id, ts: Math.max(alertHighWater.ts || 0, payload.ts || 0) };
+    }
+    liveEvents.unshift(payload);
+  });
+  liveEvents = liveEvents.slice(0, 30);
   renderLiveFeed();
+
+  const newest = fresh.slice().reverse();
+  const newestIds = new Set(newest.map((item) => item.id));
+  alertHistory = newest.concat(alertHistory.filter((item) => !newestIds.has(item.id))).slice(0, 3);
+  renderAlertBar();
+  loadOverviewMetrics();
+}
+
+function streamUrl() {
+  const params = new URLSearchParams({ batch: '1' });
+  if (lastAlertEventId) params.set('last_event_id', lastAlertEventId);
+  if (showOnlyCritical) params.set('severity', '높음');
+  return `/stream?${params.toString()}`;
 }
 
 function startEventStream() {
   if (alertStreamStarted || typeof EventSource === 'undefined') return;
   alertStreamStarted = true;
-  const source = new EventSource('/stream');
+  const source = new EventSource(streamUrl());
+  eventSource = source;
+  source.addEventListener('resync', () => {
+    alertsInitialized = false;
+    loadInitialAlerts();
+  });
+  source.addEventListener('batch', (event) => {
+    if (event.lastEventId) lastAlertEventId = event.lastEventId;
+    receiveAlerts(JSON.parse(event.data));
+  });
   source.onmessage = (event) => {
-    const payload = JSON.parse(event.data);
-    appendLiveEvent(payload);
-    updateAlertBar(payload);
-    loadOverviewMetrics();
+    if (event.lastEventId) lastAlertEventId = event.lastEventId;
+    receiveAlerts([JSON.parse(event.data)]);
   };
   source.onerror = () => {
     source.close();
+    if (eventSource !== source) return;
     alertStreamStarted = false;
     setTimeout(startEventStream, 5000);
   };
 }
 
+function restartEventStream() {
+  if (eventSource) eventSource.close();
+  eventSource = null;
+  alertStreamStarted = false;
+  startEventStream();
+}
+
+// Callers take data.next_cursor only after checking the response still belongs to the current search.
+async function fetchPacketPage(query, cursor) {
+  const params = new URLSearchParams(query);
+  if (cursor) params.set('cursor', cursor);
+  const res = await fetch(`/api/packets?${params.toString()}`);
+  if (!res.ok) return null;
+  return res.json();
+}
+
+function renderPacketRows(tbody, packets) {
+  packets.forEach((packet) => {
+    const row = document.createElement('tr');
+    row.dataset.link = `/packets/${packet.id}`;
+    row.innerHTML = `
+      <td>${formatTimestamp(packet.timestamp)}</td>
+      <td>${packet.source_agent}</td>
+      <td>${packet.target_agent}</td>
+      <td>${packet.protocol_layer}</td>
+      <td>${packet.threat_type}</td>
+      <td><span class="badge ${severityMap[packet.severity] || 'medium'}">${packet.severity}</span></td>
+      <td>${packet.description}<br/><span class="meta">대응: ${packet.resolution}</span></td>
+    `;
+    row.addEventListener('click', () => {
+      window.location.href = row.dataset.link;
+    });
+    tbody.appendChild(row);
+  });
+}
+
 async function searchPackets(event) {
   if (event) event.preventDefault();
   const form = document.getElementById('packet-filter');
@@ -606,13 +750,17 @@ async function searchPackets(event) {
     if (value) params.append(key, value);
   }
 
-  const res = await fetch(`/api/packets?${params.toString()}`);
-  if (!res.ok) return;
-  const data = await res.json();
+  packetQuery = params.toString();
+  packetCursor = null;
+  const requestId = ++packetRequestId;
+  const data = await fetchPacketPage(packetQuery, null);
+  if (!data || requestId !== packetRequestId) return;
+  packetCursor = data.next_cursor || null;
   const tbody = document.querySelector('#packet-table tbody');
   if (!tbody) return;
 
   tbody.innerHTML = '';
+  tbody.scrollTop = 0;
   if (data.packets.length === 0) {
     const row = document.createElement('tr');
     row.innerHTML = '<td colspan="7" class="empty">조건에 맞는 패킷이 없습니다.</td>';
@@ -620,22 +768,31 @@ async function searchPackets(event) {
     return;
   }
 
-  data.packets.forEach((packet) => {
-    const row = document.createElement('tr');
-    row.dataset.link = `/packets/${packet.id}`;
-    row.innerHTML = `
-      <td>${formatTimestamp(packet.timestamp)}</td>
-      <td>${packet.source_agent}</td>
-      <td>${packet.target_agent}</td>
-      <td>${packet.protocol_layer}</td>
-      <td>${packet.threat_type}</td>
-      <td><span class="badge ${severityMap[packet.severity] || 'medium'}">${packet.severity}</span></td>
-      <td>${packet.description}<br/><span class="meta">대응: ${packet.resolution}</span></td>
-    `;
-    row.addEventListener('click', () => {
-      window.location.href = row.dataset.link;
-    });
-    tbody.appendChild(row);
+  renderPacketRows(tbody, data.packets);
+}
+
+async function loadMorePackets() {
+  if (!packetCursor || packetLoading) return;
+  packetLoading = true;
+  const requestId = packetRequestId;
+  try {
+    const data = await fetchPacketPage(packetQuery, packetCursor);
+    const tbody = document.querySelector('#packet-table tbody');
+    if (!data || !tbody || requestId !== packetRequestId) return;
+    packetCursor = data.next_cursor || null;
+    renderPacketRows(tbody, data.packets);
+  } finally {
+    packetLoading = false;
+  }
+}
+
+function bindPacketScroll() {
+  const tbody = document.querySelector('#packet-table tbody');
+  if (!tbody) return;
+  tbody.addEventListener('scroll', () => {
+    if (tbody.scrollTop + tbody.clientHeight >= tbody.scrollHeight - 80) {
+      loadMorePackets();
+    }
   });
 }
 
@@ -657,14 +814,19 @@ function bindQuickFilters() {
 }
 
 function initDashboard() {
-  loadOverviewMetrics();
-  loadTimeline();
+  loadDashboardSnapshot();
 
   const toggle = document.getElementById('toggle-critical');
   if (toggle) {
     toggle.addEventListener('change', (event) => {
       showOnlyCritical = event.target.checked;
       renderLiveFeed();
+      restartEventStream();
+      if (!showOnlyCritical) {
+        alertsInitialized = false;
+        alertHighWater = null;
+        loadInitialAlerts();
+      }
     });
   }
 
@@ -683,10 +845,33 @@ function initGraph() {
   if (refreshButton) {
     refreshButton.addEventListener('click', refreshCommunications);
   }
+  const viewSelect = document.getElementById('graph-view');
+  if (viewSelect) {
+    viewSelect.addEventListener('change', () => {
+      const [view, group] = viewSelect.value.split(':');
+      loadAgentGraph(view ? { view, group } : {});
+    });
+  }
 }
 
-async function loadAgentGraph() {
-  const res = await fetch('/api/agents');
+function graphNodeTitle(node) {
+  if (node.cluster) {
+    const counts = Object.entries(node.cluster.status_counts)
+      .map(([status, count]) => `${status} ${count}`)
+      .join(' · ');
+    return `${node.cluster.name}\n에이전트 ${node.cluster.size}개 (${counts})\n최대 위험도 ${(node.cluster.max_risk * 100).toFixed(1)}%`;
+  }
+  return `${node.label}\n상태: ${node.group}\n위험도: ${(node.risk_score * 100).toFixed(1)}%`;
+}
+
+async function loadAgentGraph(params = {}) {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      query.set(key, value);
+    }
+  });
+  const res = await fetch(`/api/agents${query.toString() ? `?${query}` : ''}`);
   if (!res.ok) return;
   const data = await res.json();
   const container = document.getElementById('graph-container');
@@ -695,9 +880,10 @@ async function loadAgentGraph() {
   const nodes = new vis.DataSet(
     data.nodes.map((node) => ({
       ...node,
+      title: graphNodeTitle(node),
       color: {
         background: 'rgba(15, 23, 42, 0.95)',
-        border: '#38bdf8',
+        border: node.id === data.center ? '#f97316' : '#38bdf8',
         highlight: {
           background: '#0f172a',
           border: '#0ea5e9'
@@ -717,8 +903,9 @@ async function loadAgentGraph() {
   const edges = new vis.DataSet(
     data.edges.map((edge) => ({
       ...edge,
+      title: `${edge.count}건 · 최고 심각도 ${edge.severity || '-'}`,
       color: {
-        color: 'rgba(56, 189, 248, 0.45)',
+        color: edge.severity === '높음' ? 'rgba(248, 113, 113, 0.6)' : 'rgba(56, 189, 248, 0.45)',
         highlight: '#38bdf8'
       },
       font: {
@@ -732,6 +919,11 @@ async function loadAgentGraph() {
     }))
   );
 
+  const largeGraph = data.nodes.length > 150;
+  if (mainAgentNetwork) {
+    mainAgentNetwork.destroy();
+  }
+
   const network = new vis.Network(
     container,
     { nodes, edges },
@@ -739,7 +931,7 @@ async function loadAgentGraph() {
       physics: {
         enabled: true,
         solver: 'barnesHut',
-        stabilization: { iterations: 250 },
+        stabilization: { iterations: largeGraph ? 100 : 250 },
         barnesHut: {
           gravitationalConstant: -3200,
           centralGravity: 0.2,
@@ -751,21 +943,25 @@ async function loadAgentGraph() {
         hover: true,
         tooltipDelay: 120,
         zoomView: true,
-        minZoom: 0.45,
+        minZoom: largeGraph ? 0.1 : 0.45,
         maxZoom: 1.6
       },
       edges: {
-        smooth: {
-          type: 'continuous',
-          roundness: 0.18
-        }
+        smooth: largeGraph
+          ? false
+          : {
+              type: 'continuous',
+              roundness: 0.18
+            },
+        scaling: { min: 1, max: 6, label: { enabled: false } }
       },
       nodes: {
         shape: 'dot',
-        size: 22
+        size: 22,
+        scaling: { min: 14, max: 40 }
       },
       layout: {
-        improvedLayout: true
+        improvedLayout: !largeGraph
       }
     }
   );
@@ -786,12 +982,27 @@ async function loadAgentGraph() {
 
   const detailPanel = document.getElementById('agent-detail');
   if (detailPanel) {
-    detailPanel.innerHTML = '그래프에서 노드 또는 간선을 선택해 세부 정보를 확인하세요.';
+    const truncated = data.truncated ? '<p class="meta">표시 한도를 넘어 위험도가 높은 연결만 표시합니다.</p>' : '';
+    detailPanel.innerHTML = `그래프에서 노드 또는 간선을 선택해 세부 정보를 확인하세요.${truncated}`;
   }
 
   network.on('click', (params) => {
     if (!detailPanel) return;
     if (params.nodes.length > 0) {
+      const node = nodes.get(params.nodes[0]);
+      if (node && node.cluster) {
+        const counts = Object.entries(node.cluster.status_counts)
+          .map(([status, count]) => `${status} ${count}`)
+          .join(', ');
+        detailPanel.innerHTML = `
+          <h4>${node.cluster.name}</h4>
+          <p class="meta">에이전트 수: ${node.cluster.size}</p>
+          <p class="meta">상태 분포: ${counts}</p>
+          <p class="meta">평균 위험 점수: ${(node.cluster.avg_risk * 100).toFixed(1)}%</p>
+          <p class="meta">최대 위험 점수: ${(node.cluster.max_risk * 100).toFixed(1)}%</p>
+        `;
+        return;
+      }
       const agentId = params.nodes[0];
       const agent = data.agents.find((item) => item.id === agentId);
       if (!agent) return;
@@ -807,7 +1018,11 @@ async function loadAgentGraph() {
         <p class="meta">위험 점수: ${(agent.risk_score * 100).toFixed(1)}%</p>
         <p class="meta">최근 활동: ${formatTimestamp(agent.last_seen)}</p>
         <p><a href="/agents/${agent.id}">상세 페이지 이동</a></p>
+        <p><button type="button" id="btn-ego-graph">주변 통신망 보기</button></p>
       `;
+      document.getElementById('btn-ego-graph').addEventListener('click', () => {
+        loadAgentGraph({ view: 'ego', agent_id: agent.id, depth: 2 });
+      });
     }
   });
 
@@ -822,6 +1037,8 @@ async function loadAgentGraph() {
         <h4>통신 세부 정보</h4>
         <p class="meta">연결: ${fromLabel} → ${toLabel}</p>
         <p class="meta">메시지: ${edge.label}</p>
+        <p class="meta">통신 세션 ${edge.sessions}건 · 패킷 ${edge.packets}건</p>
+        <p class="meta">최고 심각도: ${edge.severity || '-'}</p>
       `;
     }
   });
@@ -867,6 +1084,7 @@ async function refreshCommunications() {
 function initPackets() {
   loadOverviewMetrics();
   bindQuickFilters();
+  bindPacketScroll();
   const form = document.getElementById('packet-filter');
   if (form) {
     form.addEventListener('submit', searchPackets);
@@ -948,10 +1166,12 @@ function initAgentDetail() {
 function initPage() {
   setupNavigation();
   bindAlertBarClose();
-  loadInitialAlerts();
+  const page = document.body.dataset.page;
+  if (page !== 'dashboard') {
+    loadInitialAlerts();
+  }
   startEventStream();
 
-  const page = document.body.dataset.page;
   if (page === 'dashboard') {
     initDashboard();
   }
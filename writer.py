@@ -0,0 +1,195 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("a2a.writer")
+
+
+class Backpressure(RuntimeError):
+    """Raised when the writer queue stays full for longer than the submit timeout."""
+
+
+class Submission:
+    def __init__(self, items: List):
+        self.items = items
+        self.enqueued_at = time.perf_counter()
+        self.error: Optional[BaseException] = None
+        self.failed = 0
+        self._done = threading.Event()
+
+    @property
+    def written(self) -> int:
+        return len(self.items) - self.failed
+
+    def finish(self):
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class BatchWriter:
+    """Single writer thread that drains a bounded queue and flushes items in batches.
+
+    Producers ``submit`` lists of items and may wait on the returned
+    ``Submission``. The thread merges whatever is queued, up to ``max_batch``
+    items, into one ``flush`` call, so many small submissions share one
+    transaction. With ``max_delay`` set it also lingers up to that many seconds
+    after the first item so a trickle of single-item submissions is still
+    group-committed. A full queue blocks producers for up to ``timeout`` seconds
+    and then raises ``Backpressure``.
+
+    When a merged batch fails, its items are flushed again one at a time so a
+    single bad item is dropped (and counted on its ``Submission``) instead of
+    the whole group. ``flush`` must therefore leave nothing behind when it
+    raises.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List], None],
+        max_batch: int = 5000,
+        max_queue: int = 32,
+        max_delay: float = 0.0,
+    ):
+        self.name = name
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Optional[Submission]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.failed_items = 0
+        self.retried_batches = 0
+        self.rejected_submissions = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def submit(self, items: List, timeout: Optional[float] = None) -> Submission:
+        submission = Submission(items)
+        try:
+            self._queue.put(submission, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self.rejected_submissions += 1
+            raise Backpressure(f"{self.name} queue is full")
+        with self._lock:
+            self.submitted += len(items)
+        return submission
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush everything queued so far, then stop the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _collect(self, first: Submission) -> Tuple[List[Submission], bool]:
+        pending = [first]
+        size = len(first.items)
+        deadline = time.perf_counter() + self.max_delay
+        while size < self.max_batch:
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    submission = self._queue.get(timeout=remaining)
+                else:
+                    submission = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if submission is None:
+                return pending, True
+            pending.append(submission)
+            size += len(submission.items)
+        return pending, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            pending, stopping = self._collect(first)
+            items = [item for submission in pending for item in submission.items]
+            start = time.perf_counter()
+            retried = False
+            try:
+                self.flush(items)
+            except Exception as exc:
+                if len(items) == 1:
+                    pending[0].failed, pending[0].error = 1, exc
+                else:
+                    retried = True
+                    for submission in pending:
+                        self._flush_each(submission)
+            finished = time.perf_counter()
+            elapsed = finished - start
+            failed = sum(submission.failed for submission in pending)
+            with self._lock:
+                self.batches += 1
+                self.flush_seconds += elapsed
+                self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+                for submission in pending:
+                    latency = finished - submission.enqueued_at
+                    self.latency_seconds += latency * len(submission.items)
+                    self.max_latency_seconds = max(self.max_latency_seconds, latency)
+                self.last_batch_size = len(items)
+                self.max_batch_size = max(self.max_batch_size, len(items))
+                self.written += len(items) - failed
+                self.retried_batches += retried
+                if failed:
+                    self.failures += 1
+                    self.failed_items += failed
+            if failed:
+                logger.warning("%s dropped %d of %d items", self.name, failed, len(items))
+            for submission in pending:
+                submission.finish()
+
+    def _flush_each(self, submission: Submission):
+        for item in submission.items:
+            try:
+                self.flush([item])
+            except Exception as exc:
+                submission.failed += 1
+                submission.error = exc
+
+    def stats(self) -> Dict:
+        with self._lock:
+            processed = self.written + self.failed_items
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "submitted": self.submitted,
+                "written": self.written,
+                "batches": self.batches,
+                "failures": self.failures,
+                "failed_items": self.failed_items,
+                "retried_batches": self.retried_batches,
+                "rejected_submissions": self.rejected_submissions,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_batch_size,
+                "avg_batch_size": round(processed / self.batches, 2) if self.batches else 0,
+                "avg_flush_ms": round(self.flush_seconds / self.batches * 1000, 3) if self.batches else 0,
+                "max_flush_ms": round(self.max_flush_seconds * 1000, 3),
+                "avg_commit_latency_ms": round(self.latency_seconds / processed * 1000, 3) if processed else 0,
+                "max_commit_latency_ms": round(self.max_latency_seconds * 1000, 3),
+            }